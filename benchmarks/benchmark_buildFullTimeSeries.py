@@ -0,0 +1,71 @@
+"""
+Benchmark of the reconstruction of full time series from typical period data (utils.buildFullTimeSeries) against
+the reconstruction by concatenating the data of the periods (utils.buildFullTimeSeriesByConcat).
+
+Run with: python benchmarks/benchmark_buildFullTimeSeries.py
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from fine import utils
+
+
+def getData(numberOfTypicalPeriods, numberOfRows, numberOfColumns):
+    index = pd.MultiIndex.from_product(
+        [range(numberOfTypicalPeriods), range(numberOfRows)]
+    )
+    return pd.DataFrame(
+        np.random.rand(len(index), numberOfColumns), index=index
+    )
+
+
+def timeIt(function, *args, repetitions=3, **kwargs):
+    runtimes = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        runtimes.append(time.perf_counter() - start)
+    return min(runtimes)
+
+
+def main(numberOfTypicalPeriods=12, numberOfPeriods=365, numberOfRows=2000):
+    periodsOrder = np.random.randint(numberOfTypicalPeriods, size=numberOfPeriods)
+
+    # Hourly typical days
+    df = getData(numberOfTypicalPeriods, numberOfRows, 24)
+    esM = SimpleNamespace(segmentation=False, _fullTimeSeriesIndex={})
+    print(
+        "typical periods:   concat %.3f s, index map %.3f s"
+        % (
+            timeIt(utils.buildFullTimeSeriesByConcat, df, periodsOrder, 0, esM=esM),
+            timeIt(utils.buildFullTimeSeries, df, periodsOrder, 0, esM=esM),
+        )
+    )
+
+    # Typical days with 6 segments of 4 hours each
+    df = getData(numberOfTypicalPeriods, numberOfRows, 6)
+    timeStepsPerSegment = pd.Series(
+        4,
+        index=pd.MultiIndex.from_product([range(numberOfTypicalPeriods), range(6)]),
+    )
+    esM = SimpleNamespace(
+        segmentation=True,
+        typicalPeriods=list(range(numberOfTypicalPeriods)),
+        timeStepsPerSegment={0: timeStepsPerSegment},
+        _fullTimeSeriesIndex={},
+    )
+    print(
+        "segmentation:      concat %.3f s, index map %.3f s"
+        % (
+            timeIt(utils.buildFullTimeSeriesByConcat, df, periodsOrder, 0, esM=esM),
+            timeIt(utils.buildFullTimeSeries, df, periodsOrder, 0, esM=esM),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
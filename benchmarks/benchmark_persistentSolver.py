@@ -0,0 +1,118 @@
+"""
+Benchmark of repeated solves with modified variable bounds with the non-persistent HiGHS interface (the problem is
+passed to HiGHS again for each solve) against the persistent HiGHS interface (only the modifications are passed).
+
+Run with: python benchmarks/benchmark_persistentSolver.py (requires highspy)
+"""
+
+import numpy as np
+import pandas as pd
+
+import fine as fn
+
+
+def getEnergySystemModel(numberOfTimeSteps=2190, numberOfLocations=4, seed=0):
+    rng = np.random.default_rng(seed)
+    locations = ["Location" + str(i) for i in range(numberOfLocations)]
+    hoursPerTimeStep = 8760 / numberOfTimeSteps
+
+    esM = fn.EnergySystemModel(
+        locations=set(locations),
+        commodities={"electricity", "hydrogen"},
+        numberOfTimeSteps=numberOfTimeSteps,
+        commodityUnitsDict={
+            "electricity": r"kW$_{el}$",
+            "hydrogen": r"kW$_{H_{2},LHV}$",
+        },
+        hoursPerTimeStep=hoursPerTimeStep,
+        costUnit="1 Euro",
+        lengthUnit="km",
+        verboseLogLevel=2,
+    )
+    esM.add(
+        fn.Source(
+            esM=esM,
+            name="Electricity market",
+            commodity="electricity",
+            hasCapacityVariable=False,
+            operationRateMax=pd.DataFrame(
+                1e6 * hoursPerTimeStep, index=range(numberOfTimeSteps), columns=locations
+            ),
+            commodityCostTimeSeries=pd.DataFrame(
+                rng.uniform(0, 0.1, (numberOfTimeSteps, numberOfLocations)),
+                columns=locations,
+            ),
+        )
+    )
+    esM.add(
+        fn.Conversion(
+            esM=esM,
+            name="Electrolyzers",
+            physicalUnit=r"kW$_{el}$",
+            commodityConversionFactors={"electricity": -1, "hydrogen": 0.7},
+            hasCapacityVariable=True,
+            investPerCapacity=500,
+            opexPerCapacity=500 * 0.025,
+            interestRate=0.08,
+            economicLifetime=10,
+        )
+    )
+    esM.add(
+        fn.Storage(
+            esM=esM,
+            name="Pressure tank",
+            commodity="hydrogen",
+            hasCapacityVariable=True,
+            investPerCapacity=0.5,
+            interestRate=0.08,
+            economicLifetime=30,
+        )
+    )
+    esM.add(
+        fn.Sink(
+            esM=esM,
+            name="Industry site",
+            commodity="hydrogen",
+            hasCapacityVariable=False,
+            operationRateFix=pd.DataFrame(
+                rng.uniform(1e3, 6e3, (numberOfTimeSteps, numberOfLocations))
+                * hoursPerTimeStep,
+                columns=locations,
+            ),
+        )
+    )
+    return esM
+
+
+def main(factors=(1.1, 1.2, 1.3)):
+    esM = getEnergySystemModel()
+    solveTimes, objectiveValues = {}, {}
+    for persistent in [False, True]:
+        esM.optimize(solver="highs", persistent=persistent)
+        solveTimes[persistent], objectiveValues[persistent] = [], []
+        capacities = {index: var.value for index, var in esM.pyM.cap_conv.items()}
+        for factor in factors:
+            for index, var in esM.pyM.cap_conv.items():
+                var.setlb(factor * capacities[index])
+            esM.optimize(
+                declaresOptimizationProblem=False, solver="highs", persistent=persistent
+            )
+            solveTimes[persistent].append(esM.solverSpecs["solvetime"])
+            objectiveValues[persistent].append(esM.objectiveValue)
+        for var in esM.pyM.cap_conv.values():
+            var.setlb(0)
+
+    print(
+        "Mean re-solve time with HiGHS: non-persistent %.4f s, persistent %.4f s"
+        % (np.mean(solveTimes[False]), np.mean(solveTimes[True]))
+    )
+    print(
+        "Maximum relative deviation of the objective values: %.2e"
+        % np.max(
+            np.abs(np.array(objectiveValues[True]) / np.array(objectiveValues[False]) - 1)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
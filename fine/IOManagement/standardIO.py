@@ -1,5 +1,6 @@
 import fine as fn
 from fine import utils
+import numpy as np
 import pandas as pd
 import ast
 import inspect
@@ -389,6 +390,97 @@ def getDualValues(pyM):
     return pd.Series(list(pyM.dual.values()), index=pd.Index(list(pyM.dual.keys())))
 
 
+def getShadowPriceCube(esM, constraint, hasTimeSeries=False, dualValues=None):
+    """
+    Get the dual values of all indices of a constraint as dense array. The dual values are read once for the
+    constraint and the array is cached in the EnergySystemModel instance until the optimization problem is solved
+    again.
+
+    The constraint indices are expected to have the investment period as third index level and, if hasTimeSeries is
+    True, the period and the time step as last two index levels (e.g. commodityBalanceConstraint with the indices
+    (loc, commod, ip, p, t)). The remaining index levels are combined to the rows of the array.
+
+    :param esM: considered energy system model
+    :type esM: EnergySystemModel class instance
+
+    :param constraint: constraint from which the dual values should be obtained (e.g. pyM.commodityBalanceConstraint)
+    :type constraint: pyomo.core.base.constraint.IndexedConstraint
+
+    **Default arguments:**
+
+    :param hasTimeSeries: states if the constraint is time dependent.
+        |br| * the default value is False
+    :type hasTimeSeries: bool
+
+    :param dualValues: dual values of the optimized model instance (cf. getDualValues). If it is not specified, the
+        dual values are read from the model instance and the array is cached.
+        |br| * the default value is None
+    :type dualValues: None or Series
+
+    :return: dictionary with the labels of the rows ('rows'), the investment periods ('ip') and, if hasTimeSeries is
+        True, the periods ('periods') and time steps ('timeSteps'), the dual values ('values', array with the
+        dimensions rows x ip (x periods x time steps)) and a mask which states if a row exists in an investment
+        period ('present', array with the dimensions rows x ip)
+    :rtype: dict
+    """
+    cache = getattr(esM, "_shadowPriceCubes", None)
+    key = (constraint.name, hasTimeSeries)
+    if (
+        dualValues is None
+        and cache is not None
+        and key in cache
+        and cache[key]["constraint"] is constraint
+    ):
+        return cache[key]
+
+    # Read the dual values of the constraint (and only of this constraint) at once
+    if dualValues is None:
+        dual = esM.pyM.dual
+        values = np.array(
+            [dual.get(con) for con in constraint.values()], dtype=float
+        )
+    else:
+        values = dualValues.reindex(list(constraint.values())).values.astype(float)
+    levels = [pd.Index(level) for level in zip(*constraint.keys())]
+
+    ipCodes, ipLabels = pd.factorize(levels[2], sort=True)
+    if hasTimeSeries:
+        # Order the rows as (levels[1], ..., levels[0]) (cf. utils.buildFullTimeSeries)
+        rowLevels = levels[:2] + levels[3:-2]
+        rowLevels = rowLevels[1:] + rowLevels[:1]
+        rowCodes, rowLabels = pd.MultiIndex.from_arrays(rowLevels).factorize(
+            sort=True
+        )
+        periodCodes, periodLabels = pd.factorize(levels[-2], sort=True)
+        timeStepCodes, timeStepLabels = pd.factorize(levels[-1], sort=True)
+        cubeValues = np.full(
+            (len(rowLabels), len(ipLabels), len(periodLabels), len(timeStepLabels)),
+            np.nan,
+        )
+        cubeValues[rowCodes, ipCodes, periodCodes, timeStepCodes] = values
+    else:
+        rowCodes, rowLabels = pd.MultiIndex.from_arrays(
+            levels[:2] + levels[3:]
+        ).factorize()
+        cubeValues = np.full((len(rowLabels), len(ipLabels)), np.nan)
+        cubeValues[rowCodes, ipCodes] = values
+    present = np.zeros((len(rowLabels), len(ipLabels)), dtype=bool)
+    present[rowCodes, ipCodes] = True
+
+    cube = {
+        "constraint": constraint,
+        "rows": rowLabels,
+        "ip": ipLabels,
+        "values": cubeValues,
+        "present": present,
+    }
+    if hasTimeSeries:
+        cube["periods"], cube["timeSteps"] = periodLabels, timeStepLabels
+    if dualValues is None and cache is not None:
+        cache[key] = cube
+    return cube
+
+
 def getShadowPrices(
     esM,
     constraint,
@@ -399,7 +491,8 @@ def getShadowPrices(
     periodsOrder=None,
 ):
     """
-    Get dual values of constraint ("shadow prices").
+    Get dual values of constraint ("shadow prices"). The dual values are sliced from the dense array of the
+    constraint (cf. getShadowPriceCube), which is built once after the optimization.
 
     :param esM: considered energy system model
     :type esM: EnergySystemModel class instance
@@ -410,8 +503,8 @@ def getShadowPrices(
     :param ip: investment period of transformation path analysis.
     :type ip: int
 
-    :param dualValues: dual values of the optimized model instance. If it is not specified, it is set by using the
-        function getDualValues().
+    :param dualValues: dual values of the optimized model instance. If it is not specified, the dual values of the
+        constraint are read from the model instance.
         |br| * the default value is None
     :type dualValues: None or Series
 
@@ -430,28 +523,30 @@ def getShadowPrices(
 
     :return: Pandas Series with the dual values of the specified constraint
     """
-    if dualValues is None:
-        dualValues = getDualValues(esM.pyM)
-
-    SP = pd.Series(
-        list(constraint.values()), index=pd.Index(list(constraint.keys()))
-    ).map(dualValues)
-    # Select rows where ip is equal to investigated ip
-    SP = SP.iloc[SP.index.get_level_values(2) == ip]
-    # Delete ip from multiindex
-    SP = SP.droplevel(2, axis=0)
-
-    if hasTimeSeries:
-        SP = pd.DataFrame(SP).swaplevel(i=0, j=-2).sort_index()
-        SP = SP.unstack(level=-1)
-        SP.columns = SP.columns.droplevel()
-        SP = SP.apply(lambda x: x / (periodOccurrences[ip][x.name[0]]), axis=1)
-        SP = fn.utils.buildFullTimeSeries(
-            SP, periodsOrder[ip], ip, esM=esM, divide=False
-        )
-        SP = SP.stack()
-
-    return SP
+    cube = getShadowPriceCube(esM, constraint, hasTimeSeries, dualValues)
+    ipPosition = cube["ip"].get_loc(ip)
+    rows = cube["present"][:, ipPosition]
+    index = cube["rows"][rows]
+    if index.nlevels == 1:
+        index = index.get_level_values(0)
+
+    if not hasTimeSeries:
+        return pd.Series(cube["values"][rows, ipPosition], index=index)
+
+    # Divide the dual values by the number of occurrences of the periods
+    occurrences = np.array(
+        [periodOccurrences[ip][p] for p in cube["periods"]], dtype=float
+    )
+    values = cube["values"][rows, ipPosition] / occurrences[None, :, None]
+    # Take the full time series from the dual values of the typical periods
+    periodOfStep, columnOfStep, _ = utils.getFullTimeSeriesIndex(
+        periodsOrder[ip], ip, len(cube["timeSteps"]), esM
+    )
+    SP = pd.DataFrame(
+        values[:, cube["periods"].get_indexer(periodOfStep), columnOfStep],
+        index=index,
+    )
+    return SP.stack()
 
 
 def plotOperation(
@@ -5,7 +5,7 @@ import pandas as pd
 import xarray as xr
 from netCDF4 import Dataset
 
-from fine import utils
+from fine import utils, utilsResults
 from fine.IOManagement import dictIO, utilsIO
 
 
@@ -244,59 +244,28 @@ def convertOptimizationOutputToDatasets(esM, optSumOutputLevel=0):
 
             # Write output from esM.esM.componentModelingDict[name].getOptimalValues() to datasets
             data = esM.componentModelingDict[name].getOptimalValues(ip=ip)
-            dataTD1dim, indexTD1dim, dataTD2dim, indexTD2dim = [], [], [], []
+            # Time dependent data is taken from the results store as DataArrays which are views on the stored
+            # optimal values (cf. utilsResults.ResultsStore)
+            store = getattr(esM, "resultsStore", None)
+            if store is None:
+                store = utilsResults.ResultsStore()
             dataTI, indexTI = [], []
             for key, d in data.items():
                 if d["values"] is None:
                     continue
                 if d["timeDependent"]:
-                    if d["dimension"] == "1dim":
-                        dataTD1dim.append(d["values"]), indexTD1dim.append(key)
-                    elif d["dimension"] == "2dim":
-                        dataTD2dim.append(d["values"]), indexTD2dim.append(key)
-                else:
-                    dataTI.append(d["values"]), indexTI.append(key)
-            # One dimensional time dependent data
-            if dataTD1dim:
-                names = ["Variable", "Component", "Location"]
-                dfTD1dim = pd.concat(dataTD1dim, keys=indexTD1dim, names=names)
-                # dfTD1dim = dfTD1dim.loc[
-                #    ((dfTD1dim != 0) & (~dfTD1dim.isnull())).any(axis=1)
-                # ]
-                for variable in dfTD1dim.index.get_level_values(0).unique():
-                    # for component in dfTD1dim.index.get_level_values(1).unique():
-                    for component in (
-                        dfTD1dim.loc[variable].index.get_level_values(0).unique()
-                    ):
-                        df = dfTD1dim.loc[(variable, component)].T.stack()
-                        # df.name = (name, component, variable)
-                        df.name = variable
-                        df.index.rename(["time", "space"], inplace=True)
-                        xr_da = df.to_xarray()
-                        xr_dss[ip][name][component] = xr.merge(
-                            [xr_dss[ip][name][component], xr_da]
+                    if store.get(name, key, ip) is None:
+                        store.add(
+                            name, key, ip, d["values"], True, d["dimension"]
                         )
-            # Two dimensional time dependent data
-            if dataTD2dim:
-                names = ["Variable", "Component", "LocationIn", "LocationOut"]
-                dfTD2dim = pd.concat(dataTD2dim, keys=indexTD2dim, names=names)
-                # dfTD2dim = dfTD2dim.loc[
-                #    ((dfTD2dim != 0) & (~dfTD2dim.isnull())).any(axis=1)
-                # ]
-                for variable in dfTD2dim.index.get_level_values(0).unique():
-                    # for component in dfTD2dim.index.get_level_values(1).unique():
-                    for component in (
-                        dfTD2dim.loc[variable].index.get_level_values(0).unique()
-                    ):
-                        df = dfTD2dim.loc[(variable, component)].stack()
-                        # df.name = (name, component, variable)
-                        df.name = variable
-                        df.index.rename(["space", "space_2", "time"], inplace=True)
-                        df.index = df.index.reorder_levels([2, 0, 1])
-                        xr_da = df.to_xarray()
+                    for component, xr_da in store.getDataArrays(
+                        name, key, ip
+                    ).items():
                         xr_dss[ip][name][component] = xr.merge(
                             [xr_dss[ip][name][component], xr_da]
                         )
+                else:
+                    dataTI.append(d["values"]), indexTI.append(key)
             # Time independent data
             if dataTI:
                 # One dimensional
@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from fine import utils
+from fine import utils, utilsTSA
 import fine
 import warnings
 import pyomo.environ as pyomo
@@ -730,6 +730,8 @@ class Component(metaclass=ABCMeta):
         if mdl not in esM.componentModelingDict:
             esM.componentModelingDict.update({mdl: self.modelingClass()})
         esM.componentModelingDict[mdl].componentsDict.update({self.name: self})
+        esM.componentModelingDict[mdl].resetLocationCommodityIncidence()
+        esM.registerModelingClassUpdate(mdl)
 
         if self.etl is not None:
             etlModel = fine.subclasses.endogenousTechnologicalLearning.EndogenousTechnologicalLearningModel
@@ -756,8 +758,9 @@ class Component(metaclass=ABCMeta):
         :param weightDict: dictionary to which the weight is added
         :type weightDict: dict
 
-        :param data: list to which the formatted data is added
-        :type data: list of Pandas DataFrames
+        :param data: list to which the formatted data is added or column registry in which the time series data is
+            registered without copying it
+        :type data: list of Pandas DataFrames or utilsTSA.TSAInputMatrix
 
         :param ip: investment period of transformation path analysis.
         :type ip: int
@@ -773,17 +776,37 @@ class Component(metaclass=ABCMeta):
 
         data_ = rate
         if data_ is not None:
-            data_ = data_.copy()
             uniqueIdentifiers = [self.name + rateName + loc for loc in data_.columns]
-            data_.rename(
-                columns={loc: self.name + rateName + loc for loc in data_.columns},
-                inplace=True,
-            )
-            weightDict.update(
-                {id: rateWeight for id in uniqueIdentifiers}
-            ), data.append(data_)
+            if isinstance(data, utilsTSA.TSAInputMatrix):
+                data.register(uniqueIdentifiers, data_)
+            else:
+                data_ = data_.copy()
+                data_.rename(
+                    columns={loc: self.name + rateName + loc for loc in data_.columns},
+                    inplace=True,
+                )
+                data.append(data_)
+            weightDict.update({id: rateWeight for id in uniqueIdentifiers})
         return weightDict, data
 
+    def getTSAInput(self, data, weightDict):
+        """
+        Return the time series data of a component for the time series aggregation.
+
+        :param data: formatted time series data (cf. prepareTSAInput)
+        :type data: list of Pandas DataFrames or utilsTSA.TSAInputMatrix
+
+        :param weightDict: weights of the time series
+        :type weightDict: dict
+
+        :return: concatenated time series data (or the column registry if the time series data was registered in a
+            TSAInputMatrix) and weights
+        :rtype: tuple (Pandas DataFrame, dict)
+        """
+        if isinstance(data, utilsTSA.TSAInputMatrix):
+            return data, weightDict
+        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
+
     def getTSAOutput(self, rate, rateName, data, ip):
         """
         Return a reformatted time series data after applying time series aggregation, if the original time series
@@ -795,8 +818,9 @@ class Component(metaclass=ABCMeta):
         :param rateName: name of the time series (to ensure uniqueness if a component has multiple relevant time series)
         :type rateName: string
 
-        :param data: Pandas DataFrame with the clustered time series data of all components in the energy system
-        :type data: Pandas DataFrame
+        :param data: clustered time series data of all components in the energy system. The time series are
+            returned as views on a TSAOutputMatrix and as copies of a DataFrame.
+        :type data: Pandas DataFrame or utilsTSA.TSAOutputMatrix
 
         :param ip: investment period of transformation path analysis.
         :type ip: int
@@ -807,28 +831,21 @@ class Component(metaclass=ABCMeta):
         if rate is None:
             return None
         elif isinstance(rate, dict):
-            if rate[ip] is not None:
-                uniqueIdentifiers = [
-                    self.name + rateName + loc for loc in rate[ip].columns
-                ]
-                data_ = data[uniqueIdentifiers].copy(deep=True)
-                data_.rename(
-                    columns={
-                        self.name + rateName + loc: loc for loc in rate[ip].columns
-                    },
-                    inplace=True,
-                )
-            else:
+            if rate[ip] is None:
                 return None
+            locs = rate[ip].columns
         elif isinstance(rate, pd.DataFrame):
-            uniqueIdentifiers = [self.name + rateName + loc for loc in rate.columns]
-            data_ = data[uniqueIdentifiers].copy(deep=True)
-            data_.rename(
-                columns={self.name + rateName + loc: loc for loc in rate.columns},
-                inplace=True,
-            )
+            locs = rate.columns
         else:
             raise ValueError(f"Wrong type for rate of '{self.name}': {type(rate)}")
+        uniqueIdentifiers = [self.name + rateName + loc for loc in locs]
+        if isinstance(data, utilsTSA.TSAOutputMatrix):
+            return data.getDataFrame(uniqueIdentifiers, locs)
+        data_ = data[uniqueIdentifiers].copy(deep=True)
+        data_.rename(
+            columns={self.name + rateName + loc: loc for loc in locs},
+            inplace=True,
+        )
         return data_
 
     @abstractmethod
@@ -844,13 +861,18 @@ class Component(metaclass=ABCMeta):
         raise NotImplementedError
 
     @abstractmethod
-    def getDataForTimeSeriesAggregation(self, ip):
+    def getDataForTimeSeriesAggregation(self, ip, tsaInputMatrix=None):
         """
         Abstract method which has to be implemented by subclasses (otherwise a NotImplementedError raises). Get
         all time series data of a component for time series aggregation.
 
         :param ip: investment period of transformation path analysis.
         :type ip: int
+
+        :param tsaInputMatrix: column registry in which the time series data is registered instead of returning a
+            DataFrame
+            |br| * the default value is None
+        :type tsaInputMatrix: utilsTSA.TSAInputMatrix or None
         """
         raise NotImplementedError
 
@@ -886,6 +908,19 @@ class ComponentModel(metaclass=ABCMeta):
         self._decommissioningVariablesOptimum = {}
         self._isBuiltVariablesOptimum = {}
         self._optSummary = {}
+        self._locationCommodityIncidence = None
+
+    def __getattr__(self, name):
+        # Optimal values which were stored lazily (cf. EnergySystemModel.optimize with lazyResults=True) are set
+        # when they are accessed for the first time
+        pending = self.__dict__.get("_pendingOptimalValues")
+        if pending is not None and name in pending[2]:
+            esM, key, _ = pending
+            esM.materializeOptimalValues(key)
+            return getattr(self, name)
+        raise AttributeError(
+            "'" + type(self).__name__ + "' object has no attribute '" + name + "'"
+        )
 
     ####################################################################################################################
     #                           Functions for declaring design and operation variables sets                            #
@@ -1077,19 +1112,38 @@ class ComponentModel(metaclass=ABCMeta):
             pyomo.Set(dimen=3, initialize=declareDesignDecisionVarSet),
         )
 
-    def declareOpVarSet(self, esM, pyM):
+    def declareOpVarSet(
+        self,
+        esM,
+        pyM,
+        rateNames=(("processedOperationRateFix", "processedOperationRateMax"),),
+    ):
         """
         Declare operation related sets (operation variables and mapping sets) in the pyomo object for a
         modeling class.
 
+        If pyM.eliminateZeroOperationVariables is True, locations at which a component is structurally not operated
+        in an investment period are left out of the operation variable set (cf. getZeroOperationSet). Hence, neither
+        the operation variables nor the operation constraints are declared for them.
+
         :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
         :type esM: EnergySystemModel instance
 
         :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
         :type pyM: pyomo ConcreteModel
+
+        :param rateNames: names of the fixed and maximum operation rates of each operation variable of the modeling
+            class which is indexed over the operation variable set.
+            |br| * the default value is (("processedOperationRateFix", "processedOperationRateMax"),)
+        :type rateNames: tuple of tuples of strings
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
 
+        zeroSet = set()
+        if getattr(pyM, "eliminateZeroOperationVariables", False):
+            zeroSet = self.getZeroOperationSet(esM, pyM, rateNames)
+            pyM.zeroOperationIndices[abbrvName] = zeroSet
+
         # Set for operation variables
         def declareOpVarSet(pyM):
             return (
@@ -1098,6 +1152,7 @@ class ComponentModel(metaclass=ABCMeta):
                 for loc in comp.processedLocationalEligibility.index
                 for ip in esM.investmentPeriods
                 if comp.processedLocationalEligibility[loc] == 1
+                and (loc, compName, ip) not in zeroSet
             )
 
         setattr(
@@ -1165,6 +1220,64 @@ class ComponentModel(metaclass=ABCMeta):
                 },
             )
 
+    def getZeroOperationSet(self, esM, pyM, rateNames):
+        """
+        Return the locations, components and investment periods (loc, compName, ip) at which all operation
+        variables of a component are structurally zero in all time steps. An operation variable is structurally zero
+        in a time step if
+
+        * the component has no capacity variable and its operationRateMax (or, if not given, its operationRateFix)
+          is zero or below the relevance threshold (cf. declareOperationVars), or
+        * the component has a capacity variable and its operationRateFix or operationRateMax is zero.
+
+        Components whose operation depends on the commissioning year or which have a flexible conversion are not
+        considered. For two-dimensional modeling classes, a connection is only considered if the operation in the
+        opposite direction is structurally zero as well.
+
+        :param rateNames: names of the fixed and maximum operation rates of each operation variable (cf.
+            declareOpVarSet).
+        :type rateNames: tuple of tuples of strings
+
+        :returns: set of (loc, compName, ip) tuples
+        :rtype: set
+        """
+        timeKeys = list(pyM.intraYearTimeSet)
+        relevanceThreshold = getattr(pyM, "relevanceThreshold", None)
+        validThreshold = relevanceThreshold is not None and 0 < relevanceThreshold
+
+        zeroSet = set()
+        for compName, comp in self.componentsDict.items():
+            if getattr(comp, "isCommisDepending", False) or getattr(
+                comp, "flexibleConversion", False
+            ):
+                continue
+            for ip in esM.investmentPeriods:
+                zeroLocs = None
+                for opRateFixName, opRateMaxName in rateNames:
+                    rateFix = getattr(comp, opRateFixName, {ip: None})[ip]
+                    rateMax = getattr(comp, opRateMaxName, {ip: None})[ip]
+                    if comp.hasCapacityVariable:
+                        rates = [rate for rate in [rateFix, rateMax] if rate is not None]
+                    else:
+                        rates = [rateMax if rateMax is not None else rateFix]
+                    mask = None
+                    for rate in rates:
+                        if rate is None:
+                            continue
+                        values = rate.loc[timeKeys]
+                        rateMask = values == 0
+                        if validThreshold and not comp.hasCapacityVariable:
+                            rateMask = rateMask | (values < relevanceThreshold)
+                        mask = rateMask if mask is None else mask | rateMask
+                    locs = set() if mask is None else set(mask.columns[mask.all(axis=0)])
+                    zeroLocs = locs if zeroLocs is None else zeroLocs & locs
+                if not zeroLocs:
+                    continue
+                if self.dimension == "2dim":
+                    zeroLocs = {loc for loc in zeroLocs if comp._mapI[loc] in zeroLocs}
+                zeroSet.update((loc, compName, ip) for loc in zeroLocs)
+        return zeroSet
+
     ####################################################################################################################
     #                                   Functions for declaring operation mode sets                                    #
     ####################################################################################################################
@@ -1640,64 +1753,49 @@ class ComponentModel(metaclass=ABCMeta):
         """
         abbrvName, compDict = self.abbrvName, self.componentsDict
 
-        def opBounds(pyM, loc, compName, ip, p, t):
-            if not getattr(compDict[compName], "hasCapacityVariable"):
-                if not pyM.hasSegmentation:
-                    if getattr(compDict[compName], opRateMaxName)[ip] is not None:
-                        rate = getattr(compDict[compName], opRateMaxName)[ip]
-                        if rate is not None:
-                            if relevanceThreshold is not None:
-                                validThreshold = 0 < relevanceThreshold
-                                if validThreshold and (
-                                    rate[loc][p, t] < relevanceThreshold
-                                ):
-                                    return (0, 0)
-                            return (0, rate[loc][p, t])
-                    elif getattr(compDict[compName], opRateFixName)[ip] is not None:
-                        rate = getattr(compDict[compName], opRateFixName)[ip]
-                        if rate is not None:
-                            if relevanceThreshold is not None:
-                                validThreshold = 0 < relevanceThreshold
-                                if validThreshold and (
-                                    rate[loc][p, t] < relevanceThreshold
-                                ):
-                                    return (0, 0)
-                            return (rate[loc][p, t], rate[loc][p, t])
-                    else:
-                        return (0, None)
-                elif getattr(compDict[compName], opRateMaxName)[ip] is not None:
-                    rate = getattr(compDict[compName], opRateMaxName)[ip]
-                    if rate is not None:
-                        if relevanceThreshold is not None:
-                            validThreshold = 0 < relevanceThreshold
-                            if validThreshold and (
-                                rate[loc][p, t] < relevanceThreshold
-                            ):
-                                return (0, 0)
-                        return (
-                            0,
-                            rate[loc][p, t]
-                            * esM.timeStepsPerSegment[ip].to_dict()[p, t],
-                        )
-                elif getattr(compDict[compName], opRateFixName)[ip] is not None:
-                    rate = getattr(compDict[compName], opRateFixName)[ip]
-                    if rate is not None:
-                        if relevanceThreshold is not None:
-                            validThreshold = 0 < relevanceThreshold
-                            if validThreshold and (
-                                rate[loc][p, t] < relevanceThreshold
-                            ):
-                                return (0, 0)
-                        return (
-                            rate[loc][p, t]
-                            * esM.timeStepsPerSegment[ip].to_dict()[p, t],
-                            rate[loc][p, t]
-                            * esM.timeStepsPerSegment[ip].to_dict()[p, t],
-                        )
+        # Precompute the bounds of the operation variables of components without a capacity variable once per
+        # component and investment period. The bounds are stored as nested lists (time step x location) together
+        # with position maps so that the bounds rule only has to look the values up.
+        timeKeys = list(pyM.intraYearTimeSet)
+        timePositions = {key: i for i, key in enumerate(timeKeys)}
+        validThreshold = relevanceThreshold is not None and 0 < relevanceThreshold
+        segmentDurations = {}
+        if pyM.hasSegmentation:
+            for ip in esM.investmentPeriods:
+                segmentDurations[ip] = np.array(
+                    [pyM.timeStepsPerSegment[ip][key] for key in timeKeys], dtype=float
+                )
+
+        boundArrays = {}
+        for compName, comp in compDict.items():
+            if getattr(comp, "hasCapacityVariable"):
+                continue
+            for ip in esM.investmentPeriods:
+                if getattr(comp, opRateMaxName)[ip] is not None:
+                    rate, isFix = getattr(comp, opRateMaxName)[ip], False
+                elif getattr(comp, opRateFixName)[ip] is not None:
+                    rate, isFix = getattr(comp, opRateFixName)[ip], True
                 else:
-                    return (0, None)
-            else:
+                    continue
+                values = rate.loc[timeKeys].to_numpy(dtype=float)
+                upper = values.copy()
+                if pyM.hasSegmentation:
+                    upper = upper * segmentDurations[ip][:, None]
+                if validThreshold:
+                    upper[values < relevanceThreshold] = 0
+                lower = upper if isFix else np.zeros_like(upper)
+                boundArrays[compName, ip] = (
+                    lower.tolist(),
+                    upper.tolist(),
+                    {loc: j for j, loc in enumerate(rate.columns)},
+                )
+
+        def opBounds(pyM, loc, compName, ip, p, t):
+            if (compName, ip) not in boundArrays:
                 return (0, None)
+            lower, upper, locPositions = boundArrays[compName, ip]
+            i, j = timePositions[p, t], locPositions[loc]
+            return (lower[i][j], upper[i][j])
 
         if isOperationCommisYearDepending:
             # if the operation is depending on the year of commissioning, e.g. due to variable efficiencies over the
@@ -2236,11 +2334,7 @@ class ComponentModel(metaclass=ABCMeta):
             if isOperationCommisYearDepending:
 
                 def op1(pyM, loc, compName, commis, ip, p, t):
-                    factor1 = (
-                        (esM.hoursPerSegment[ip] / esM.hoursPerSegment[ip]).to_dict()
-                        if isStateOfCharge
-                        else esM.hoursPerSegment[ip].to_dict()
-                    )
+                    factor1 = 1 if isStateOfCharge else pyM.hoursPerSegment[ip][p, t]
                     factor2 = (
                         1
                         if factorName is None
@@ -2248,17 +2342,13 @@ class ComponentModel(metaclass=ABCMeta):
                     )
                     return (
                         opVar[loc, compName, commis, ip, p, t]
-                        <= factor1[p, t] * factor2 * commisVar[loc, compName, commis]
+                        <= factor1 * factor2 * commisVar[loc, compName, commis]
                     )  # factor not dependent on ip
 
             else:
 
                 def op1(pyM, loc, compName, ip, p, t):
-                    factor1 = (
-                        (esM.hoursPerSegment[ip] / esM.hoursPerSegment[ip]).to_dict()
-                        if isStateOfCharge
-                        else esM.hoursPerSegment[ip].to_dict()
-                    )
+                    factor1 = 1 if isStateOfCharge else pyM.hoursPerSegment[ip][p, t]
                     factor2 = (
                         1
                         if factorName is None
@@ -2266,7 +2356,7 @@ class ComponentModel(metaclass=ABCMeta):
                     )
                     return (
                         opVar[loc, compName, ip, p, t]
-                        <= factor1[p, t] * factor2 * capVar[loc, compName, ip]
+                        <= factor1 * factor2 * capVar[loc, compName, ip]
                     )  # factor not dependent on ip
 
             setattr(
@@ -2334,31 +2424,23 @@ class ComponentModel(metaclass=ABCMeta):
             if isOperationCommisYearDepending:
 
                 def op2(pyM, loc, compName, commis, ip, p, t):
-                    factor = (
-                        (esM.hoursPerSegment[ip] / esM.hoursPerSegment[ip]).to_dict()
-                        if isStateOfCharge
-                        else esM.hoursPerSegment[ip].to_dict()
-                    )
+                    factor = 1 if isStateOfCharge else pyM.hoursPerSegment[ip][p, t]
                     rate = getattr(compDict[compName], opRateName)[ip]
                     return (
                         opVar[loc, compName, commis, ip, p, t]
                         == commisVar[loc, compName, commis]
                         * rate[loc][p, t]
-                        * factor[p, t]
+                        * factor
                     )
 
             else:
 
                 def op2(pyM, loc, compName, ip, p, t):
-                    factor = (
-                        (esM.hoursPerSegment[ip] / esM.hoursPerSegment[ip]).to_dict()
-                        if isStateOfCharge
-                        else esM.hoursPerSegment[ip].to_dict()
-                    )
+                    factor = 1 if isStateOfCharge else pyM.hoursPerSegment[ip][p, t]
                     rate = getattr(compDict[compName], opRateName)[ip]
                     return (
                         opVar[loc, compName, ip, p, t]
-                        == capVar[loc, compName, ip] * rate[loc][p, t] * factor[p, t]
+                        == capVar[loc, compName, ip] * rate[loc][p, t] * factor
                     )
 
             setattr(
@@ -2439,11 +2521,7 @@ class ComponentModel(metaclass=ABCMeta):
             if isOperationCommisYearDepending:
 
                 def op3(pyM, loc, compName, commis, ip, p, t):
-                    factor = (
-                        (esM.hoursPerSegment[ip] / esM.hoursPerSegment[ip]).to_dict()
-                        if isStateOfCharge
-                        else esM.hoursPerSegment[ip].to_dict()
-                    )
+                    factor = 1 if isStateOfCharge else pyM.hoursPerSegment[ip][p, t]
                     rate = getattr(compDict[compName], opRateName)[ip]
                     if relevanceThreshold is not None:
                         validTreshold = 0 < relevanceThreshold
@@ -2454,17 +2532,13 @@ class ComponentModel(metaclass=ABCMeta):
                         opVar[loc, compName, commis, ip, p, t]
                         <= commisVar[loc, compName, commis]
                         * rate[loc][p, t]
-                        * factor[p, t]
+                        * factor
                     )  # rate and factor independent from ip
 
             else:
 
                 def op3(pyM, loc, compName, ip, p, t):
-                    factor = (
-                        (esM.hoursPerSegment[ip] / esM.hoursPerSegment[ip]).to_dict()
-                        if isStateOfCharge
-                        else esM.hoursPerSegment[ip].to_dict()
-                    )
+                    factor = 1 if isStateOfCharge else pyM.hoursPerSegment[ip][p, t]
                     rate = getattr(compDict[compName], opRateName)[ip]
                     if relevanceThreshold is not None:
                         validTreshold = 0 < relevanceThreshold
@@ -2473,7 +2547,7 @@ class ComponentModel(metaclass=ABCMeta):
                             return opVar[loc, compName, ip, p, t] == 0
                     return (
                         opVar[loc, compName, ip, p, t]
-                        <= capVar[loc, compName, ip] * rate[loc][p, t] * factor[p, t]
+                        <= capVar[loc, compName, ip] * rate[loc][p, t] * factor
                     )  # rate and factor independent from ip
 
             setattr(
@@ -2554,11 +2628,7 @@ class ComponentModel(metaclass=ABCMeta):
             if isOperationCommisYearDepending:
 
                 def op4(pyM, loc, compName, commis, ip, p, t):
-                    factor = (
-                        (esM.hoursPerSegment[ip] / esM.hoursPerSegment[ip]).to_dict()
-                        if isStateOfCharge
-                        else esM.hoursPerSegment[ip].to_dict()
-                    )
+                    factor = 1 if isStateOfCharge else pyM.hoursPerSegment[ip][p, t]
                     rate = getattr(compDict[compName], opRateName)[ip]
                     if relevanceThreshold is not None:
                         validTreshold = 0 < relevanceThreshold
@@ -2569,17 +2639,13 @@ class ComponentModel(metaclass=ABCMeta):
                         opVar[loc, compName, commis, ip, p, t]
                         >= commisVar[loc, compName, commis]
                         * rate[loc][p, t]
-                        * factor[p, t]
+                        * factor
                     )  # rate and factor independent from ip
 
             else:
 
                 def op4(pyM, loc, compName, ip, p, t):
-                    factor = (
-                        (esM.hoursPerSegment[ip] / esM.hoursPerSegment[ip]).to_dict()
-                        if isStateOfCharge
-                        else esM.hoursPerSegment[ip].to_dict()
-                    )
+                    factor = 1 if isStateOfCharge else pyM.hoursPerSegment[ip][p, t]
                     rate = getattr(compDict[compName], opRateName)[ip]
                     if relevanceThreshold is not None:
                         validTreshold = 0 < relevanceThreshold
@@ -2588,7 +2654,7 @@ class ComponentModel(metaclass=ABCMeta):
                             return opVar[loc, compName, ip, p, t] == 0
                     return (
                         opVar[loc, compName, ip, p, t]
-                        >= capVar[loc, compName, ip] * rate[loc][p, t] * factor[p, t]
+                        >= capVar[loc, compName, ip] * rate[loc][p, t] * factor
                     )  # rate and factor independent from ip
 
             setattr(
@@ -2678,7 +2744,7 @@ class ComponentModel(metaclass=ABCMeta):
                     bigM = getattr(compDict[compName], "bigM")
                     return (
                         opVar[loc, compName, commis, ip, p, t]
-                        >= processedPartLoadMin * commisVar[loc, compName, commis] * esM.hoursPerSegment[ip][p, t]
+                        >= processedPartLoadMin * commisVar[loc, compName, commis] * pyM.hoursPerSegment[ip][p, t]
                         - (1 - opVarBin[loc, compName, commis, ip, p, t]) * bigM
                 )
             else:
@@ -2689,7 +2755,7 @@ class ComponentModel(metaclass=ABCMeta):
                     bigM = getattr(compDict[compName], "bigM")
                     return (
                         opVar[loc, compName, ip, p, t]
-                        >= processedPartLoadMin * capVar[loc, compName, ip] * esM.hoursPerSegment[ip][p, t]
+                        >= processedPartLoadMin * capVar[loc, compName, ip] * pyM.hoursPerSegment[ip][p, t]
                         - (1 - opVarBin[loc, compName, ip, p, t]) * bigM
                     )
             setattr(
@@ -2920,6 +2986,50 @@ class ComponentModel(metaclass=ABCMeta):
 
         raise NotImplementedError
 
+    def buildLocationCommodityIncidence(self, esM):
+        """
+        Build a dictionary which maps each location to the set of commodities for which operation variables exist
+        in the modeling class. Modeling classes can overwrite this method to build the dictionary directly from
+        the component data; by default, hasOpVariablesForLocationCommodity is evaluated for every location and
+        commodity.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :return: dictionary with locations as keys and sets of commodities as values
+        :rtype: dict
+        """
+        return {
+            loc: {
+                commod
+                for commod in esM.commodities
+                if self.hasOpVariablesForLocationCommodity(esM, loc, commod)
+            }
+            for loc in esM.locations
+        }
+
+    def getLocationCommodityIncidence(self, esM):
+        """
+        Get the (cached) dictionary which maps each location to the set of commodities for which operation
+        variables exist in the modeling class. The dictionary is built once and reset whenever a component of
+        the modeling class is added, updated or removed.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :return: dictionary with locations as keys and sets of commodities as values
+        :rtype: dict
+        """
+        if getattr(self, "_locationCommodityIncidence", None) is None:
+            self._locationCommodityIncidence = self.buildLocationCommodityIncidence(esM)
+        return self._locationCommodityIncidence
+
+    def resetLocationCommodityIncidence(self):
+        """
+        Reset the cached location-commodity incidence of the modeling class.
+        """
+        self._locationCommodityIncidence = None
+
     @abstractmethod
     def getCommodityBalanceContribution(self, pyM, commod, loc, ip, p, t):
         """
@@ -2928,6 +3038,27 @@ class ComponentModel(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def getCommodityBalanceContributionIndex(self, esM, pyM):
+        """
+        Get the contributions of the modeling class to the commodity balances as a precomputed index. The index is
+        built once per declaration of the optimization problem so that the commodity balance constraints do not
+        have to scan the components of the modeling class for every location, commodity and time step.
+        Modeling classes which do not implement this method return None; their contributions are then obtained
+        per constraint index with getCommodityBalanceContribution.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: EnergySystemModel instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :return: dictionary with (loc, commod, ip) as keys and lists of (variable, index, coefficient) tuples as
+            values. The variable is evaluated at index + (p, t). The coefficient is either a number or a dictionary
+            with (p, t) as keys.
+        :rtype: dict or None
+        """
+        return None
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
@@ -3040,11 +3171,18 @@ class ComponentModel(metaclass=ABCMeta):
             |br| * the default value is False.
         :type getoptValue: boolean
 
-        :param getOptValueCostType: the cost type can either be TAC (total anualized costs) or NPV (net present value)
+        :param getOptValueCostType: the cost type can either be TAC (total anualized costs) or NPV (net present value).
+            If a list of cost types is given, the optimal values of all cost types are evaluated in one pass and
+            returned in a dictionary with the cost types as keys.
             |br| * the default value is None.
-        :type getOptValueCostType: string
+        :type getOptValueCostType: string or list of strings
         """
-        if getOptValueCostType not in ["TAC", "NPV"]:
+        costTypes = (
+            [getOptValueCostType]
+            if isinstance(getOptValueCostType, str)
+            else list(getOptValueCostType)
+        )
+        if any(costType not in ["TAC", "NPV"] for costType in costTypes):
             raise ValueError("The cost types must be 'TAC' or 'NPV'.")
 
         var = getattr(pyM, varName + "_" + self.abbrvName)
@@ -3069,7 +3207,9 @@ class ComponentModel(metaclass=ABCMeta):
                         QPdivisorNames,
                         getOptValue,
                     )
-                return cost_results
+                if isinstance(getOptValueCostType, str):
+                    return cost_results
+                return {costType: cost_results for costType in costTypes}
             else:
                 return sum(
                     self.getLocEconomicsDesign(
@@ -3090,179 +3230,390 @@ class ComponentModel(metaclass=ABCMeta):
         else:
             # Components can have different investPerCapacity in different years.
             # The capex contribution however only depends on the capex of the
-            # commissioning year. Therefore, we initialize a dataframe with index and
-            # columns of the investment periods. The rows describe the commissioning
-            # years, e.g. a component build in year 2 but with a lifetime of three
-            # years would have entries for df.loc[2,2:5]. Afterwards we
-            # sum the contributions per column, multiply it with the annuity
-            # present value factor to get the npv of the component for
-            # different investPerCapacity and several ip for commissioning
-
-            # initialize dict with (loc,comp) as key and df as values
-            costContribution = {}
-            locCompNamesCombinations = list(
-                set([(x[0], x[1]) for x in var.get_values()])
+            # commissioning year. Therefore, the cost contributions are arranged
+            # in a matrix with the commissioning years as rows and the investment
+            # periods as columns (cf. getDesignCostContributions). Afterwards we
+            # sum the contributions per column and discount them (NPV) or divide
+            # them by the annuity present value factor (TAC) for all investment
+            # periods at once.
+            costContribution = self.getDesignCostContributions(
+                pyM,
+                esM,
+                factorNames,
+                lifetimeAttr,
+                varName,
+                divisorName,
+                QPfactorNames,
+                QPdivisorNames,
+                getOptValue,
             )
-            componentYears = {}
+            investmentPeriods = np.array(esM.investmentPeriods)
 
-            for loc, compName in locCompNamesCombinations:
-                # get all years of component with location (also stock years)
-                componentYears[compName] = (
-                    esM.getComponentAttribute(compName, "processedStockYears")
-                    + esM.investmentPeriods
+            # create dictionary with ip as key and cost contribution as value
+            if getOptValue:
+                costs = {costType: {} for costType in costTypes}
+                for (loc, compName), contribution in costContribution.items():
+                    cContrSum = contribution.sum(axis=0)
+                    if "NPV" in costs:
+                        costs["NPV"][(loc, compName)] = cContrSum * utils.discountFactor(
+                            esM, investmentPeriods, compName, loc
+                        )
+                    if "TAC" in costs:
+                        costs["TAC"][(loc, compName)] = (
+                            cContrSum
+                            / utils.annuityPresentValueFactor(
+                                esM, compName, loc, esM.investmentPeriodInterval
+                            )
+                        )
+
+                cost_results = {}
+                for costType, costValues in costs.items():
+                    data = {ip: {} for ip in esM.investmentPeriods}
+                    for (loc, compName), values in costValues.items():
+                        for i, ip in enumerate(esM.investmentPeriods):
+                            data[ip].setdefault(loc, {})[compName] = values[i]
+                    cost_results[costType] = {
+                        ip: pd.DataFrame(data[ip]) for ip in esM.investmentPeriods
+                    }
+                if isinstance(getOptValueCostType, str):
+                    return cost_results[getOptValueCostType]
+                return cost_results
+            else:
+                ipIndex = {ip: i for i, ip in enumerate(esM.investmentPeriods)}
+                cContrSums = {}
+                for (loc, compName), contribution in costContribution.items():
+                    if esM.annuityPerpetuity:
+                        # the last investment period gets the perpetuity cost
+                        # contribution, implying the system design and operation
+                        # will remain constant after the time frame of the
+                        # transformation pathway.
+                        contribution[:, -1] = contribution[:, -1] / (
+                            utils.annuityPresentValueFactor(
+                                esM, compName, loc, esM.investmentPeriodInterval
+                            )
+                            * esM.getComponent(compName).interestRate[loc]
+                        )
+                    cContrSums[(loc, compName)] = contribution.sum(
+                        axis=0
+                    ) * utils.discountFactor(esM, investmentPeriods, compName, loc)
+                return sum(
+                    cContrSums[(loc, compName)][ipIndex[ip]]
+                    for loc, compName, ip in var
+                    if ip in ipIndex
                 )
 
-                costContribution[(loc, compName)] = {
-                    (y, i): 0
-                    for y in componentYears[compName]
-                    for i in esM.investmentPeriods
-                }
+    def getDesignCostContributions(
+        self,
+        pyM,
+        esM,
+        factorNames,
+        lifetimeAttr,
+        varName,
+        divisorName="",
+        QPfactorNames=[],
+        QPdivisorNames=[],
+        getOptValue=False,
+    ):
+        """
+        Get the design dependent cost contributions of the components of a modeling class for all locations. The
+        contributions are given per location and component as matrix with the commissioning years (also stock years)
+        as rows and the investment periods as columns, e.g. a component built in year 2 with a lifetime of three
+        years has entries in row 2 and the columns 2 to 4. The factors which only depend on the lifetimes and the
+        interest rate are computed once per location and component (cf. getDesignCostWeights).
 
-            # fill the dataframes (per location and compName) with the cost
-            # contributions depending on the commissioning year (index) and the
-            # investment period (columns)
-            for loc, compName, commisYear in var:
-                ipEconomicLifetime = getattr(
-                    esM.getComponent(compName), "ipEconomicLifetime"
-                )[loc]
-                ipTechnicalLifetime = getattr(
-                    esM.getComponent(compName), "ipTechnicalLifetime"
-                )[loc]
-
-                (fullCostIntervals, costInLastEconInterval,
-                 costInLastTechInterval) = utils.getParametersForUnevenLifetimes(
-                    compName, loc, lifetimeAttr, esM
-                )
+        **Required arguments**
 
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
 
-                # calculation of the annuity
-                annuity = self.getLocEconomicsDesign(
-                    pyM,
-                    esM,
-                    factorNames,
-                    varName,
-                    loc,
-                    compName,
-                    commisYear,
-                    divisorName,
-                    QPfactorNames,
-                    QPdivisorNames,
-                    getOptValue,
+        :param esM: energy system model containing general information.
+        :type esM: EnergySystemModel instance from the FINE package
+
+        :param factorNames: Strings of the parameters that have to be multiplied within the equation.
+        :type factorNames: list of strings
+
+        :param lifetimeAttr: lifetime which defines the cost intervals ('ipEconomicLifetime' or 'ipTechnicalLifetime').
+        :type lifetimeAttr: string
+
+        :param varName: String of the variable that has to be multiplied within the equation (e.g. 'commis').
+        :type varName: string
+
+        **Default arguments**
+
+        :param divisorName: String of the variable that is used as a divisor within the equation (e.g. 'CCF').
+            |br| * the default value is "".
+        :type divisorName: string
+
+        :param QPfactorNames: Strings of the parameters that have to be multiplied when quadratic programming is used.
+        :type QPfactorNames: list of strings
+
+        :param QPdivisorNames: Strings of the parameters that have to be used as divisors when quadratic programming
+            is used.
+        :type QPdivisorNames: list of strings
+
+        :param getOptValue: Boolean that defines if the matrices contain the optimal cost values (True) or the cost
+            equations (False).
+            |br| * the default value is False.
+        :type getoptValue: boolean
+
+        :return: cost contributions with (loc, compName) as keys and numpy arrays (commissioning years x investment
+            periods) as values
+        :rtype: dict
+        """
+        var = getattr(pyM, varName + "_" + self.abbrvName)
+        costContribution, yearIndex, costWeights = {}, {}, {}
+
+        for loc, compName, commisYear in var:
+            if (loc, compName) not in costContribution:
+                years, costWeights[(loc, compName)] = self.getDesignCostWeights(
+                    esM, compName, loc, lifetimeAttr
+                )
+                yearIndex[compName] = {y: i for i, y in enumerate(years)}
+                costContribution[(loc, compName)] = np.zeros(
+                    costWeights[(loc, compName)].shape,
+                    dtype=float if getOptValue else object,
                 )
+            contribution = costContribution[(loc, compName)]
+            row = yearIndex[compName][commisYear]
+            weights = costWeights[(loc, compName)][row]
 
-                # write costs into dataframe
-                # a) costs for complete intervals
-                for i in range(commisYear, commisYear + fullCostIntervals):
-                    costContribution[(loc, compName)][
-                        (commisYear, i)
-                    ] = annuity * utils.annuityPresentValueFactor(
-                        esM, compName, loc, esM.investmentPeriodInterval
-                    )
+            # calculation of the annuity
+            annuity = self.getLocEconomicsDesign(
+                pyM,
+                esM,
+                factorNames,
+                varName,
+                loc,
+                compName,
+                commisYear,
+                divisorName,
+                QPfactorNames,
+                QPdivisorNames,
+                getOptValue,
+            )
 
-                # b) costs for last economic interval
-                # example: interval 5, economic lifetime 7, technical lifetime 10
-                # last interval has costs only in year 5 and 6
-                if costInLastEconInterval:
-                    # calculate portion of interval with economic lifetime
-                    # example: interval 5, economic lifetime 7 leads to partlyCostInLastEconomicInterval of 0.4
-                    partlyCostInLastEconomicInterval = (
-                        ipEconomicLifetime % 1
-                    ) * esM.investmentPeriodInterval
-                    costContribution[(loc, compName)][
-                        (commisYear, commisYear + fullCostIntervals)
-                    ] = annuity * utils.annuityPresentValueFactor(
-                        esM, compName, loc, partlyCostInLastEconomicInterval
-                    )
+            # write costs into matrix
+            for col in np.flatnonzero(weights):
+                contribution[row, col] = annuity * weights[col]
 
-                # c) costs for last technical interval due to additionally required capacity after technical lifetime is over
-                # example: interval 5, economic lifetime 5, technical lifetime 7 and is ceiled to 10
-                # extra costs for years 8 and 9
-                if (
-                    costInLastTechInterval
-                    and ipTechnicalLifetime % 1 != 0
-                ):
-                    partlyCostInLastTechnicalInterval = (
-                        1 - (ipTechnicalLifetime % 1)
-                    ) * esM.investmentPeriodInterval
-                    if commisYear + math.ceil(ipTechnicalLifetime) - 1 in [
-                        k[1] for k in costContribution[(loc, compName)].keys()
-                    ]:
-                        costContribution[(loc, compName)][
-                            (
-                                commisYear,
-                                commisYear + math.ceil(ipTechnicalLifetime) - 1,
-                            )
-                        ] = costContribution[(loc, compName)][
-                            (
-                                commisYear,
-                                commisYear + math.ceil(ipTechnicalLifetime) - 1,
-                            )
-                        ] + annuity * (
-                            utils.annuityPresentValueFactor(
-                                esM,
-                                compName,
-                                loc,
-                                partlyCostInLastTechnicalInterval,
-                            )
-                            / (1 + esM.getComponent(compName).interestRate[loc])
-                            ** (
-                                esM.investmentPeriodInterval
-                                - partlyCostInLastTechnicalInterval
-                            )
-                        )
+        return costContribution
 
-            # create dictionary with ip as key and cost contribution as value
-            if getOptValue:
-                cost_results = {ip: pd.DataFrame() for ip in esM.investmentPeriods}
-                for loc, compName in locCompNamesCombinations:
-                    for ip in esM.investmentPeriods:
-                        cContrSum = sum(
-                            [
-                                costContribution[(loc, compName)].get((y, ip), 0)
-                                for y in componentYears[compName]
-                            ]
-                        )
-                        if getOptValueCostType == "NPV":
-                            cost_results[ip].loc[compName, loc] = (
-                                cContrSum * utils.discountFactor(esM, ip, compName, loc)
-                            )
-                        elif getOptValueCostType == "TAC":
-                            cost_results[ip].loc[compName, loc] = (
-                                cContrSum
-                                / utils.annuityPresentValueFactor(
-                                    esM, compName, loc, esM.investmentPeriodInterval
-                                )
-                            )
-                return cost_results
+    def getDesignCostWeights(self, esM, compName, loc, lifetimeAttr):
+        """
+        Get the factors with which the annuity of a commissioning enters the design dependent cost contributions of
+        the investment periods (cf. getDesignCostContributions), e.g. a component built in year 2 with a lifetime of
+        three years has factors in row 2 and the columns 2 to 4.
+
+        :param esM: energy system model containing general information.
+        :type esM: EnergySystemModel instance from the FINE package
+
+        :param compName: name of the component
+        :type compName: string
+
+        :param loc: location (or connection) of the component
+        :type loc: string
+
+        :param lifetimeAttr: lifetime which defines the cost intervals ('ipEconomicLifetime' or 'ipTechnicalLifetime').
+        :type lifetimeAttr: string
+
+        :return: years of the component (stock years and investment periods) and the factors (years x investment
+            periods)
+        :rtype: tuple (list, numpy array)
+        """
+        comp = self.componentsDict[compName]
+        years = comp.processedStockYears + esM.investmentPeriods
+        ipIndex = {ip: i for i, ip in enumerate(esM.investmentPeriods)}
+
+        (
+            fullCostIntervals,
+            costInLastEconInterval,
+            costInLastTechInterval,
+        ) = utils.getParametersForUnevenLifetimes(compName, loc, lifetimeAttr, esM)
+        ipEconomicLifetime = comp.ipEconomicLifetime[loc]
+        ipTechnicalLifetime = comp.ipTechnicalLifetime[loc]
+        fullFactor = utils.annuityPresentValueFactor(
+            esM, compName, loc, esM.investmentPeriodInterval
+        )
+
+        # factor for the last economic interval
+        # example: interval 5, economic lifetime 7, technical lifetime 10
+        # last interval has costs only in year 5 and 6, i.e.
+        # partlyCostInLastEconomicInterval is 0.4 * interval
+        lastEconFactor = None
+        if costInLastEconInterval:
+            partlyCostInLastEconomicInterval = (
+                ipEconomicLifetime % 1
+            ) * esM.investmentPeriodInterval
+            lastEconFactor = utils.annuityPresentValueFactor(
+                esM, compName, loc, partlyCostInLastEconomicInterval
+            )
+
+        # factor for the last technical interval due to additionally required capacity after technical
+        # lifetime is over
+        # example: interval 5, economic lifetime 5, technical lifetime 7 and is ceiled to 10
+        # extra costs for years 8 and 9
+        lastTechFactor = None
+        if costInLastTechInterval and ipTechnicalLifetime % 1 != 0:
+            partlyCostInLastTechnicalInterval = (
+                1 - (ipTechnicalLifetime % 1)
+            ) * esM.investmentPeriodInterval
+            lastTechFactor = utils.annuityPresentValueFactor(
+                esM, compName, loc, partlyCostInLastTechnicalInterval
+            ) / (1 + comp.interestRate[loc]) ** (
+                esM.investmentPeriodInterval - partlyCostInLastTechnicalInterval
+            )
+        lastTechOffset = math.ceil(ipTechnicalLifetime) - 1
+
+        weights = np.zeros((len(years), len(esM.investmentPeriods)))
+        for row, commisYear in enumerate(years):
+            # a) costs for complete intervals
+            for i in range(commisYear, commisYear + fullCostIntervals):
+                if i in ipIndex:
+                    weights[row, ipIndex[i]] = fullFactor
+
+            # b) costs for last economic interval
+            if lastEconFactor is not None and commisYear + fullCostIntervals in ipIndex:
+                weights[row, ipIndex[commisYear + fullCostIntervals]] = lastEconFactor
+
+            # c) costs for last technical interval
+            if lastTechFactor is not None and commisYear + lastTechOffset in ipIndex:
+                weights[row, ipIndex[commisYear + lastTechOffset]] += lastTechFactor
+
+        return years, weights
+
+    def getOptimalDesignCosts(self, pyM, esM):
+        """
+        Get the optimal design dependent costs of all components in one pass over the optimal values of the
+        commissioning variables, i.e. the investment (cx) and operation (ox) costs proportional to the commissioning
+        and the investment (cx_bin) and operation (ox_bin) costs if built. The annuities of all commissioning years
+        of a component at a location are computed as vectors (cf. getLocEconomicsDesign) and multiplied with the
+        factors of the cost intervals (cf. getDesignCostWeights).
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param esM: energy system model containing general information.
+        :type esM: EnergySystemModel instance from the FINE package
+
+        :return: optimal costs with the cost names ('cx', 'ox', 'cx_bin', 'ox_bin') and the cost types ('NPV', 'TAC')
+            as keys and dictionaries with the investment periods as keys and DataFrames (components x locations) as
+            values
+        :rtype: dict
+        """
+        # factorNames, divisorName, QPfactorNames, QPdivisorNames and lifetimeAttr of the costs per variable
+        costSpecs = {
+            "commis": {
+                "cx": (
+                    ["processedInvestPerCapacity", "QPcostDev"],
+                    "CCF",
+                    ["processedQPcostScale", "processedInvestPerCapacity"],
+                    ["QPbound", "CCF"],
+                    "ipEconomicLifetime",
+                ),
+                "ox": (
+                    ["processedOpexPerCapacity", "QPcostDev"],
+                    "",
+                    ["processedQPcostScale", "processedOpexPerCapacity"],
+                    ["QPbound"],
+                    "ipTechnicalLifetime",
+                ),
+            },
+            "commisBin": {
+                "cx_bin": (["processedInvestIfBuilt"], "CCF", [], [], "ipEconomicLifetime"),
+                "ox_bin": (["processedOpexIfBuilt"], "", [], [], "ipTechnicalLifetime"),
+            },
+        }
+
+        # Collect the optimal values per location and component
+        optVals = {}
+        for varName in costSpecs:
+            var = getattr(pyM, varName + "_" + self.abbrvName)
+            for (loc, compName, commisYear), value in var.get_values().items():
+                optVals.setdefault((loc, compName), {}).setdefault(varName, {})[
+                    commisYear
+                ] = value
+
+        def parameter(comp, name, loc, years):
+            return np.array([getattr(comp, name)[year][loc] for year in years], dtype=float)
+
+        investmentPeriods = np.array(esM.investmentPeriods)
+        costs = {costName: {} for specs in costSpecs.values() for costName in specs}
+        for (loc, compName), values in optVals.items():
+            comp = self.componentsDict[compName]
+            discountFactor = utils.discountFactor(esM, investmentPeriods, compName, loc)
+            fullFactor = utils.annuityPresentValueFactor(
+                esM, compName, loc, esM.investmentPeriodInterval
+            )
+            if comp.floorTechnicalLifetime:
+                roundedTechnicalLifetime = math.floor(comp.ipTechnicalLifetime[loc])
             else:
-                if esM.annuityPerpetuity:
-                    # the last investment period gets the perpetuity cost
-                    # contribution, implying the system design and operation
-                    # will remain constant after the time frame of the
-                    # transformation pathway.
-                    for (loc, compName) in costContribution.keys(): # noqa: PLC0206
-                        for y in componentYears[compName]:
-                            costContribution[(loc, compName)][
-                                (y, esM.investmentPeriods[-1])
-                            ] = costContribution[(loc, compName)][
-                                (y, esM.investmentPeriods[-1])
-                            ] / (
-                                utils.annuityPresentValueFactor(
-                                    esM, compName, loc, esM.investmentPeriodInterval
-                                )
-                                * esM.getComponent(compName).interestRate[loc]
-                            )
-                return sum(
-                    sum(
-                        [
-                            costContribution[(loc, compName)].get((y, ip), 0)
-                            for y in componentYears[compName]
-                        ]
-                    )
-                    * utils.discountFactor(esM, ip, compName, loc)
-                    for loc, compName, ip in var
-                    if ip in esM.investmentPeriods
-                )
+                roundedTechnicalLifetime = math.ceil(comp.ipTechnicalLifetime[loc])
+            stock = comp.processedStockCommissioning
+            rows = {
+                year: i
+                for i, year in enumerate(comp.processedStockYears + esM.investmentPeriods)
+            }
+
+            weights = {}
+            for varName, varValues in values.items():
+                # stock years older than the technical lifetime or without stock commissioning have no costs
+                years = [
+                    year
+                    for year in varValues
+                    if year >= -roundedTechnicalLifetime
+                    and (year >= 0 or (stock is not None and stock[year][loc] != 0))
+                ]
+                x = np.array([varValues[year] for year in years], dtype=float)
+                isQP = parameter(comp, "processedQPcostScale", loc, years) != 0
+                yearsQP = [year for year, qp in zip(years, isQP) if qp]
+
+                for costName, (
+                    factorNames,
+                    divisorName,
+                    QPfactorNames,
+                    QPdivisorNames,
+                    lifetimeAttr,
+                ) in costSpecs[varName].items():
+                    if lifetimeAttr not in weights:
+                        weights[lifetimeAttr] = self.getDesignCostWeights(
+                            esM, compName, loc, lifetimeAttr
+                        )[1]
+
+                    # annuities of all commissioning years (cf. getLocEconomicsDesign)
+                    factor = np.ones(len(years))
+                    if divisorName:
+                        factor = factor / parameter(comp, divisorName, loc, years)
+                    for factorName in factorNames:
+                        factor = factor * parameter(comp, factorName, loc, years)
+                    annuity = factor * x
+                    if yearsQP:
+                        QPfactor = np.ones(len(yearsQP))
+                        for QPfactorName in QPfactorNames:
+                            QPfactor = QPfactor * parameter(comp, QPfactorName, loc, yearsQP)
+                        for QPdivisorName in QPdivisorNames:
+                            QPfactor = QPfactor / parameter(comp, QPdivisorName, loc, yearsQP)
+                        annuity[isQP] += QPfactor * x[isQP] * x[isQP]
+
+                    cContrSum = annuity @ weights[lifetimeAttr][
+                        [rows[year] for year in years]
+                    ]
+                    costs[costName][(loc, compName)] = {
+                        "NPV": cContrSum * discountFactor,
+                        "TAC": cContrSum / fullFactor,
+                    }
+
+        results = {}
+        for costName, costValues in costs.items():
+            results[costName] = {}
+            for costType in ["NPV", "TAC"]:
+                data = {ip: {} for ip in esM.investmentPeriods}
+                for (loc, compName), contribution in costValues.items():
+                    for i, ip in enumerate(esM.investmentPeriods):
+                        data[ip].setdefault(loc, {})[compName] = contribution[costType][i]
+                results[costName][costType] = {
+                    ip: pd.DataFrame(data[ip]) for ip in esM.investmentPeriods
+                }
+        return results
 
     def getLocEconomicsDesign(
         self,
@@ -3816,103 +4167,102 @@ class ComponentModel(metaclass=ABCMeta):
             tuples, names=["Component", "Property", "Unit"]
         )
 
-        # get the results for all components
-        resultsNPV_cx = self.getEconomicsDesign(
-            pyM,
-            esM,
-            factorNames=["processedInvestPerCapacity", "QPcostDev"],
-            QPfactorNames=["processedQPcostScale", "processedInvestPerCapacity"],
-            lifetimeAttr="ipEconomicLifetime",
-            varName="commis",
-            divisorName="CCF",
-            QPdivisorNames=["QPbound", "CCF"],
-            getOptValue=True,
-            getOptValueCostType="NPV",
-        )
-
-        resultsTAC_cx = self.getEconomicsDesign(
-            pyM,
-            esM,
-            factorNames=["processedInvestPerCapacity", "QPcostDev"],
-            QPfactorNames=["processedQPcostScale", "processedInvestPerCapacity"],
-            lifetimeAttr="ipEconomicLifetime",
-            varName="commis",
-            divisorName="CCF",
-            QPdivisorNames=["QPbound", "CCF"],
-            getOptValue=True,
-            getOptValueCostType="TAC",
-        )
-
-        resultsNPV_ox = self.getEconomicsDesign(
-            pyM,
-            esM,
-            factorNames=["processedOpexPerCapacity", "QPcostDev"],
-            QPfactorNames=["processedQPcostScale", "processedOpexPerCapacity"],
-            lifetimeAttr="ipTechnicalLifetime",
-            varName="commis",
-            QPdivisorNames=["QPbound"],
-            getOptValue=True,
-            getOptValueCostType="NPV",
-        )
-
-        resultsTAC_ox = self.getEconomicsDesign(
-            pyM,
-            esM,
-            factorNames=["processedOpexPerCapacity", "QPcostDev"],
-            QPfactorNames=["processedQPcostScale", "processedOpexPerCapacity"],
-            lifetimeAttr="ipTechnicalLifetime",
-            varName="commis",
-            QPdivisorNames=["QPbound"],
-            getOptValue=True,
-            getOptValueCostType="TAC",
-        )
+        # get the results for all components. All design dependent costs are evaluated in one pass over the
+        # optimal values of the commissioning variables (cf. getOptimalDesignCosts).
+        if not esM.stochasticModel:
+            designCosts = self.getOptimalDesignCosts(pyM, esM)
+            resultsNPV_cx, resultsTAC_cx = designCosts["cx"]["NPV"], designCosts["cx"]["TAC"]
+            resultsNPV_ox, resultsTAC_ox = designCosts["ox"]["NPV"], designCosts["ox"]["TAC"]
+            resultsNPV_cx_bin, resultsTAC_cx_bin = (
+                designCosts["cx_bin"]["NPV"],
+                designCosts["cx_bin"]["TAC"],
+            )
+            resultsNPV_ox_bin, resultTAC_ox_bin = (
+                designCosts["ox_bin"]["NPV"],
+                designCosts["ox_bin"]["TAC"],
+            )
+        else:
+            results_cx = self.getEconomicsDesign(
+                pyM,
+                esM,
+                factorNames=["processedInvestPerCapacity", "QPcostDev"],
+                QPfactorNames=["processedQPcostScale", "processedInvestPerCapacity"],
+                lifetimeAttr="ipEconomicLifetime",
+                varName="commis",
+                divisorName="CCF",
+                QPdivisorNames=["QPbound", "CCF"],
+                getOptValue=True,
+                getOptValueCostType=["NPV", "TAC"],
+            )
+            resultsNPV_cx, resultsTAC_cx = results_cx["NPV"], results_cx["TAC"]
 
-        # Get NPV contribution for investmentIfBuilt
-        resultsNPV_cx_bin = self.getEconomicsDesign(
-            pyM,
-            esM,
-            factorNames=["processedInvestIfBuilt"],
-            lifetimeAttr="ipEconomicLifetime",
-            varName="commisBin",
-            divisorName="CCF",
-            getOptValue=True,
-            getOptValueCostType="NPV",
-        )
+            results_ox = self.getEconomicsDesign(
+                pyM,
+                esM,
+                factorNames=["processedOpexPerCapacity", "QPcostDev"],
+                QPfactorNames=["processedQPcostScale", "processedOpexPerCapacity"],
+                lifetimeAttr="ipTechnicalLifetime",
+                varName="commis",
+                QPdivisorNames=["QPbound"],
+                getOptValue=True,
+                getOptValueCostType=["NPV", "TAC"],
+            )
+            resultsNPV_ox, resultsTAC_ox = results_ox["NPV"], results_ox["TAC"]
 
-        # Calculate the annualized investment costs cx (CAPEX)
-        # Get TAC for investmentIfBuilt
-        resultsTAC_cx_bin = self.getEconomicsDesign(
-            pyM,
-            esM,
-            factorNames=["processedInvestIfBuilt"],
-            lifetimeAttr="ipEconomicLifetime",
-            varName="commisBin",
-            divisorName="CCF",
-            getOptValue=True,
-            getOptValueCostType="TAC",
-        )
+            # Get NPV contribution and annualized investment costs cx (CAPEX) for investmentIfBuilt
+            results_cx_bin = self.getEconomicsDesign(
+                pyM,
+                esM,
+                factorNames=["processedInvestIfBuilt"],
+                lifetimeAttr="ipEconomicLifetime",
+                varName="commisBin",
+                divisorName="CCF",
+                getOptValue=True,
+                getOptValueCostType=["NPV", "TAC"],
+            )
+            resultsNPV_cx_bin, resultsTAC_cx_bin = (
+                results_cx_bin["NPV"],
+                results_cx_bin["TAC"],
+            )
 
-        # Get NPV cost contribution for the annualized operational costs if built ox (OPEX)
-        resultsNPV_ox_bin = self.getEconomicsDesign(
-            pyM,
-            esM,
-            factorNames=["processedOpexIfBuilt"],
-            lifetimeAttr="ipTechnicalLifetime",
-            varName="commisBin",
-            getOptValue=True,
-            getOptValueCostType="NPV",
-        )
+            # Get NPV cost contribution and annualized operational costs if built ox (OPEX)
+            results_ox_bin = self.getEconomicsDesign(
+                pyM,
+                esM,
+                factorNames=["processedOpexIfBuilt"],
+                lifetimeAttr="ipTechnicalLifetime",
+                varName="commisBin",
+                getOptValue=True,
+                getOptValueCostType=["NPV", "TAC"],
+            )
+            resultsNPV_ox_bin, resultTAC_ox_bin = (
+                results_ox_bin["NPV"],
+                results_ox_bin["TAC"],
+            )
 
-        # Calculate the annualized operational costs if built ox (OPEX)
-        resultTAC_ox_bin = self.getEconomicsDesign(
-            pyM,
-            esM,
-            factorNames=["processedOpexIfBuilt"],
-            lifetimeAttr="ipTechnicalLifetime",
-            varName="commisBin",
-            getOptValue=True,
-            getOptValueCostType="TAC",
-        )
+        # Read the optimal values of the design variables once and format them for all investment periods
+        designOptVals = {}
+        for varName, var in [
+            ("cap", capVar),
+            ("commis", commisVar),
+            ("decommis", decommisVar),
+            ("commisBin", binVar),
+        ]:
+            values = utils.getOptimalVariableValues(var)
+            designOptVals[varName] = utils.formatOptimizationOutputPerPeriod(
+                values, "designVariables", "1dim", esM.investmentPeriods
+            )
+            designOptVals[varName + "_"] = (
+                utils.formatOptimizationOutputPerPeriod(
+                    values,
+                    "designVariables",
+                    self.dimension,
+                    esM.investmentPeriods,
+                    compDict=compDict,
+                )
+                if self.dimension == "2dim"
+                else designOptVals[varName]
+            )
 
         optSummary = {}
         for ip in esM.investmentPeriods:
@@ -3921,33 +4271,18 @@ class ComponentModel(metaclass=ABCMeta):
             ).sort_index()
 
             # Get and set optimal variable values for capacities
-            values = capVar.get_values()
-            capOptVal = utils.formatOptimizationOutput(
-                values, "designVariables", "1dim", ip
-            )
-            capOptVal_ = utils.formatOptimizationOutput(
-                values, "designVariables", self.dimension, ip, compDict=compDict
-            )
+            capOptVal = designOptVals["cap"][ip]
+            capOptVal_ = designOptVals["cap_"][ip]
             self._capacityVariablesOptimum[esM.investmentPeriodNames[ip]] = capOptVal_
             # Get and set optimal variable values for commissioning
-            commisValues = commisVar.get_values()
-            commisOptVal = utils.formatOptimizationOutput(
-                commisValues, "designVariables", "1dim", ip
-            )
-            commisOptVal_ = utils.formatOptimizationOutput(
-                commisValues, "designVariables", self.dimension, ip, compDict=compDict
-            )
+            commisOptVal = designOptVals["commis"][ip]
+            commisOptVal_ = designOptVals["commis_"][ip]
             self._commissioningVariablesOptimum[esM.investmentPeriodNames[ip]] = (
                 commisOptVal_
             )
             # Get and set optimal variable values for decommissioning
-            decommisValues = decommisVar.get_values()
-            decommisOptVal = utils.formatOptimizationOutput(
-                decommisValues, "designVariables", "1dim", ip
-            )
-            decommisOptVal_ = utils.formatOptimizationOutput(
-                decommisValues, "designVariables", self.dimension, ip, compDict=compDict
-            )
+            decommisOptVal = designOptVals["decommis"][ip]
+            decommisOptVal_ = designOptVals["decommis_"][ip]
             self._decommissioningVariablesOptimum[esM.investmentPeriodNames[ip]] = (
                 decommisOptVal_
             )
@@ -4102,13 +4437,8 @@ class ComponentModel(metaclass=ABCMeta):
                         ] = val_revenueLifetimeShorteningResale
 
             # Get and set optimal variable values for binary investment decisions (isBuiltBinary).
-            values = binVar.get_values()
-            binCapOptVal = utils.formatOptimizationOutput(
-                values, "designVariables", "1dim", ip
-            )
-            binCapOptVal_ = utils.formatOptimizationOutput(
-                values, "designVariables", self.dimension, ip=ip, compDict=compDict
-            )
+            binCapOptVal = designOptVals["commisBin"][ip]
+            binCapOptVal_ = designOptVals["commisBin_"][ip]
             self._isBuiltVariablesOptimum[esM.investmentPeriodNames[ip]] = binCapOptVal_
 
             if binCapOptVal is not None:
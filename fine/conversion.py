@@ -414,13 +414,18 @@ class Conversion(Component):
                         else self.fullCommodityConversionFactors[timeInfo][commod]
                     )
 
-    def getDataForTimeSeriesAggregation(self, ip):
+    def getDataForTimeSeriesAggregation(self, ip, tsaInputMatrix=None):
         """Function for getting the required data if a time series aggregation is requested.
 
         :param ip: investment period of transformation path analysis.
         :type ip: int
+
+        :param tsaInputMatrix: column registry in which the time series data is registered instead of returning a
+            DataFrame (cf. EnergySystemModel.getTimeSeriesDataForAggregation)
+            |br| * the default value is None
+        :type tsaInputMatrix: utilsTSA.TSAInputMatrix or None
         """
-        weightDict, data = {}, []
+        weightDict, data = {}, ([] if tsaInputMatrix is None else tsaInputMatrix)
         if self.fullOperationRateFix:
             weightDict, data = self.prepareTSAInput(
                 self.fullOperationRateFix,
@@ -480,7 +485,7 @@ class Conversion(Component):
                         data,
                         ip,
                     )
-        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
+        return self.getTSAInput(data, weightDict)
 
     def setAggregatedTimeSeriesData(self, data, ip):
         """
@@ -1183,35 +1188,43 @@ class ConversionModel(ComponentModel):
         :param commod: Name of the regarded commodity (commodities are defined in the EnergySystemModel instance)
         :param commod: string
         """
+        return commod in self.getLocationCommodityIncidence(esM).get(loc, ())
+
+    def buildLocationCommodityIncidence(self, esM):
+        """
+        Build a dictionary which maps each location to the set of commodities which are converted at the location
+        (see ComponentModel.getLocationCommodityIncidence). Commodities with emission factors are considered at
+        all locations.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+        """
         # note: year definition can either
         # a) int: if the commodity conversion factor is constant for commissioning years
         # b) tuple with (commisYear,ip) if the commodity conversion is varying with the commissioning year
-
-        operationFlexVarSet = getattr(esM.pyM, "operationFlexVarSet_" + self.abbrvName)
-        flexible_commods = {
-            index[4]
-            for index in operationFlexVarSet
-            if index[0] == loc
-        }
-        return any(
-            [
-                (
-                    commod in comp.processedCommodityConversionFactors[yearDefinition]
-                    and (
-                        comp.processedCommodityConversionFactors[yearDefinition][commod]
-                        is not None
-                    )
-                )
-                and comp.processedLocationalEligibility[loc] == 1
-                for comp in self.componentsDict.values()
-                for yearDefinition in comp.processedCommodityConversionFactors.keys()
-            ] +
-            [
-                commod in comp.processedEmissionFactors.keys()
-                for comp in self.componentsDict.values()
-                if comp.processedEmissionFactors is not None
-            ]
-        ) or commod in flexible_commods
+        incidence = {loc: set() for loc in esM.locations}
+        emissionCommods = set()
+        for comp in self.componentsDict.values():
+            if comp.processedEmissionFactors is not None:
+                emissionCommods.update(comp.processedEmissionFactors.keys())
+            commods = set()
+            for yearDefinition, ccfs in comp.processedCommodityConversionFactors.items():
+                for commod, ccf in ccfs.items():
+                    # commodity groups of flexible conversion components
+                    if isinstance(ccf, dict):
+                        if (
+                            comp.flexibleConversion
+                            and yearDefinition in esM.investmentPeriods
+                        ):
+                            commods.update(ccf.keys())
+                    elif ccf is not None:
+                        commods.add(commod)
+            for loc in comp.processedLocationalEligibility.index:
+                if comp.processedLocationalEligibility[loc] == 1:
+                    incidence.setdefault(loc, set()).update(commods)
+        for loc in incidence.keys():
+            incidence[loc].update(emissionCommods)
+        return incidence
 
     def flexConversionConstraint(self, pyM, esM):
         """
@@ -1391,6 +1404,95 @@ class ConversionModel(ComponentModel):
 
         return sumCommisYearIndependent + sumCommisYearDependent + sumCommisYearIndependentFlex + sumFlexEmission
 
+    def getCommodityBalanceContributionIndex(self, esM, pyM):
+        """
+        Get the contributions to the commodity balances as a precomputed index
+        (see ComponentModel.getCommodityBalanceContributionIndex). Time-dependent commodity conversion factors
+        are converted once to dictionaries with (p, t) as keys.
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar = getattr(pyM, "op_" + abbrvName)
+        opVarFlex = getattr(pyM, "op_flex_" + abbrvName)
+        opCommisVar = getattr(pyM, "op_commis_" + abbrvName)
+        opVarDict = getattr(pyM, "operationVarDict_" + abbrvName)
+
+        def getFactor(commodCommodityConversionFactors, loc, absolute=False):
+            if isinstance(commodCommodityConversionFactors, (int, float)):
+                if absolute:
+                    return abs(commodCommodityConversionFactors)
+                return commodCommodityConversionFactors
+            else:
+                factor = commodCommodityConversionFactors[loc]
+                if absolute:
+                    factor = factor.abs()
+                return factor.to_dict()
+
+        balanceIndex = {}
+        for ip, locDict in opVarDict.items():
+            for loc, compNames in locDict.items():
+                for compName in compNames:
+                    comp = compDict[compName]
+                    # 1. components with commodity conversions which do not vary with the commissioning year
+                    # (commodity groups of flexible conversion components are considered below)
+                    if not comp.isCommisDepending:
+                        for commod, ccf in comp.processedCommodityConversionFactors[
+                            ip
+                        ].items():
+                            if ccf is None or isinstance(ccf, dict):
+                                continue
+                            balanceIndex.setdefault((loc, commod, ip), []).append(
+                                (opVar, (loc, compName, ip), getFactor(ccf, loc))
+                            )
+                    # 2. components with commodity conversions depending on the commissioning year
+                    elif comp.isCommisDepending:
+                        for (
+                            _commis,
+                            _ip,
+                        ), ccfs in comp.processedCommodityConversionFactors.items():
+                            if _ip != ip:
+                                continue
+                            for commod, ccf in ccfs.items():
+                                if ccf is None:
+                                    continue
+                                balanceIndex.setdefault((loc, commod, ip), []).append(
+                                    (
+                                        opCommisVar,
+                                        (loc, compName, _commis, ip),
+                                        getFactor(ccf, loc),
+                                    )
+                                )
+
+        # 3. flexible conversion components and their emissions
+        for loc, compName, ip, group in getattr(
+            pyM, "operationFlexGroupSet_" + abbrvName
+        ):
+            comp = compDict[compName]
+            ccfs = comp.processedCommodityConversionFactors[ip][group]
+            if not comp.isCommisDepending and comp.flexibleConversion:
+                for commod, ccf in ccfs.items():
+                    balanceIndex.setdefault((loc, commod, ip), []).append(
+                        (opVarFlex, (loc, compName, ip, group, commod), getFactor(ccf, loc))
+                    )
+            if comp.processedEmissionFactors is not None:
+                for commod, emissionFactors in comp.processedEmissionFactors.items():
+                    if emissionFactors is None:
+                        continue
+                    for commodity in emissionFactors.keys():
+                        if commodity in ccfs.keys():
+                            factor = getFactor(ccfs[commodity], loc, absolute=True)
+                            emissionFactor = comp.emissionFactors[commod][commodity]
+                            if isinstance(factor, dict):
+                                factor = {
+                                    key: val * emissionFactor
+                                    for key, val in factor.items()
+                                }
+                            else:
+                                factor = factor * emissionFactor
+                            balanceIndex.setdefault((loc, commod, ip), []).append(
+                                (opVarFlex, (loc, compName, ip, group, commodity), factor)
+                            )
+        return balanceIndex
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
@@ -1452,16 +1554,18 @@ class ConversionModel(ComponentModel):
             getOptValueCostType="NPV",
         )
 
+        opOptVals = utils.formatOptimizationOutputPerPeriod(
+            utils.getOptimalVariableValues(opVar),
+            "operationVariables",
+            "1dim",
+            esM.investmentPeriods,
+            esM.periodsOrder,
+            esM=esM,
+        )
+
         for ip in esM.investmentPeriods:
             # Set optimal operation variables and append optimization summary
-            optVal = utils.formatOptimizationOutput(
-                opVar.get_values(),
-                "operationVariables",
-                "1dim",
-                ip,
-                esM.periodsOrder[ip],
-                esM=esM,
-            )
+            optVal = opOptVals[ip]
             self._operationVariablesOptimum[esM.investmentPeriodNames[ip]] = optVal
 
             props = ["operation", "opexOp", "NPV_opexOp"]
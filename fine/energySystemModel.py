@@ -9,9 +9,8 @@ import pandas as pd
 import psutil
 import pyomo.environ as pyomo
 from pyomo import opt
-from tsam.timeseriesaggregation import TimeSeriesAggregation
 
-from fine import utils
+from fine import utils, utilsProfile, utilsResults, utilsSolver, utilsTSA
 from fine.aggregations.spatialAggregation import manager as spagat
 from fine.component import Component, ComponentModel
 from fine.IOManagement import xarrayIO as xrIO
@@ -20,6 +19,24 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 warnings.filterwarnings("always", category=UserWarning)
 
+# Internal names of the optimal values which are set in the setOptimalValues method of the modeling classes. The
+# optimal values are additionally stored under their external name (e.g. capacityVariablesOptimum).
+optimalValueParameters = [
+    "_optSummary",
+    "_stateOfChargeOperationVariablesOptimum",
+    "_chargeOperationVariablesOptimum",
+    "_dischargeOperationVariablesOptimum",
+    "_phaseAngleVariablesOptimum",
+    "_operationVariablesOptimum",
+    "_discretizationPointVariablesOptimun",
+    "_discretizationSegmentConVariablesOptimun",
+    "_discretizationSegmentBinVariablesOptimun",
+    "_capacityVariablesOptimum",
+    "_isBuiltVariablesOptimum",
+    "_commissioningVariablesOptimum",
+    "_decommissioningVariablesOptimum",
+]
+
 
 class EnergySystemModel:
     """
@@ -67,6 +84,23 @@ class EnergySystemModel:
     * getting components and their attributes (**getComponent, getCompAttr, getOptimizationSummary**)
     """
 
+    # Component parameters which only enter the objective function of the optimization problem. If only these
+    # parameters are updated, an incrementally declared optimization problem only redeclares its objective function.
+    costAttributes = [
+        "investPerCapacity",
+        "investIfBuilt",
+        "opexPerOperation",
+        "opexPerChargeOperation",
+        "opexPerDischargeOperation",
+        "opexPerCapacity",
+        "opexIfBuilt",
+        "commodityCost",
+        "commodityRevenue",
+        "commodityCostTimeSeries",
+        "commodityRevenueTimeSeries",
+        "interestRate",
+    ]
+
     def __init__(
         self,
         locations,
@@ -320,6 +354,8 @@ class EnergySystemModel:
             None,
             None,
         )
+        # Estimated reconstruction errors of the numbers of typical periods (set by aggregateTemporallyAuto)
+        self.typicalPeriodErrors = None
         self.timeUnit = "h"
 
         ################################################################################################################
@@ -397,8 +433,35 @@ class EnergySystemModel:
         # The objectiveValue parameter is None when the EnergySystemModel is initialized. After calling the
         # optimize function, the objective value (i.e. TAC of the analyzed energy system) is stored in the
         # objectiveValue parameter for easier access.
+        # The persistentSolver parameter stores the name of the solver and the persistent solver instance
+        # if the optimization problem was solved with persistent=True (otherwise it is None).
+        # The buildProfile parameter stores statistics (build time, number of indices, RSS change and nonzeros) of
+        # the pyomo components declared by each modeling class if the declaration was profiled (otherwise it is None).
+        # The pyMComponentNames parameter stores the names of the pyomo components declared by each modeling class
+        # (and by the cross-componential declaration step) and the modifiedModelingClasses parameter stores which
+        # modeling classes were changed since the last declaration and how ('all' or 'costs'). Both are used to
+        # rebuild the optimization problem incrementally.
+        # The lazyOptimalValues parameter stores the raw values of all variables (name: numpy array) if the
+        # optimization problem was solved with lazyResults=True and the optimal values of at least one modeling
+        # class were not set yet (otherwise it is None).
+        # The fullTimeSeriesIndex parameter caches the index maps which are used to reconstruct full time series
+        # from the data of the typical periods (cf. utils.getFullTimeSeriesIndex) and the shadowPriceCubes
+        # parameter caches the dual values of constraints after a solve (cf. standardIO.getShadowPriceCube).
+        # The resultsStore parameter holds the time dependent optimal values of all modeling classes as arrays
+        # with coordinate vectors (cf. utilsResults.ResultsStore) which are shared with the DataFrames of the
+        # modeling classes and used when the results are converted to xarray datasets.
 
         self.pyM = None
+        self.persistentSolver = None
+        self.buildProfile = None
+        self._pyMComponentNames = None
+        self._crossComponentialNames = []
+        self._declarationSettings = None
+        self._modifiedModelingClasses = {}
+        self._lazyOptimalValues = None
+        self._fullTimeSeriesIndex = {}
+        self._shadowPriceCubes = {}
+        self.resultsStore = utilsResults.ResultsStore()
         self.solverSpecs = {
             "solver": "",
             "optimizationSpecs": "",
@@ -409,6 +472,7 @@ class EnergySystemModel:
             "timeLimit": None,
             "threads": 0,
             "logFileName": "",
+            "persistent": False,
         }
         self.objectiveValue = None
 
@@ -439,6 +503,7 @@ class EnergySystemModel:
             raise TypeError(
                 "The added component has to inherit from the FINE class ComponentModel."
             )
+        self.materializeOptimalValues()
         component.addToEnergySystemModel(self)
 
     def removeComponent(self, componentName, track=False):
@@ -465,6 +530,7 @@ class EnergySystemModel:
                 + "The components considered in the model are: "
                 + str(self.componentNames.keys())
             )
+        self.materializeOptimalValues()
         modelingClass = self.componentNames[componentName]
         removedComp = dict()
         # If track: Return a dictionary including the name of the removed component and the component instance
@@ -478,6 +544,8 @@ class EnergySystemModel:
             )
             # Remove component from the componentNames dict:
             del self.componentNames[componentName]
+            self.componentModelingDict[modelingClass].resetLocationCommodityIncidence()
+            self.registerModelingClassUpdate(modelingClass)
             # Test if all components of one modelingClass are removed. If so, remove modelingClass:
             if not self.componentModelingDict[
                 modelingClass
@@ -489,6 +557,8 @@ class EnergySystemModel:
             del self.componentNames[componentName]
             # Remove component from the componentModelingDict:
             del self.componentModelingDict[modelingClass].componentsDict[componentName]
+            self.componentModelingDict[modelingClass].resetLocationCommodityIncidence()
+            self.registerModelingClassUpdate(modelingClass)
             # Test if all components of one modelingClass are removed. If so, remove modelingClass:
             if not self.componentModelingDict[
                 modelingClass
@@ -570,8 +640,32 @@ class EnergySystemModel:
         for _arg, _val in updateAttrs.items():
             new_args[_arg] = _val
 
+        # check if only cost parameters are updated (in this case, only the objective function has to be
+        # redeclared if the optimization problem is declared incrementally)
+        modelingClass = self.componentNames[componentName]
+        costsOnly = all(
+            k in self.costAttributes for k in updateAttrs.keys()
+        ) and self._modifiedModelingClasses.get(modelingClass) in [None, "costs"]
+
         # overwrite the existing component with the new data
         self.add(_class(self, **new_args))
+        if costsOnly:
+            self.registerModelingClassUpdate(modelingClass, costsOnly=True)
+
+    def registerModelingClassUpdate(self, modelingClass, costsOnly=False):
+        """
+        Register that a modeling class was changed (i.e. a component was added, updated or removed) since the
+        optimization problem was declared the last time. This information is used if the optimization problem is
+        declared incrementally.
+
+        :param modelingClass: name of the modeling class which was changed
+        :type modelingClass: string
+
+        :param costsOnly: states if only cost parameters of the components of the modeling class were changed.
+            |br| * the default value is False
+        :type costsOnly: boolean
+        """
+        self._modifiedModelingClasses[modelingClass] = "costs" if costsOnly else "all"
 
     def getComponentAttribute(self, componentName, attributeName):
         """
@@ -836,6 +930,47 @@ class EnergySystemModel:
         )
         self.aggregateTemporally(*args, **kwargs)
 
+    def getTimeSeriesDataForAggregation(self):
+        """
+        Return the time series data of all components considered in the EnergySystemModel instance in the format
+        of the tsam package.
+
+        :return: time series data (time steps x time series with unique names) and weights of the time series of
+            each investment period (investment periods with identical time series share the same objects)
+        :rtype: tuple (dict of pandas DataFrames, dict of dicts)
+        """
+        # Format data to fit the input requirements of the tsam package:
+        # (a) register the time series data from all components stored in all initialized modeling classes with unique
+        #     column names in a column registry which writes them into one preallocated float64 matrix
+        # (b) thereby collect the weights which should be considered for each time series as well in a dictionary
+        # Investment periods with identical time series and weights (e.g. if the same time series are used in all
+        # investment periods) share one matrix and weight dictionary, which are assembled only once.
+        # Note: Sets index for the time series data. The index is of no further relevance in the energy system model.
+        # The columns are sorted for reproducibility of TimeSeriesAggregation call.
+        index = pd.date_range(
+            "2050-01-01 00:30:00",
+            periods=len(self.totalTimeSteps),
+            freq=(str(self.hoursPerTimeStep) + "h"),
+            tz="Europe/Berlin",
+        )
+        timeSeriesDataDict, weightDictDict, assembled, hashes = {}, {}, {}, {}
+        for ip in self.investmentPeriods:
+            tsaInputMatrix, weightDict = utilsTSA.TSAInputMatrix(), {}
+            for mdlName, mdl in self.componentModelingDict.items():
+                for compName, comp in mdl.componentsDict.items():
+                    _, compWeightDict = comp.getDataForTimeSeriesAggregation(
+                        ip, tsaInputMatrix=tsaInputMatrix
+                    )
+                    weightDict.update(compWeightDict)
+            key = (
+                tsaInputMatrix.getContentKey(hashes),
+                tuple(sorted(weightDict.items())),
+            )
+            if key not in assembled:
+                assembled[key] = (tsaInputMatrix.assemble(index), weightDict)
+            timeSeriesDataDict[ip], weightDictDict[ip] = assembled[key]
+        return timeSeriesDataDict, weightDictDict
+
     def aggregateTemporally(
         self,
         numberOfTypicalPeriods=40,
@@ -847,6 +982,10 @@ class EnergySystemModel:
         sortValues=False,
         storeTSAinstance=False,
         rescaleClusterPeriods=False,
+        useCache=True,
+        cacheDirectory=None,
+        cacheMaxSize=1e9,
+        workers=1,
         **kwargs,
     ):
         """
@@ -930,10 +1069,34 @@ class EnergySystemModel:
         :type sortValues: boolean
 
         :param storeTSAinstance: states if the TimeSeriesAggregation instance created during clustering should be
-            stored in the EnergySystemModel instance.
+            stored in the EnergySystemModel instance. The cache is not read if the instance should be stored.
             |br| * the default value is False
         :type storeTSAinstance: boolean
+
+        :param useCache: states if the results of the clustering should be stored in and loaded from a cache on
+            disk. The cache key is a hash of the time series data, the weights and all clustering arguments of an
+            investment period, i.e. the time series data is only clustered again if one of them changed.
+            |br| * the default value is True
+        :type useCache: boolean
+
+        :param cacheDirectory: directory of the cache. If None, the directory given by the environment variable
+            FINE_TSA_CACHE_DIR or the default directory (~/.cache/fine/tsa) is used.
+            |br| * the default value is None
+        :type cacheDirectory: string or None
+
+        :param cacheMaxSize: maximum size of the cache directory in bytes. If it is exceeded, the least recently
+            used entries are removed.
+            |br| * the default value is 1e9
+        :type cacheMaxSize: strictly positive number
+
+        :param workers: number of worker processes which cluster the time series data of the investment periods in
+            parallel. If None, the number of available cores is used. The results are identical to the sequential
+            clustering (workers=1).
+            |br| * the default value is 1
+        :type workers: strictly positive integer or None
         """
+        # Optimal values which were stored lazily refer to the current temporal representation
+        self.materializeOptimalValues()
 
         # Check input arguments which have to fit the temporal representation of the energy system
         utils.checkClusteringInput(
@@ -974,96 +1137,66 @@ class EnergySystemModel:
                 0,
             )
 
-        # Format data to fit the input requirements of the tsam package:
-        # (a) append the time series data from all components stored in all initialized modeling classes to a pandas
-        #     DataFrame with unique column names
-        # (b) thereby collect the weights which should be considered for each time series as well in a dictionary
-
         #############################################################################################################
         # adjusted for perfect foresight approach
         # periodsOrder and Occurrences now dictionaries
         self.periodsOrder = {}
         self.periodOccurrences = {}
         self.timeStepsPerSegment = {}
+        self._fullTimeSeriesIndex = {}
         self.hoursPerSegment = {}
         self.segmentStartTime = {}
 
-        # clustering of the time series data per investment period individually
-        for ip in self.investmentPeriods:
-            timeSeriesData, weightDict = [], {}
-            for mdlName, mdl in self.componentModelingDict.items():
-                for compName, comp in mdl.componentsDict.items():
-                    (
-                        compTimeSeriesData,
-                        compWeightDict,
-                    ) = comp.getDataForTimeSeriesAggregation(ip)
-                    if compTimeSeriesData is not None:
-                        timeSeriesData.append(compTimeSeriesData), weightDict.update(
-                            compWeightDict
-                        )
-            timeSeriesData = pd.concat(timeSeriesData, axis=1)
-            # Note: Sets index for the time series data. The index is of no further relevance in the energy system model.
-            timeSeriesData.index = pd.date_range(
-                "2050-01-01 00:30:00",
-                periods=len(self.totalTimeSteps),
-                freq=(str(self.hoursPerTimeStep) + "h"),
-                tz="Europe/Berlin",
+        # Collect the time series data of each investment period
+        timeSeriesDataDict, weightDictDict = self.getTimeSeriesDataForAggregation()
+
+        # Cluster data with tsam package per investment period individually (in parallel if workers > 1) or load
+        # the results of identical clusterings from the cache
+        clusterArgs = dict(
+            numberOfTypicalPeriods=numberOfTypicalPeriods,
+            hoursPerPeriod=hoursPerPeriod,
+            segmentation=segmentation,
+            numberOfSegmentsPerPeriod=numberOfSegmentsPerPeriod,
+            clusterMethod=clusterMethod,
+            sortValues=sortValues,
+            rescaleClusterPeriods=rescaleClusterPeriods,
+            representationMethod=representationMethod,
+            **kwargs,
+        )
+        results, cachedIps = utilsTSA.clusterInvestmentPeriods(
+            timeSeriesDataDict,
+            weightDictDict,
+            clusterArgs,
+            storeTSAinstance=storeTSAinstance,
+            workers=workers,
+            useCache=useCache,
+            cacheDirectory=cacheDirectory,
+            cacheMaxSize=cacheMaxSize,
+            numberOfTimeStepsPerPeriod=numberOfTimeStepsPerPeriod,
+        )
+        if cachedIps:
+            utils.output(
+                "\tLoaded clustering of investment periods "
+                + str(cachedIps)
+                + " from the cache.",
+                self.verbose,
+                0,
             )
 
-            # Cluster data with tsam package (the reindex call is here for reproducibility of TimeSeriesAggregation
-            # call) depending on whether segmentation is activated or not
-            timeSeriesData = timeSeriesData.reindex(
-                sorted(timeSeriesData.columns), axis=1
-            )
-            if segmentation:
-                clusterClass = TimeSeriesAggregation(
-                    timeSeries=timeSeriesData,
-                    noTypicalPeriods=numberOfTypicalPeriods,
-                    segmentation=segmentation,
-                    noSegments=numberOfSegmentsPerPeriod,
-                    hoursPerPeriod=hoursPerPeriod,
-                    clusterMethod=clusterMethod,
-                    sortValues=sortValues,
-                    weightDict=weightDict,
-                    rescaleClusterPeriods=rescaleClusterPeriods,
-                    representationMethod=representationMethod,
-                    **kwargs,
-                )
-                # Convert the clustered data to a pandas DataFrame with the first index as typical period number and the
-                # second index as segment number per typical period.
-                data = pd.DataFrame.from_dict(
-                    clusterClass.clusterPeriodDict
-                ).reset_index(level=2, drop=True)
-                # Get the length of each segment in each typical period with the first index as typical period number and
-                # the second index as segment number per typical period.
-                timeStepsPerSegment = pd.DataFrame.from_dict(
-                    clusterClass.segmentDurationDict
-                )["Segment Duration"]
-            else:
-                clusterClass = TimeSeriesAggregation(
-                    timeSeries=timeSeriesData,
-                    noTypicalPeriods=numberOfTypicalPeriods,
-                    hoursPerPeriod=hoursPerPeriod,
-                    clusterMethod=clusterMethod,
-                    sortValues=sortValues,
-                    weightDict=weightDict,
-                    rescaleClusterPeriods=rescaleClusterPeriods,
-                    representationMethod=representationMethod,
-                    **kwargs,
-                )
-                # Convert the clustered data to a pandas DataFrame with the first index as typical period number and the
-                # second index as time step number per typical period.
-                data = pd.DataFrame.from_dict(clusterClass.clusterPeriodDict)
+        for ip in self.investmentPeriods:
+            result = results[ip]
+            data, timeStepsPerSegment = result["data"], result["timeStepsPerSegment"]
 
-            # Store the respective clustered time series data in the associated components
+            # Store the respective clustered time series data in the associated components (as views on one matrix)
+            data = utilsTSA.TSAOutputMatrix(data)
             for mdlName, mdl in self.componentModelingDict.items():
                 for compName, comp in mdl.componentsDict.items():
                     comp.setAggregatedTimeSeriesData(data, ip)
 
             # Store time series aggregation parameters in class instance
             if storeTSAinstance:
-                self.tsaInstance = clusterClass
-            self.typicalPeriods = clusterClass.clusterPeriodIdx
+                self.tsaInstance = result["tsaInstance"]
+            self.typicalPeriods = result["clusterPeriodIdx"]
             self.timeStepsPerPeriod = list(range(numberOfTimeStepsPerPeriod))
             self.segmentation = segmentation
             if segmentation:
@@ -1085,7 +1218,7 @@ class EnergySystemModel:
                 segmentStartTime[segmentStartTime.index.get_level_values(1) == 0] = 0
                 self.segmentStartTime[ip] = segmentStartTime  # ip-dependent
 
-            self.periodsOrder[ip] = clusterClass.clusterOrder
+            self.periodsOrder[ip] = result["clusterOrder"]
             self.periodOccurrences[ip] = [
                 (self.periodsOrder[ip] == tp).sum() for tp in self.typicalPeriods
             ]
@@ -1104,12 +1237,127 @@ class EnergySystemModel:
 
         # Set cluster flag to true (used to ensure consistently clustered time series data)
         self.isTimeSeriesDataClustered = True
+        # The time series data of all components changed, the optimization problem cannot be redeclared incrementally
+        self._pyMComponentNames = None
         timeEnd = time.time()
         if storeTSAinstance:
-            clusterClass.tsaBuildTime = timeEnd - timeStart
-            self.tsaInstance = clusterClass
+            self.tsaInstance.tsaBuildTime = timeEnd - timeStart
         utils.output("\t\t(%.4f" % (timeEnd - timeStart) + " sec)\n", self.verbose, 0)
 
+    def aggregateTemporallyAuto(
+        self,
+        targetError=0.05,
+        maxPeriods=50,
+        numberOfTimeStepsPerPeriod=24,
+        **kwargs,
+    ):
+        """
+        Temporally cluster the time series data with the smallest number of typical periods which meets a target
+        reconstruction error. For this, the periods of the time series data of each investment period are
+        clustered hierarchically once and the resulting linkage is cut at 1, 2, ... clusters until the estimated
+        reconstruction error meets the target error in all investment periods (cf.
+        utilsTSA.iterateTypicalPeriodErrors). Then, aggregateTemporally is called with the chosen number of typical
+        periods. The estimated errors of the evaluated numbers of typical periods are stored in the attribute
+        typicalPeriodErrors.
+
+        .. note::
+            The errors are estimated with the normalized and weighted time series and a centroid representation of
+            the typical periods without segmentation. The errors of the final clustering can differ slightly,
+            e.g. if another representationMethod is chosen.
+
+        **Default arguments:**
+
+        :param targetError: maximum root mean squared error of the normalized and weighted time series and of
+            their duration curves
+            |br| * the default value is 0.05
+        :type targetError: strictly positive number
+
+        :param maxPeriods: maximum number of typical periods (at most the number of periods). If the target error
+            cannot be met, maxPeriods typical periods are used.
+            |br| * the default value is 50
+        :type maxPeriods: strictly positive integer
+
+        :param numberOfTimeStepsPerPeriod: states the number of time steps per period
+            |br| * the default value is 24
+        :type numberOfTimeStepsPerPeriod: strictly positive integer
+
+        :param kwargs: further arguments of aggregateTemporally (e.g. segmentation or numberOfSegmentsPerPeriod)
+
+        :return: chosen number of typical periods
+        :rtype: integer
+        """
+        utils.isStrictlyPositiveNumber(targetError)
+        utils.isStrictlyPositiveInt(maxPeriods)
+        maxPeriods = min(
+            maxPeriods, len(self.totalTimeSteps) // numberOfTimeStepsPerPeriod
+        )
+        utils.checkClusteringInput(
+            maxPeriods, numberOfTimeStepsPerPeriod, len(self.totalTimeSteps)
+        )
+
+        timeStart = time.time()
+        utils.output(
+            "\nEstimating the reconstruction errors of up to "
+            + str(maxPeriods)
+            + " typical periods...",
+            self.verbose,
+            0,
+        )
+        timeSeriesDataDict, weightDictDict = self.getTimeSeriesDataForAggregation()
+        iterators = {
+            ip: utilsTSA.iterateTypicalPeriodErrors(
+                timeSeriesDataDict[ip],
+                weightDictDict[ip],
+                numberOfTimeStepsPerPeriod,
+                maxPeriods,
+            )
+            for ip in self.investmentPeriods
+        }
+        # The errors are evaluated for increasing numbers of typical periods until the target error is met in all
+        # investment periods
+        errors = {}
+        for numberOfTypicalPeriods in range(1, maxPeriods + 1):
+            for ip, iterator in iterators.items():
+                for key, value in next(iterator)[1].items():
+                    errors.setdefault((ip, key), {})[numberOfTypicalPeriods] = value
+            if all(
+                values[numberOfTypicalPeriods] <= targetError
+                for values in errors.values()
+            ):
+                break
+        self.typicalPeriodErrors = pd.DataFrame(errors)
+        self.typicalPeriodErrors.index.name = "numberOfTypicalPeriods"
+        maxErrors = self.typicalPeriodErrors.max(axis=1)
+        if maxErrors[numberOfTypicalPeriods] > targetError:
+            warnings.warn(
+                "The target error "
+                + str(targetError)
+                + " cannot be met with up to "
+                + str(maxPeriods)
+                + " typical periods (estimated error: "
+                + str(maxErrors[maxPeriods])
+                + "). "
+                + str(maxPeriods)
+                + " typical periods are used."
+            )
+        utils.output(
+            "\t%d typical periods (estimated error: %.4f)\t\t(%.4f sec)"
+            % (
+                numberOfTypicalPeriods,
+                maxErrors[numberOfTypicalPeriods],
+                time.time() - timeStart,
+            ),
+            self.verbose,
+            0,
+        )
+
+        self.aggregateTemporally(
+            numberOfTypicalPeriods=numberOfTypicalPeriods,
+            numberOfTimeStepsPerPeriod=numberOfTimeStepsPerPeriod,
+            **kwargs,
+        )
+        return numberOfTypicalPeriods
+
     def declareTimeSets(self, pyM, timeSeriesAggregation, segmentation):
         """
         Set and initialize basic time parameters and sets.
@@ -1298,6 +1546,24 @@ class EnergySystemModel:
             dimen=1, initialize=initInvestPeriodInterPeriodSet
         )
 
+        # Store the segment lengths (in time steps and in hours) and the segment start times per investment period
+        # as dictionaries with (p, t) as keys. The segmentation dependent constraint rules look the values up
+        # instead of converting the pandas Series for every constraint index.
+        if pyM.hasSegmentation:
+            pyM.timeStepsPerSegment = {
+                ip: self.timeStepsPerSegment[ip].to_dict()
+                for ip in self.investmentPeriods
+            }
+            pyM.hoursPerSegment = {
+                ip: self.hoursPerSegment[ip].to_dict() for ip in self.investmentPeriods
+            }
+            pyM.segmentStartTime = {
+                ip: self.segmentStartTime[ip].to_dict() for ip in self.investmentPeriods
+            }
+        else:
+            pyM.timeStepsPerSegment, pyM.hoursPerSegment = {}, {}
+            pyM.segmentStartTime = {}
+
     def declareBalanceLimitConstraint(self, pyM, timeSeriesAggregation):
         """
         Declare balance limit constraint.
@@ -1604,34 +1870,54 @@ class EnergySystemModel:
 
         # Declare and initialize a set that states for which location and commodity the commodity balance constraints
         # are non-trivial (i.e. not 0 == 0; trivial constraints raise errors in pyomo).
+        # The location-commodity incidences are cached in the modeling classes.
         def initLocationCommoditySet(pyM):
+            incidences = [
+                mdl.getLocationCommodityIncidence(self)
+                for mdl in self.componentModelingDict.values()
+            ]
             return (
                 (loc, commod)
                 for loc in self.locations
                 for commod in self.commodities
-                if any(
-                    [
-                        mdl.hasOpVariablesForLocationCommodity(self, loc, commod)
-                        for mdl in self.componentModelingDict.values()
-                    ]
-                )
+                if any(commod in incidence.get(loc, ()) for incidence in incidences)
             )
 
         pyM.locationCommoditySet = pyomo.Set(
             dimen=2, initialize=initLocationCommoditySet
         )
 
+        # Collect the contributions to the commodity balances once from the modeling classes. The index maps
+        # (location, commodity, investment period) to the contributing variables and their coefficients. Modeling
+        # classes which do not provide such an index contribute per constraint index.
+        balanceIndex, fallbackModels = {}, []
+        for mdl in self.componentModelingDict.values():
+            mdlIndex = mdl.getCommodityBalanceContributionIndex(self, pyM)
+            if mdlIndex is None:
+                fallbackModels.append(mdl)
+                continue
+            for key, terms in mdlIndex.items():
+                balanceIndex.setdefault(key, []).extend(terms)
+
         # Declare and initialize commodity balance constraints by checking for each location and commodity in the
         # locationCommoditySet and for each period and time step within the period if the commodity source and sink
-        # terms add up to zero. For this, get the contribution to commodity balance from each modeling class.
+        # terms add up to zero.
         def commodityBalanceConstraint(pyM, loc, commod, ip, p, t):
-            return (
-                sum(
-                    mdl.getCommodityBalanceContribution(pyM, commod, loc, ip, p, t)
-                    for mdl in self.componentModelingDict.values()
+            contribution = pyomo.quicksum(
+                (
+                    var[index + (p, t)]
+                    * (factor[p, t] if isinstance(factor, dict) else factor)
+                    for var, index, factor in balanceIndex.get((loc, commod, ip), [])
                 )
-                == 0
             )
+            for mdl in fallbackModels:
+                contribution += mdl.getCommodityBalanceContribution(
+                    pyM, commod, loc, ip, p, t
+                )
+            if isinstance(contribution, (int, float)):
+                # All operation variables at the location were eliminated (cf. eliminateZeroOperationVariables)
+                return pyomo.Constraint.Skip
+            return contribution == 0
 
         pyM.commodityBalanceConstraint = pyomo.Constraint(
             pyM.locationCommoditySet, pyM.timeSet, rule=commodityBalanceConstraint
@@ -1709,11 +1995,249 @@ class EnergySystemModel:
 
         pyM.Obj = pyomo.Objective(rule=objective)
 
+    def declareModelingClass(self, pyM, key, relaxIsBuiltBinary, relevanceThreshold):
+        """
+        Declare the sets, variables and constraints contributed by one component modeling class.
+
+        :param pyM: a pyomo ConcreteModel instance which contains parameters, sets, variables,
+            constraints and objective required for the optimization set up and solving.
+        :type pyM: pyomo ConcreteModel
+
+        :param key: name of the modeling class in the componentModelingDict
+        :type key: string
+
+        :param relaxIsBuiltBinary: states if the optimization problem should be solved as a relaxed LP.
+        :type relaxIsBuiltBinary: boolean
+
+        :param relevanceThreshold: Force operation parameters to be 0 if values are below the relevance threshold.
+        :type relevanceThreshold: float (>=0) or None
+
+        :returns: names of the pyomo components which were added to the pyomo ConcreteModel
+        :rtype: list of strings
+        """
+        mdl = self.componentModelingDict[key]
+        declaredNames = set(pyM.component_map().keys())
+        self.setBuildProfilePhase(pyM, key)
+
+        _t = time.time()
+        utils.output(
+            "Declaring sets, variables and constraints for " + key, self.verbose, 0
+        )
+        utils.output("\tdeclaring sets... ", self.verbose, 0), mdl.declareSets(
+            self, pyM
+        )
+        utils.output(
+            "\tdeclaring variables... ", self.verbose, 0
+        ), mdl.declareVariables(self, pyM, relaxIsBuiltBinary, relevanceThreshold)
+        utils.output(
+            "\tdeclaring constraints... ", self.verbose, 0
+        ), mdl.declareComponentConstraints(self, pyM)
+        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+
+        return [name for name in pyM.component_map().keys() if name not in declaredNames]
+
+    def declareCrossComponentialConstraints(self, pyM, timeSeriesAggregation):
+        """
+        Declare the shared potential, linked quantity, commodity balance and balance limit constraints.
+
+        :param pyM: a pyomo ConcreteModel instance which contains parameters, sets, variables,
+            constraints and objective required for the optimization set up and solving.
+        :type pyM: pyomo ConcreteModel
+
+        :param timeSeriesAggregation: states if the optimization of the energy system model should be done with
+            clustered time series data.
+        :type timeSeriesAggregation: boolean
+
+        :returns: names of the pyomo components which were added to the pyomo ConcreteModel
+        :rtype: list of strings
+        """
+        declaredNames = set(pyM.component_map().keys())
+        self.setBuildProfilePhase(pyM, "CrossComponential")
+
+        # Declare constraints for enforcing shared capacities
+        _t = time.time()
+        self.declareSharedPotentialConstraints(pyM)
+        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+
+        # Declare constraints for linked quantities
+        _t = time.time()
+        self.declareComponentLinkedQuantityConstraints(pyM)
+        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+
+        # Declare commodity balance constraints (one balance constraint for each commodity, location and time step)
+        _t = time.time()
+        self.declareCommodityBalanceConstraints(pyM)
+        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+
+        # Declare constraint for balanceLimit
+        _t = time.time()
+        self.declareBalanceLimitConstraint(pyM, timeSeriesAggregation)
+        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+
+        return [name for name in pyM.component_map().keys() if name not in declaredNames]
+
+    def declareFullOptimizationProblem(
+        self,
+        timeSeriesAggregation,
+        segmentation,
+        relaxIsBuiltBinary,
+        relevanceThreshold,
+        eliminateZeroOperationVariables=False,
+        profileBuild=False,
+    ):
+        """
+        Declare the optimization problem from scratch in a new pyomo ConcreteModel instance (cf.
+        declareOptimizationProblem). The names of the pyomo components declared by each modeling class are stored to
+        allow for a later incremental redeclaration.
+        """
+        ################################################################################################################
+        #                           Initialize mathematical model (ConcreteModel) instance                             #
+        ################################################################################################################
+
+        # Initialize a pyomo ConcreteModel which will be used to store the mathematical formulation of the model.
+        # The ConcreteModel instance is stored in the EnergySystemModel instance, which makes it available for
+        # post-processing or debugging. A pyomo Suffix with the name dual is declared to make dual values associated
+        # to the model's constraints available after optimization.
+        if profileBuild:
+            self.pyM = utilsProfile.ProfiledConcreteModel(utilsProfile.BuildProfiler())
+        else:
+            self.pyM = pyomo.ConcreteModel()
+        pyM = self.pyM
+        pyM.dual = pyomo.Suffix(direction=pyomo.Suffix.IMPORT)
+
+        # Store if operation variables which are structurally zero are not declared. The eliminated locations,
+        # components and investment periods are stored per modeling class (cf. ComponentModel.declareOpVarSet).
+        pyM.eliminateZeroOperationVariables = eliminateZeroOperationVariables
+        pyM.relevanceThreshold = relevanceThreshold
+        pyM.zeroOperationIndices = {}
+
+        # Set time sets for the model instance
+        self.declareTimeSets(pyM, timeSeriesAggregation, segmentation)
+
+        ################################################################################################################
+        #                         Declare component specific sets, variables and constraints                           #
+        ################################################################################################################
+
+        self._pyMComponentNames = {}
+        for key in self.componentModelingDict.keys():
+            self._pyMComponentNames[key] = self.declareModelingClass(
+                pyM, key, relaxIsBuiltBinary, relevanceThreshold
+            )
+
+        if hasattr(self, 'etlModel'):
+            _t = time.time()
+            self.setBuildProfilePhase(pyM, "ETL")
+            utils.output(
+                "Declaring sets, variables and constraints for ETL components", self.verbose, 0
+            )
+            self.etlModel.declareSets(self, pyM)
+            self.etlModel.declareVariables(self, pyM)
+            self.etlModel.declareComponentConstraints(self, pyM)
+            utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+
+        ################################################################################################################
+        #                              Declare cross-componential sets and constraints                                 #
+        ################################################################################################################
+
+        self._crossComponentialNames = self.declareCrossComponentialConstraints(
+            pyM, timeSeriesAggregation
+        )
+
+        ################################################################################################################
+        #                                         Declare objective function                                           #
+        ################################################################################################################
+
+        # Declare objective function by obtaining the contributions to the objective function from all modeling classes
+        _t = time.time()
+        self.setBuildProfilePhase(pyM, "Objective")
+        self.declareObjective(pyM)
+        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+
+    def redeclareOptimizationProblem(
+        self, timeSeriesAggregation, relaxIsBuiltBinary, relevanceThreshold
+    ):
+        """
+        Update the previously declared optimization problem (cf. declareOptimizationProblem) in place. The sets,
+        variables and constraints of modeling classes which were changed since the last declaration are deleted and
+        declared again, as are the cross-componential constraints. The objective function is always redeclared.
+        """
+        pyM = self.pyM
+        utils.output("Redeclaring the optimization problem incrementally...", self.verbose, 0)
+
+        def deleteComponents(names):
+            for name in names:
+                if pyM.component(name) is not None:
+                    pyM.del_component(name)
+            if hasattr(pyM, "buildProfiler"):
+                pyM.buildProfiler.removeRecords(names)
+
+        # Remove the pyomo components of modeling classes which are no longer part of the energy system model
+        structureChanged = False
+        for key in list(self._pyMComponentNames.keys()):
+            if key not in self.componentModelingDict:
+                deleteComponents(self._pyMComponentNames.pop(key))
+                structureChanged = True
+        abbrvNames = [mdl.abbrvName for mdl in self.componentModelingDict.values()]
+        pyM.zeroOperationIndices = {
+            abbrvName: zeroSet
+            for abbrvName, zeroSet in pyM.zeroOperationIndices.items()
+            if abbrvName in abbrvNames
+        }
+
+        # Redeclare the sets, variables and constraints of modified (or new) modeling classes. If only cost
+        # parameters of a modeling class were changed, only the time series data of its components is updated.
+        for key, mdl in self.componentModelingDict.items():
+            modification = self._modifiedModelingClasses.get(key)
+            if key in self._pyMComponentNames and modification is None:
+                continue
+            for comp in mdl.componentsDict.values():
+                comp.setTimeSeriesData(pyM.hasTSA)
+            if key in self._pyMComponentNames and modification == "costs":
+                continue
+            deleteComponents(self._pyMComponentNames.pop(key, []))
+            pyM.zeroOperationIndices.pop(mdl.abbrvName, None)
+            self._pyMComponentNames[key] = self.declareModelingClass(
+                pyM, key, relaxIsBuiltBinary, relevanceThreshold
+            )
+            structureChanged = True
+
+        # Redeclare the cross-componential constraints if the structure of the optimization problem changed
+        if structureChanged:
+            deleteComponents(self._crossComponentialNames)
+            self._crossComponentialNames = self.declareCrossComponentialConstraints(
+                pyM, timeSeriesAggregation
+            )
+
+        # Redeclare the objective function
+        _t = time.time()
+        deleteComponents(["Obj"])
+        self.setBuildProfilePhase(pyM, "Objective")
+        self.declareObjective(pyM)
+        pyM.dual.clear()
+        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+
+    def setBuildProfilePhase(self, pyM, phase):
+        """
+        Set the name (e.g. the modeling class) under which the pyomo components which are subsequently added to the
+        pyomo ConcreteModel are recorded if the declaration is profiled (cf. declareOptimizationProblem).
+
+        :param pyM: a pyomo ConcreteModel instance
+        :type pyM: pyomo ConcreteModel
+
+        :param phase: name of the declaration phase
+        :type phase: string
+        """
+        if hasattr(pyM, "buildProfiler"):
+            pyM.buildProfiler.modelingClass = phase
+
     def declareOptimizationProblem(
         self,
         timeSeriesAggregation=False,
         relaxIsBuiltBinary=False,
         relevanceThreshold=None,
+        incremental=False,
+        eliminateZeroOperationVariables=False,
+        profileBuild=False,
     ):
         """
         Declare the optimization problem belonging to the specified energy system for which a pyomo concrete model
@@ -1742,7 +2266,36 @@ class EnergySystemModel:
         :param relevanceThreshold: Force operation parameters to be 0 if values are below the relevance threshold.
             |br| * the default value is None
         :type relevanceThreshold: float (>=0) or None
+
+        :param incremental: states if a previously declared optimization problem should be updated instead of
+            being declared from scratch. If True, only the sets, variables and constraints of modeling classes
+            whose components were added, updated or removed since the last declaration are redeclared, together
+            with the cross-componential constraints and the objective function. If only cost parameters were
+            updated, only the objective function is redeclared. The optimization problem is declared from scratch
+            if no previous declaration with the same settings exists or if the model contains ETL components.
+            |br| * the default value is False
+        :type incremental: boolean
+
+        :param eliminateZeroOperationVariables: states if the operation variables and operation constraints of
+            components which are structurally not operated at a location in an investment period (i.e. their
+            operationRateMax or operationRateFix is zero or, if a relevanceThreshold is given, below the relevance
+            threshold in all time steps) are not declared (cf. ComponentModel.getZeroOperationSet). Like those of
+            ineligible locations, their operation is not part of the optimization results.
+            |br| * the default value is False
+        :type eliminateZeroOperationVariables: boolean
+
+        :param profileBuild: states if the declaration of the optimization problem is profiled. If True, the build
+            time, the number of indices, the change of the resident set size (RSS) of the process and the number of
+            nonzeros (constraints and objective only) of each pyomo component are stored together with the
+            modeling class which declared it in the buildProfile attribute (pandas DataFrame, cf.
+            utilsProfile.BuildProfiler). If the problem is redeclared incrementally, a previously declared
+            problem is only profiled if it was profiled before.
+            |br| * the default value is False
+        :type profileBuild: boolean
         """
+        # Optimal values which were stored lazily refer to the current optimization problem
+        self.materializeOptimalValues()
+
         # Get starting time of the optimization to, later on, obtain the total run time of the optimize function call
         timeStart = time.time()
 
@@ -1757,85 +2310,157 @@ class EnergySystemModel:
         else:
             segmentation = False
 
-        ################################################################################################################
-        #                           Initialize mathematical model (ConcreteModel) instance                             #
-        ################################################################################################################
-
-        # Initialize a pyomo ConcreteModel which will be used to store the mathematical formulation of the model.
-        # The ConcreteModel instance is stored in the EnergySystemModel instance, which makes it available for
-        # post-processing or debugging. A pyomo Suffix with the name dual is declared to make dual values associated
-        # to the model's constraints available after optimization.
-        self.pyM = pyomo.ConcreteModel()
-        pyM = self.pyM
-        pyM.dual = pyomo.Suffix(direction=pyomo.Suffix.IMPORT)
-
-        # Set time sets for the model instance
-        self.declareTimeSets(pyM, timeSeriesAggregation, segmentation)
-
-        ################################################################################################################
-        #                         Declare component specific sets, variables and constraints                           #
-        ################################################################################################################
-
-        for key, mdl in self.componentModelingDict.items():
-            _t = time.time()
-            utils.output(
-                "Declaring sets, variables and constraints for " + key, self.verbose, 0
+        declarationSettings = (
+            timeSeriesAggregation,
+            segmentation,
+            relaxIsBuiltBinary,
+            relevanceThreshold,
+            eliminateZeroOperationVariables,
+        )
+        if (
+            incremental
+            and self.pyM is not None
+            and self._pyMComponentNames is not None
+            and self._declarationSettings == declarationSettings
+            and not hasattr(self, "etlModel")
+        ):
+            self.redeclareOptimizationProblem(
+                timeSeriesAggregation, relaxIsBuiltBinary, relevanceThreshold
             )
-            utils.output("\tdeclaring sets... ", self.verbose, 0), mdl.declareSets(
-                self, pyM
+        else:
+            if incremental:
+                utils.output(
+                    "No previous declaration with the same settings available, the optimization problem "
+                    + "is declared from scratch.",
+                    self.verbose,
+                    0,
+                )
+            self.declareFullOptimizationProblem(
+                timeSeriesAggregation,
+                segmentation,
+                relaxIsBuiltBinary,
+                relevanceThreshold,
+                eliminateZeroOperationVariables,
+                profileBuild,
             )
-            utils.output(
-                "\tdeclaring variables... ", self.verbose, 0
-            ), mdl.declareVariables(self, pyM, relaxIsBuiltBinary, relevanceThreshold)
-            utils.output(
-                "\tdeclaring constraints... ", self.verbose, 0
-            ), mdl.declareComponentConstraints(self, pyM)
-            utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+        self._declarationSettings = declarationSettings
+        self._modifiedModelingClasses = {}
 
-        if hasattr(self, 'etlModel'):
-            utils.output(
-                "Declaring sets, variables and constraints for ETL components", self.verbose, 0
-            )
-            self.etlModel.declareSets(self, pyM)
-            self.etlModel.declareVariables(self, pyM)
-            self.etlModel.declareComponentConstraints(self, pyM)
-            utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+        # Store the build profile of the optimization problem (if profiled)
+        if hasattr(self.pyM, "buildProfiler"):
+            self.buildProfile = self.pyM.buildProfiler.toDataFrame()
+        else:
+            self.buildProfile = None
 
-        ################################################################################################################
-        #                              Declare cross-componential sets and constraints                                 #
-        ################################################################################################################
+        # Store the build time of the optimize function call in the EnergySystemModel instance
+        self.solverSpecs["buildtime"] = time.time() - timeStart
 
-        # Declare constraints for enforcing shared capacities
-        _t = time.time()
-        self.declareSharedPotentialConstraints(pyM)
-        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+    def setOptimalValuesOfModelingClass(self, key, mdl):
+        """
+        Set the optimal values of a modeling class after the optimization problem was solved and store them under
+        their internal (e.g. _capacityVariablesOptimum) and external (e.g. capacityVariablesOptimum) name.
 
-        # Declare constraints for linked quantities
-        _t = time.time()
-        self.declareComponentLinkedQuantityConstraints(pyM)
-        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+        :param key: name of the modeling class (e.g. 'SourceSinkModel')
+        :type key: string
 
-        # Declare commodity balance constraints (one balance constraint for each commodity, location and time step)
-        _t = time.time()
-        self.declareCommodityBalanceConstraints(pyM)
-        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+        :param mdl: modeling class instance
+        :type mdl: ComponentModel instance
+        """
+        w = str(len(max(self.componentModelingDict.keys())) + 6)
+
+        # if _capacityVariablesOptimum is not a dict, convert to dict
+        # (if single year system is optimized several times)
+        if not isinstance(mdl._capacityVariablesOptimum, dict):
+            mdl._capacityVariablesOptimum = {}
+        __t = time.time()
+
+        mdl.setOptimalValues(self, self.pyM)
+        outputString = (
+            ("for {:" + w + "}").format(key + " ...")
+            + "(%.4f" % (time.time() - __t)
+            + "sec)"
+        )
+        utils.output(outputString, self.verbose, 0)
+
+        # Add the time dependent optimal values to the results store
+        for ip in self.investmentPeriodNames:
+            for name, d in mdl.getOptimalValues(ip=ip).items():
+                if d["timeDependent"] and d["values"] is not None:
+                    self.resultsStore.add(
+                        key, name, ip, d["values"], True, d["dimension"]
+                    )
 
-        # Declare constraint for balanceLimit
-        _t = time.time()
-        self.declareBalanceLimitConstraint(pyM, timeSeriesAggregation)
-        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+        # convert optimal values from internal name to external name
+        # e.g. from _capacityVariablesOptimum to capacityVariablesOptimum
+        # For perfectForesight the data stays the same, for a single year optimization
+        # the data is converted from a dict with a single entry to a dataframe
+        # By this, old models will not fail.
+        for optParam in optimalValueParameters:
+            if optParam in mdl.__dict__.keys():
+                if self.numberOfInvestmentPeriods == 1:
+                    setattr(
+                        mdl,
+                        optParam.replace("_", ""),
+                        getattr(mdl, optParam)[self.investmentPeriodNames[0]],
+                    )
+                else:
+                    setattr(mdl, optParam.replace("_", ""), getattr(mdl, optParam))
 
-        ################################################################################################################
-        #                                         Declare objective function                                           #
-        ################################################################################################################
+    def materializeOptimalValues(self, modelingClass=None):
+        """
+        Set the optimal values of modeling classes which were not set yet because the optimization problem was
+        solved with lazyResults=True (cf. optimize). This is done automatically when the optimization summary or
+        the optimal values of a modeling class are accessed for the first time and before the energy system model
+        is modified.
 
-        # Declare objective function by obtaining the contributions to the objective function from all modeling classes
-        _t = time.time()
-        self.declareObjective(pyM)
-        utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", self.verbose, 0)
+        :param modelingClass: name of the modeling class (e.g. 'SourceSinkModel'). If None, the optimal values of
+            all modeling classes are set.
+            |br| * the default value is None
+        :type modelingClass: string or None
+        """
+        if self._lazyOptimalValues is None:
+            return
+        keys = (
+            list(self.componentModelingDict.keys())
+            if modelingClass is None
+            else [modelingClass]
+        )
+        keys = [
+            key
+            for key in keys
+            if self.componentModelingDict[key].__dict__.get("_pendingOptimalValues")
+            is not None
+        ]
+        if keys:
+            # Write the stored variable values back into the pyomo model (the values of the variables might have
+            # been changed since the optimization problem was solved)
+            utils.setVariableValueArrays(self.pyM, self._lazyOptimalValues)
+            for key in keys:
+                mdl = self.componentModelingDict[key]
+                _, _, names = mdl.__dict__.pop("_pendingOptimalValues")
+                for name in names:
+                    if name.startswith("_"):
+                        setattr(mdl, name, {})
+                self.setOptimalValuesOfModelingClass(key, mdl)
+        if all(
+            mdl.__dict__.get("_pendingOptimalValues") is None
+            for mdl in self.componentModelingDict.values()
+        ):
+            self._lazyOptimalValues = None
 
-        # Store the build time of the optimize function call in the EnergySystemModel instance
-        self.solverSpecs["buildtime"] = time.time() - timeStart
+    def discardOptimalValues(self):
+        """
+        Discard the optimal values of modeling classes which were stored lazily and not set yet (cf. optimize with
+        lazyResults=True). This is done before the optimization problem is solved again.
+        """
+        for mdl in self.componentModelingDict.values():
+            pending = mdl.__dict__.pop("_pendingOptimalValues", None)
+            if pending is not None:
+                for name in pending[2]:
+                    if name.startswith("_"):
+                        setattr(mdl, name, {})
+        self._lazyOptimalValues = None
+        self.resultsStore.clear()
 
     def optimize(
         self,
@@ -1850,6 +2475,11 @@ class EnergySystemModel:
         warmstart=False,
         relevanceThreshold=None,
         includePerformanceSummary=False,
+        incremental=False,
+        persistent=False,
+        eliminateZeroOperationVariables=False,
+        profileBuild=False,
+        lazyResults=False,
     ):
         """
         Optimize the specified energy system for which a pyomo ConcreteModel instance is built or called upon.
@@ -1904,7 +2534,9 @@ class EnergySystemModel:
         :type threads: positive integer
 
         :param solver: specifies which solver should solve the optimization problem (which of course has to be
-            installed on the machine on which the model is run).
+            installed on the machine on which the model is run). If 'highs' is chosen, the problem is passed to
+            HiGHS in memory (highspy) and the solution and dual values are read directly into the pyomo model.
+            If no solver is specified, the first available solver of gurobi, highs, glpk and cbc is used.
             |br| * the default value is 'gurobi'
         :type solver: string
 
@@ -1937,10 +2569,48 @@ class EnergySystemModel:
             |br| * the default value is False
         :type includePerformanceSummary: boolean
 
+        :param incremental: states if a previously declared optimization problem should only be updated with the
+            components which were added, updated or removed since then (cf. declareOptimizationProblem). Only
+            relevant if declaresOptimizationProblem is True.
+            |br| * the default value is False
+        :type incremental: boolean
+
+        :param persistent: states if the optimization problem is solved with a persistent solver interface (pyomo
+            APPSI) which is kept in the EnergySystemModel instance (self.persistentSolver). If the problem is solved
+            again, e.g. after fixing variables or after an incremental declaration, only the modifications are passed
+            to the solver. Persistent interfaces are available for highs, gurobi, cplex and cbc; for other solvers
+            highs is used. The logFileName and warmstart parameters are ignored, optimizationSpecs have to be given
+            as 'key=value' pairs.
+            |br| * the default value is False
+        :type persistent: boolean
+
+        :param eliminateZeroOperationVariables: states if operation variables which are structurally zero in all
+            time steps are not declared (cf. declareOptimizationProblem).
+            |br| * the default value is False
+        :type eliminateZeroOperationVariables: boolean
+
+        :param profileBuild: states if the declaration of the optimization problem is profiled (cf.
+            declareOptimizationProblem). The build profile is stored in the buildProfile attribute. If
+            includePerformanceSummary is True as well, the build profile aggregated per modeling class is added to
+            the performance summary.
+            |br| * the default value is False
+        :type profileBuild: boolean
+
+        :param lazyResults: states if only the raw variable values are stored after the optimization problem is
+            solved. The optimization summaries and optimal values of a modeling class (e.g. getOptimizationSummary,
+            getOptimalValues or capacityVariablesOptimum) are then set on first access (cf.
+            materializeOptimalValues). Optimal values which were not accessed are discarded if the optimization
+            problem is solved again. The objective value is always stored.
+            |br| * the default value is False
+        :type lazyResults: boolean
+
         Last edited: November 16, 2023
         |br| @author: FINE Developer Team (FZJ IEK-3)
         """
 
+        # Optimal values of a previous solve which were not set yet would be overwritten by this solve
+        self.discardOptimalValues()
+
         if not timeSeriesAggregation:
             self.segmentation = False
 
@@ -1949,6 +2619,9 @@ class EnergySystemModel:
                 timeSeriesAggregation=timeSeriesAggregation,
                 relaxIsBuiltBinary=relaxIsBuiltBinary,
                 relevanceThreshold=relevanceThreshold,
+                incremental=incremental,
+                eliminateZeroOperationVariables=eliminateZeroOperationVariables,
+                profileBuild=profileBuild,
             )
         elif self.pyM is None:
             raise TypeError(
@@ -2003,12 +2676,19 @@ class EnergySystemModel:
             optimizationSpecs,
             timeSeriesAggregation,
         )
+        self.solverSpecs["persistent"] = persistent
 
         # Check which solvers are available and choose default solver if no solver is specified explicitely
         # Order of possible solvers in solverList defines the priority of chosen default solver.
-        solverList = ["gurobi", "glpk", "cbc"]
+        solverList = ["gurobi", "highs", "glpk", "cbc"]
 
-        if solver != "None":
+        if persistent:
+            # Persistent solver interfaces are checked separately (highs is used if no solver is specified)
+            solver = "highs" if solver == "None" else solver
+        elif solver == "highs":
+            if not utilsSolver.isAvailable(solver):
+                solver = "None"
+        elif solver != "None":
             try:
                 opt.SolverFactory(solver).available()
             except Exception:
@@ -2018,7 +2698,11 @@ class EnergySystemModel:
             for nSolver in solverList:
                 if solver == "None":
                     try:
-                        if opt.SolverFactory(nSolver).available():
+                        if nSolver == "highs":
+                            available = utilsSolver.isAvailable(nSolver)
+                        else:
+                            available = opt.SolverFactory(nSolver).available()
+                        if available:
                             solver = nSolver
                             utils.output(
                                 "Either solver not selected or specified solver not available."
@@ -2042,14 +2726,28 @@ class EnergySystemModel:
         ################################################################################################################
 
         # Set which solver should solve the specified optimization problem
-        if solver == "gurobi" and importlib.util.find_spec('gurobipy'):
+        if persistent:
+            persistentSolver, optimizer = utilsSolver.getPersistentSolver(self, solver)
+            if optimizer is None:
+                raise TypeError(
+                    "No persistent solver interface is available. Install highspy or set persistent to False."
+                )
+            solver = persistentSolver
+        elif solver == "highs":
+            # HiGHS is called in memory via highspy (cf. utilsSolver.solveInMemory)
+            optimizer = None
+        elif solver == "gurobi" and importlib.util.find_spec('gurobipy'):
             # Use the direct gurobi solver that uses the Python API.
             optimizer = opt.SolverFactory(solver, solver_io="python")
         else:
             optimizer = opt.SolverFactory(solver)
 
-        # Set, if specified, the time limit
-        if self.solverSpecs["timeLimit"] is not None and solver == "gurobi":
+        # Set, if specified, the time limit (persistent solvers get the time limit in utilsSolver.solveInMemory)
+        if (
+            self.solverSpecs["timeLimit"] is not None
+            and solver == "gurobi"
+            and not persistent
+        ):
             optimizer.options["timelimit"] = timeLimit
 
         # Set the specified solver options
@@ -2058,7 +2756,25 @@ class EnergySystemModel:
                 optimizationSpecs += " LogToConsole=0"
 
         # Solve optimization problem. The optimization solve time is stored and the solver information is printed.
-        if solver == "gurobi":
+        if persistent:
+            solver_info = utilsSolver.solveInMemory(
+                self,
+                solver,
+                optimizer,
+                threads=threads,
+                timeLimit=timeLimit,
+                optimizationSpecs=optimizationSpecs,
+            )
+        elif solver == "highs":
+            # Pass the problem to HiGHS in memory without keeping the solver instance
+            solver_info = utilsSolver.solveInMemory(
+                self,
+                solver,
+                threads=threads,
+                timeLimit=timeLimit,
+                optimizationSpecs=optimizationSpecs,
+            )
+        elif solver == "gurobi":
             optimizer.set_options(
                 "Threads="
                 + str(threads)
@@ -2078,6 +2794,8 @@ class EnergySystemModel:
         else:
             solver_info = optimizer.solve(self.pyM, tee=True)
         self.solverSpecs["solvetime"] = time.time() - timeStart
+        # Dual values which were cached for the previous solve are outdated
+        self._shadowPriceCubes = {}
         utils.output(solver_info.solver(), self.verbose, 0), utils.output(
             solver_info.problem(), self.verbose, 0
         )
@@ -2141,62 +2859,26 @@ class EnergySystemModel:
                 and self.verbose < 2
             ):
                 warnings.warn("Output is generated for a non-optimal solution.")
-            utils.output("\nProcessing optimization output...", self.verbose, 0)
-            # Declare component specific sets, variables and constraints
-            w = str(len(max(self.componentModelingDict.keys())) + 6)
-
-            # iterate over investment periods, to get yearly results
-            for key, mdl in self.componentModelingDict.items():
-                if not isinstance(mdl._capacityVariablesOptimum, dict):
-                    mdl._capacityVariablesOptimum = {}
-                __t = time.time()
-                # if _capacityVariablesOptimum is not a dict, convert to dict
-                # (if single year system is optimized several times)
-
-                mdl.setOptimalValues(self, self.pyM)
-                outputString = (
-                    ("for {:" + w + "}").format(key + " ...")
-                    + "(%.4f" % (time.time() - __t)
-                    + "sec)"
-                )
-                utils.output(outputString, self.verbose, 0)
-
-                # convert optimal values from internal name to external name
-                # e.g. from _capacityVariablesOptimum to capacityVariablesOptimum
-                # For perfectForesight the data stays the same, for a single year optimization
-                # the data is converted from a dict with a single entry to a dataframe
-                # By this, old models will not fail.
-                def convertOptimalValues(esM, mdl, key):
-                    if key in mdl.__dict__.keys():
-                        if esM.numberOfInvestmentPeriods == 1:
-                            setattr(
-                                mdl,
-                                key.replace("_", ""),
-                                getattr(mdl, key)[esM.investmentPeriodNames[0]],
-                            )
-                        else:
-                            setattr(mdl, key.replace("_", ""), getattr(mdl, key))
-                    else:
-                        pass
-
-                optimalValueParameters = [
-                    "_optSummary",
-                    "_stateOfChargeOperationVSariablesOptimum",
-                    "_chargeOperationVariablesOptimum",
-                    "_dischargeOperationVariablesOptimum",
-                    "_phaseAngleVariablesOptimum",
-                    "_operationVariablesOptimum",
-                    "_discretizationPointVariablesOptimun",
-                    "_discretizationSegmentConVariablesOptimun",
-                    "_discretizationSegmentBinVariablesOptimun",
-                    "_capacityVariablesOptimum",
-                    "_isBuiltVariablesOptimum",
-                    "_commissioningVariablesOptimum",
-                    "_decommissioningVariablesOptimum",
-                ]
-
-                for optParam in optimalValueParameters:
-                    convertOptimalValues(self, mdl, optParam)
+            if lazyResults:
+                # Only store the raw variable values. The optimal values of the modeling classes are set on first
+                # access (cf. materializeOptimalValues).
+                self._lazyOptimalValues = utils.getVariableValueArrays(self.pyM)
+                for key, mdl in self.componentModelingDict.items():
+                    # The external names are pending as well, even if they were not set before
+                    names = [
+                        name
+                        for optParam in optimalValueParameters
+                        if optParam in mdl.__dict__
+                        for name in [optParam, optParam.replace("_", "")]
+                    ]
+                    for name in names:
+                        if name in mdl.__dict__:
+                            delattr(mdl, name)
+                    mdl._pendingOptimalValues = (self, key, names)
+            else:
+                utils.output("\nProcessing optimization output...", self.verbose, 0)
+                for key, mdl in self.componentModelingDict.items():
+                    self.setOptimalValuesOfModelingClass(key, mdl)
 
             if hasattr(self, 'etlModel'):
                 self.etlModel.setOptimalValues(self, self.pyM)
@@ -2273,6 +2955,16 @@ class EnergySystemModel:
             else:
                 gurobi_summary_dict = {}
 
+            # Build profile (aggregated per modeling class, only if the declaration was profiled)
+            build_profile_dict = {}
+            if self.buildProfile is not None:
+                aggregatedBuildProfile = utilsProfile.aggregateBuildProfile(
+                    self.buildProfile
+                )
+                for mdl, row in aggregatedBuildProfile.iterrows():
+                    for column, value in row.items():
+                        build_profile_dict[mdl + " " + column] = value
+
             # Combine to Overall Summary
             summary_dict = {
                 "FineParameters": fine_parameters_dict,
@@ -2280,6 +2972,7 @@ class EnergySystemModel:
                 "ProcessingTimes": processing_time_dict,
                 "TSAParameters": tsa_parameters_dict,
                 "GurobiSummary": gurobi_summary_dict,
+                "BuildProfile": build_profile_dict,
             }
 
             summary_dict = {
@@ -5,3 +5,6 @@ Last edited: January 13, 2023
 
 from .transformationPath import *
 from .optimizeTSAmultiStage import *
+from .scenarioSweep import *
+from .rollingHorizon import *
+from .bendersDecomposition import *
@@ -0,0 +1,441 @@
+from fine import utils, utilsMatrix
+import concurrent.futures
+import functools
+import multiprocessing
+import time
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy import optimize as scipyOpt
+from scipy.sparse import csgraph
+
+# Names of the pyomo variables which are considered as design variables (first stage of the decomposition)
+designVariablePrefixes = ("cap_", "commis_", "decommis_", "nbReal_", "nbInt_", "commisBin_")
+
+# Subproblems of a worker process (set by the initializer of the worker process)
+_workerSubproblems = []
+
+
+def _initBendersWorker(subproblems):
+    _workerSubproblems[:] = subproblems
+
+
+class BendersSubproblem(object):
+    """
+    Operational block of the optimization problem for given values of the design variables:
+    min c^T y s.t. A_ub y <= b_ub - D_ub x, A_eq y == b_eq - D_eq x, lb <= y <= ub.
+    """
+
+    def __init__(self, matrixModel, columns, ubRows, eqRows, designColumns):
+        self.c = matrixModel.c[columns]
+        self.lb, self.ub = matrixModel.lb[columns], matrixModel.ub[columns]
+        A_ub, A_eq = sp.csr_matrix(matrixModel.A_ub), sp.csr_matrix(matrixModel.A_eq)
+        self.A_ub, self.b_ub = A_ub[ubRows][:, columns], matrixModel.b_ub[ubRows]
+        self.A_eq, self.b_eq = A_eq[eqRows][:, columns], matrixModel.b_eq[eqRows]
+        D_ub, D_eq = A_ub[ubRows][:, designColumns], A_eq[eqRows][:, designColumns]
+        # Only the design variables which occur in the subproblem are considered in its cuts
+        used = np.flatnonzero(
+            np.asarray(abs(D_ub).sum(axis=0)).ravel()
+            + np.asarray(abs(D_eq).sum(axis=0)).ravel()
+        )
+        self.designIndex = used
+        self.D_ub, self.D_eq = D_ub[:, used], D_eq[:, used]
+
+    def _linprog(self, c, A_ub, b_ub, A_eq, b_eq, bounds):
+        return scipyOpt.linprog(
+            c,
+            A_ub=A_ub if A_ub.shape[0] > 0 else None,
+            b_ub=b_ub if A_ub.shape[0] > 0 else None,
+            A_eq=A_eq if A_eq.shape[0] > 0 else None,
+            b_eq=b_eq if A_eq.shape[0] > 0 else None,
+            bounds=bounds,
+            method="highs",
+        )
+
+    def _gradient(self, res):
+        """Derivative of the objective value with respect to the (used) design variables."""
+        gradient = np.zeros(len(self.designIndex))
+        if self.A_ub.shape[0] > 0:
+            gradient -= self.D_ub.T @ res.ineqlin.marginals
+        if self.A_eq.shape[0] > 0:
+            gradient -= self.D_eq.T @ res.eqlin.marginals
+        return gradient
+
+    def getLowerBound(self, designLb, designUb):
+        """
+        Lower bound of the objective value of the subproblem for all values of the design variables within their
+        bounds (the design variables are considered as free variables of the subproblem).
+        """
+        bounds = list(zip(self.lb, self.ub)) + list(
+            zip(designLb[self.designIndex], designUb[self.designIndex])
+        )
+        res = self._linprog(
+            np.concatenate([self.c, np.zeros(len(self.designIndex))]),
+            sp.hstack([self.A_ub, self.D_ub]),
+            self.b_ub,
+            sp.hstack([self.A_eq, self.D_eq]),
+            self.b_eq,
+            bounds,
+        )
+        if res.status == 2:
+            raise ValueError("The optimization problem is infeasible.")
+        return res.fun if res.status == 0 else -np.inf
+
+    def solve(self, x):
+        """
+        Solve the subproblem for the values x of the (used) design variables.
+
+        :return: tuple (feasible, value, gradient). If the subproblem is feasible, value is its objective value.
+            Otherwise, value is the minimal sum of constraint violations. gradient is the derivative of value
+            with respect to the design variables.
+        """
+        b_ub, b_eq = self.b_ub - self.D_ub @ x, self.b_eq - self.D_eq @ x
+        bounds = list(zip(self.lb, self.ub))
+        res = self._linprog(self.c, self.A_ub, b_ub, self.A_eq, b_eq, bounds)
+        if res.status == 0:
+            return True, res.fun, self._gradient(res)
+        if res.status != 2:
+            raise RuntimeError("Benders subproblem could not be solved: " + res.message)
+
+        # Minimize the constraint violations to obtain a feasibility cut
+        nUb, nEq, nY = self.A_ub.shape[0], self.A_eq.shape[0], len(self.c)
+        c = np.concatenate([np.zeros(nY), np.ones(nUb + 2 * nEq)])
+        A_ub = sp.hstack(
+            [self.A_ub, -sp.eye(nUb), sp.csr_matrix((nUb, 2 * nEq))]
+        )
+        A_eq = sp.hstack(
+            [self.A_eq, sp.csr_matrix((nEq, nUb)), sp.eye(nEq), -sp.eye(nEq)]
+        )
+        bounds += [(0, None)] * (nUb + 2 * nEq)
+        res = self._linprog(c, A_ub.tocsr(), b_ub, A_eq.tocsr(), b_eq, bounds)
+        return False, res.fun, self._gradient(res)
+
+
+def _solveSubproblem(k, x, subproblems=None):
+    if subproblems is None:
+        subproblems = _workerSubproblems
+    return subproblems[k].solve(x)
+
+
+def _groupBlocks(labels, numberOfBlocks, numberOfSubproblems):
+    """
+    Assign the independent blocks of the operational variables to subproblems with similar numbers of variables.
+    """
+    sizes = np.bincount(labels, minlength=numberOfBlocks)
+    numberOfSubproblems = max(1, min(numberOfSubproblems, numberOfBlocks))
+    groupOfBlock, load = np.zeros(numberOfBlocks, dtype=int), np.zeros(
+        numberOfSubproblems
+    )
+    for block in np.argsort(-sizes, kind="stable"):
+        group = int(np.argmin(load))
+        groupOfBlock[block] = group
+        load[group] += sizes[block]
+    return groupOfBlock
+
+
+def optimizeBenders(
+    esM,
+    timeSeriesAggregation=False,
+    numberOfSubproblems=None,
+    workers=1,
+    tolerance=1e-4,
+    maxIterations=100,
+    relevanceThreshold=None,
+    setOptimalValues=True,
+    solver="None",
+    threads=3,
+):
+    """
+    Optimize an energy system model with a Benders decomposition into a master problem over the design variables
+    (cap_*, commis_*, decommis_*, nbReal_*, nbInt_* and commisBin_* variables) and operational subproblems. The
+    subproblems are the independent blocks of the operational variables of the declared optimization problem,
+    i.e. typical periods (time series aggregation without inter-period storage) or investment periods, which are
+    grouped to numberOfSubproblems subproblems. The subproblems are solved for the design of the master problem
+    (in parallel worker processes if workers > 1) and optimality or feasibility cuts are added to the master
+    problem based on their dual values until the gap between the lower bound (objective value of the master
+    problem) and the upper bound (best found solution) is below the tolerance.
+
+    The master problem and the subproblems are solved with the HiGHS solver shipped with scipy (cf. the standard
+    form of utilsMatrix). The operational subproblems must be linear. The lower bound, the
+    upper bound and the gap are stored as esM.lowerBound, esM.upperBound and esM.gap and the bounds of all
+    iterations as esM.bendersSummary.
+
+    **Required arguments:**
+
+    :param esM: energy system model which should be optimized.
+    :type esM: EnergySystemModel instance from the FINE package
+
+    **Default arguments:**
+
+    :param timeSeriesAggregation: states if the optimization of the energy system model should be done with
+
+        (a) the full time series (False) or
+        (b) clustered time series data (True).
+
+        |br| * the default value is False
+    :type timeSeriesAggregation: boolean
+
+    :param numberOfSubproblems: maximum number of subproblems. If None, the number of typical periods (with time
+        series aggregation) times the number of investment periods is used.
+        |br| * the default value is None
+    :type numberOfSubproblems: strictly positive integer or None
+
+    :param workers: number of worker processes in which the subproblems are solved. If 1, the subproblems are
+        solved in the current process.
+        |br| * the default value is 1
+    :type workers: strictly positive integer
+
+    :param tolerance: relative gap between the lower and the upper bound at which the decomposition stops.
+        |br| * the default value is 1e-4
+    :type tolerance: positive float
+
+    :param maxIterations: maximum number of iterations.
+        |br| * the default value is 100
+    :type maxIterations: strictly positive integer
+
+    :param relevanceThreshold: Force operation parameters to be 0 if values are below the relevance threshold.
+        |br| * the default value is None
+    :type relevanceThreshold: float (>=0) or None
+
+    :param setOptimalValues: states if the design variables are fixed to the best found design and the
+        optimization problem is solved again (with the specified solver) to set the optimal values of the
+        modeling classes.
+        |br| * the default value is True
+    :type setOptimalValues: boolean
+
+    :param solver: solver which is used to set the optimal values (cf. EnergySystemModel.optimize).
+        |br| * the default value is 'None'
+    :type solver: string
+
+    :param threads: number of computational threads used by the solver which is used to set the optimal
+        values (cf. EnergySystemModel.optimize).
+        |br| * the default value is 3
+    :type threads: positive integer
+    """
+    timeStart = time.time()
+    esM.declareOptimizationProblem(
+        timeSeriesAggregation=timeSeriesAggregation,
+        relevanceThreshold=relevanceThreshold,
+    )
+    matrixModel = utilsMatrix.buildMatrixModel(esM)
+
+    # Split the columns into design variables and operational variables
+    isDesign = np.array(
+        [
+            var.parent_component().local_name.startswith(designVariablePrefixes)
+            for var in matrixModel.columns
+        ]
+    )
+    designColumns, opColumns = np.flatnonzero(isDesign), np.flatnonzero(~isDesign)
+    if matrixModel.integrality[opColumns].any():
+        raise ValueError(
+            "The Benders decomposition requires linear operational subproblems (the optimization problem contains "
+            + "integer or binary operation variables)."
+        )
+
+    # Find the independent blocks of the operational variables (connected components of the bipartite graph of
+    # the rows and the operational columns)
+    A = sp.csr_matrix(sp.vstack([matrixModel.A_ub, matrixModel.A_eq]))
+    A_op = A[:, opColumns]
+    A_op.data = np.ones_like(A_op.data)
+    nRows, nOp = A_op.shape
+    graph = sp.bmat([[None, A_op], [A_op.T, None]])
+    numberOfBlocks, labels = csgraph.connected_components(graph, directed=False)
+    # Renumber the blocks which contain operational columns
+    blocks, columnLabels = np.unique(labels[nRows:], return_inverse=True)
+    if numberOfSubproblems is None:
+        numberOfSubproblems = esM.numberOfInvestmentPeriods * (
+            len(esM.typicalPeriods) if timeSeriesAggregation else 1
+        )
+    groupOfBlock = _groupBlocks(columnLabels, len(blocks), numberOfSubproblems)
+    columnGroups = groupOfBlock[columnLabels]
+
+    # Rows without operational variables belong to the master problem
+    rowHasOp = np.diff(A_op.indptr) > 0
+    rowGroups = np.full(nRows, -1)
+    firstOpColumn = A_op.indices[A_op.indptr[:-1][rowHasOp]]
+    rowGroups[rowHasOp] = columnGroups[firstOpColumn]
+    nUb = matrixModel.A_ub.shape[0]
+    ubGroups, eqGroups = rowGroups[:nUb], rowGroups[nUb:]
+
+    numberOfGroups = int(columnGroups.max()) + 1 if nOp > 0 else 0
+    subproblems = [
+        BendersSubproblem(
+            matrixModel,
+            opColumns[columnGroups == k],
+            np.flatnonzero(ubGroups == k),
+            np.flatnonzero(eqGroups == k),
+            designColumns,
+        )
+        for k in range(numberOfGroups)
+    ]
+    designLb, designUb = matrixModel.lb[designColumns], matrixModel.ub[designColumns]
+    thetaLb = [
+        subproblem.getLowerBound(designLb, designUb) for subproblem in subproblems
+    ]
+    utils.output(
+        "Benders decomposition with %d design variables and %d subproblems"
+        % (len(designColumns), len(subproblems)),
+        esM.verbose,
+        0,
+    )
+
+    # Master problem: min c_x^T x + sum(theta) s.t. design rows and cuts
+    nX, nTheta = len(designColumns), len(subproblems)
+    cMaster = np.concatenate([matrixModel.c[designColumns], np.ones(nTheta)])
+    masterBounds = scipyOpt.Bounds(
+        np.concatenate([designLb, np.maximum(thetaLb, -1e12)]),
+        np.concatenate([designUb, np.full(nTheta, np.inf)]),
+    )
+    masterIntegrality = np.concatenate(
+        [matrixModel.integrality[designColumns], np.zeros(nTheta, dtype=int)]
+    )
+    masterConstraints = []
+    A_ub, A_eq = sp.csr_matrix(matrixModel.A_ub), sp.csr_matrix(matrixModel.A_eq)
+    if (ubGroups == -1).any():
+        masterConstraints.append(
+            scipyOpt.LinearConstraint(
+                sp.hstack(
+                    [
+                        A_ub[ubGroups == -1][:, designColumns],
+                        sp.csr_matrix(((ubGroups == -1).sum(), nTheta)),
+                    ]
+                ),
+                -np.inf,
+                matrixModel.b_ub[ubGroups == -1],
+            )
+        )
+    if (eqGroups == -1).any():
+        masterConstraints.append(
+            scipyOpt.LinearConstraint(
+                sp.hstack(
+                    [
+                        A_eq[eqGroups == -1][:, designColumns],
+                        sp.csr_matrix(((eqGroups == -1).sum(), nTheta)),
+                    ]
+                ),
+                matrixModel.b_eq[eqGroups == -1],
+                matrixModel.b_eq[eqGroups == -1],
+            )
+        )
+    cutRows, cutRhs = [], []
+
+    # The subproblems are passed to the worker processes once (with the fork start method, they are inherited
+    # without pickling)
+    executor = None
+    if workers > 1 and nTheta > 1:
+        startMethod = (
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, nTheta),
+            mp_context=multiprocessing.get_context(startMethod),
+            initializer=_initBendersWorker,
+            initargs=(subproblems,),
+        )
+    solveSubproblem = functools.partial(_solveSubproblem, subproblems=subproblems)
+
+    lowerBound, upperBound, bestDesign, summary = -np.inf, np.inf, None, []
+    try:
+        for iteration in range(maxIterations):
+            constraints = list(masterConstraints)
+            if cutRows:
+                constraints.append(
+                    scipyOpt.LinearConstraint(
+                        sp.vstack(cutRows), -np.inf, np.array(cutRhs)
+                    )
+                )
+            res = scipyOpt.milp(
+                cMaster,
+                constraints=constraints,
+                integrality=masterIntegrality,
+                bounds=masterBounds,
+            )
+            if res.status != 0:
+                raise RuntimeError("Benders master problem could not be solved: " + res.message)
+            x, theta = res.x[:nX], res.x[nX:]
+            lowerBound = max(lowerBound, res.fun + matrixModel.cOffset)
+
+            xs = [x[subproblem.designIndex] for subproblem in subproblems]
+            if executor is not None:
+                results = list(executor.map(_solveSubproblem, range(nTheta), xs))
+            else:
+                results = [solveSubproblem(k, xs[k]) for k in range(nTheta)]
+
+            feasible = all(result[0] for result in results)
+            if feasible:
+                objective = (
+                    matrixModel.c[designColumns] @ x
+                    + sum(result[1] for result in results)
+                    + matrixModel.cOffset
+                )
+                if objective < upperBound:
+                    upperBound, bestDesign = objective, x.copy()
+
+            # Add optimality cuts (theta_k >= z_k + g^T (x - x_k)) and feasibility cuts (w_k + g^T (x - x_k) <= 0)
+            for k, (subFeasible, value, gradient) in enumerate(results):
+                if subFeasible and value <= theta[k] + tolerance * max(1, abs(value)):
+                    continue
+                row = np.zeros(nX + nTheta)
+                row[subproblems[k].designIndex] = gradient
+                if subFeasible:
+                    row[nX + k] = -1
+                cutRows.append(sp.csr_matrix(row))
+                cutRhs.append(gradient @ xs[k] - value)
+
+            gap = (upperBound - lowerBound) / abs(upperBound) if np.isfinite(upperBound) else np.inf
+            summary.append(
+                {
+                    "lowerBound": lowerBound,
+                    "upperBound": upperBound,
+                    "gap": gap,
+                    "cuts": len(cutRows),
+                    "runtime": time.time() - timeStart,
+                }
+            )
+            utils.output(
+                "\tIteration %d: lower bound %s, upper bound %s, gap %s%%"
+                % (
+                    iteration,
+                    str(round(lowerBound, 2)),
+                    str(round(upperBound, 2)),
+                    str(round(gap * 100, 4)),
+                ),
+                esM.verbose,
+                0,
+            )
+            if gap <= tolerance:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    esM.bendersSummary = pd.DataFrame(summary)
+    esM.bendersSummary.index.name = "iteration"
+    esM.lowerBound, esM.upperBound = lowerBound, upperBound
+    esM.gap = summary[-1]["gap"]
+    print(
+        "The optimal value lies between "
+        + str(round(lowerBound, 2))
+        + " and "
+        + str(round(upperBound, 2))
+        + " with a gap of "
+        + str(round(esM.gap * 100, 2))
+        + "%."
+    )
+
+    if setOptimalValues and bestDesign is not None:
+        # Fix the design variables to the best found design and solve the operational problem
+        designVars = [matrixModel.columns[i] for i in designColumns]
+        for var, value in zip(designVars, bestDesign):
+            var.fix(round(value) if var.is_integer() or var.is_binary() else value)
+        try:
+            esM.optimize(
+                declaresOptimizationProblem=False,
+                timeSeriesAggregation=timeSeriesAggregation,
+                solver=solver,
+                threads=threads,
+            )
+        finally:
+            for var in designVars:
+                var.unfix()
@@ -0,0 +1,350 @@
+from fine import utils
+import time
+import pandas as pd
+import pyomo.environ as pyomo
+
+
+def _sliceTimeSeries(data, start, end, numberOfTimeSteps):
+    """
+    Return the time steps start ... end-1 of (dictionaries of) full time series data with a new time index
+    (0, 0) ... (0, end-start-1). Other data is returned unchanged.
+    """
+    if isinstance(data, dict):
+        return {
+            key: _sliceTimeSeries(value, start, end, numberOfTimeSteps)
+            for key, value in data.items()
+        }
+    if isinstance(data, (pd.DataFrame, pd.Series)) and len(data) == numberOfTimeSteps:
+        window = data.iloc[start:end].copy()
+        window.index = pd.MultiIndex.from_product([[0], range(end - start)])
+        return window
+    return data
+
+
+def _getWindows(numberOfTimeSteps, windowLength, overlapLength):
+    """
+    Return the windows of the rolling horizon as tuples (start, end, commitEnd). The results of the time steps
+    start ... commitEnd-1 are kept, the time steps commitEnd ... end-1 overlap with the next window.
+    """
+    windows, start = [], 0
+    while start < numberOfTimeSteps:
+        end = min(start + windowLength, numberOfTimeSteps)
+        commitEnd = end if end == numberOfTimeSteps else start + windowLength - overlapLength
+        windows.append((start, end, commitEnd))
+        start = commitEnd
+    return windows
+
+
+def _scaleBalanceLimit(balanceLimit, share):
+    """
+    Return a copy of a balance limit DataFrame in which all limits (not the lowerBound column) are multiplied by
+    share. Limits which are None stay None.
+    """
+    if balanceLimit is None:
+        return None
+    scaled = balanceLimit.copy()
+    for col in scaled.columns:
+        if col != "lowerBound":
+            scaled[col] = pd.Series(
+                [None if value is None else value * share for value in scaled[col]],
+                index=scaled.index,
+                dtype=object,
+            )
+    return scaled
+
+
+def _declareCommittedBalanceLimits(esM, pyM, commitLength):
+    """
+    Declare the balance limit constraints of a window again with the contributions of the committed time steps
+    0 ... commitLength-1 only. The time steps which overlap with the next window are optimized again there and do
+    not count towards the limits.
+    """
+    names = ["yearlyBalanceLimitConstraint", "pathwayBalanceLimitConstraint"]
+    if all(pyM.component(name) is None for name in names):
+        return
+    for name in names:
+        if pyM.component(name) is not None:
+            pyM.del_component(name)
+    totalTimeSteps = esM.totalTimeSteps
+    esM.totalTimeSteps = list(range(commitLength))
+    try:
+        esM.declareBalanceLimitConstraint(pyM, False)
+    finally:
+        esM.totalTimeSteps = totalTimeSteps
+
+
+def _fixStates(esM, pyM, states):
+    """
+    Fix the states of charge at the beginning of the window to the states of the previous window and replace the
+    ramping constraints of the first time step of the window by constraints on the operation of the previous
+    window.
+    """
+    for mdl in esM.componentModelingDict.values():
+        abbrvName = mdl.abbrvName
+        if hasattr(pyM, "stateOfCharge_" + abbrvName):
+            getattr(pyM, "ConstrCyclicState_" + abbrvName).deactivate()
+            SOC = getattr(pyM, "stateOfCharge_" + abbrvName)
+            for (loc, compName, ip), value in states["SOC"][abbrvName].items():
+                SOC[loc, compName, ip, 0, 0].fix(value)
+
+        for direction in ["UpMax", "DownMax"]:
+            constrName = "ConstrRamp" + direction + "_" + abbrvName
+            if not hasattr(pyM, constrName):
+                continue
+            opVar = getattr(pyM, "op_" + abbrvName)
+            capVar = getattr(pyM, "cap_" + abbrvName)
+            compDict = mdl.componentsDict
+            previousOp = states["op"][abbrvName]
+            constr = getattr(pyM, constrName)
+            indices = [index for index in constr if index[-1] == 0]
+            for index in indices:
+                constr[index].deactivate()
+
+            def rampMax(pyM, loc, compName, ip, p, t, direction=direction):
+                rampRateMax = getattr(compDict[compName], "ramp" + direction)
+                change = opVar[loc, compName, ip, p, t] - previousOp[loc, compName, ip]
+                if direction == "DownMax":
+                    change = -change
+                return change <= rampRateMax * capVar[loc, compName, ip]
+
+            setattr(
+                pyM,
+                "ConstrRollingHorizonRamp" + direction + "_" + abbrvName,
+                pyomo.Constraint(indices, rule=rampMax),
+            )
+
+
+def _getStates(esM, pyM, commitLength):
+    """
+    Get the states of charge and operations at the end of the kept part of a window.
+    """
+    states = {"SOC": {}, "op": {}}
+    for mdl in esM.componentModelingDict.values():
+        abbrvName = mdl.abbrvName
+        if hasattr(pyM, "stateOfCharge_" + abbrvName):
+            SOC = getattr(pyM, "stateOfCharge_" + abbrvName)
+            states["SOC"][abbrvName] = {
+                (loc, compName, ip): pyomo.value(SOC[loc, compName, ip, p, t])
+                for (loc, compName, ip, p, t) in SOC
+                if t == commitLength
+            }
+        if hasattr(pyM, "op_" + abbrvName):
+            opVar = getattr(pyM, "op_" + abbrvName)
+            if opVar.dim() == 5:
+                states["op"][abbrvName] = {
+                    (loc, compName, ip): opVar[loc, compName, ip, p, t].value
+                    for (loc, compName, ip, p, t) in opVar
+                    if t == commitLength - 1
+                }
+    return states
+
+
+def optimizeRollingHorizon(
+    esM,
+    windowLength,
+    overlapLength=0,
+    logFileName="",
+    threads=3,
+    solver="None",
+    timeLimit=None,
+    optimizationSpecs="",
+    relevanceThreshold=None,
+):
+    """
+    Optimize the operation of an energy system model with fixed capacities on its full temporal resolution in
+    overlapping windows (rolling horizon). Each window is declared and solved as a separate (small) optimization
+    problem. The states of charge of storage components and the operation of components with ramping constraints
+    at the end of the kept part of a window are carried over to the beginning of the next window. The results
+    of the windows are stitched together in the usual optimal values (e.g. operationVariablesOptimum) of the
+    modeling classes.
+
+    .. note::
+        The state of charge at the beginning of the first window equals the state of charge at its end.
+        The balance limits (balanceLimit and pathwayBalanceLimit) are prorated with the share of the time steps
+        which are kept from a window and only constrain the operation in these time steps. Hence, the stitched
+        operation complies with upper and lower limits. Since the limits are prorated evenly, a window can be
+        infeasible although the monolithic problem is feasible. Other constraints over the whole year (e.g. yearly
+        limits or full load hours) are not prorated. Minimum up and down times cannot be carried over to the next
+        window and are not supported. The objective value and the optimization summaries refer to the last window;
+        the objective values of all windows are stored in esM.rollingHorizonSummary.
+
+    **Required arguments:**
+
+    :param esM: energy system model which should be optimized. All components with capacity variables must have
+        a capacityFix in all investment periods.
+    :type esM: EnergySystemModel instance from the FINE package
+
+    :param windowLength: number of time steps of each window
+    :type windowLength: strictly positive integer
+
+    **Default arguments:**
+
+    :param overlapLength: number of time steps at the end of each window which are optimized again in the next
+        window (i.e. only the results of the first windowLength-overlapLength time steps of a window are kept).
+        |br| * the default value is 0
+    :type overlapLength: positive integer (smaller than windowLength)
+
+    :param logFileName: logFileName is used for naming the log file of the optimization solver output of each
+        window (the number of the window is appended).
+        |br| * the default value is ''
+    :type logFileName: string
+
+    :param threads: number of computational threads used for solving the optimization (cf.
+        EnergySystemModel.optimize).
+        |br| * the default value is 3
+    :type threads: positive integer
+
+    :param solver: specifies which solver should solve the optimization problems (cf. EnergySystemModel.optimize).
+        |br| * the default value is 'None'
+    :type solver: string
+
+    :param timeLimit: maximum solve time of each window in seconds (solver dependent input).
+        |br| * the default value is None
+    :type timeLimit: strictly positive integer or None
+
+    :param optimizationSpecs: specifies parameters for the optimization solver (cf. EnergySystemModel.optimize).
+        |br| * the default value is an empty string ('')
+    :type optimizationSpecs: string
+
+    :param relevanceThreshold: Force operation parameters to be 0 if values are below the relevance threshold.
+        |br| * the default value is None
+    :type relevanceThreshold: float (>=0) or None
+    """
+    utils.isStrictlyPositiveInt(windowLength)
+    utils.isPositiveNumber(overlapLength)
+    if overlapLength >= windowLength:
+        raise ValueError("The overlapLength has to be smaller than the windowLength.")
+    for mdl in esM.componentModelingDict.values():
+        for comp in mdl.componentsDict.values():
+            if comp.hasCapacityVariable and any(
+                comp.processedCapacityFix is None
+                or comp.processedCapacityFix[ip] is None
+                for ip in esM.investmentPeriods
+            ):
+                raise ValueError(
+                    "The rolling horizon optimization requires a capacityFix for all components with capacity "
+                    + "variables (missing for "
+                    + comp.name
+                    + ")."
+                )
+            if getattr(comp, "upTimeMin", None) is not None or getattr(
+                comp, "downTimeMin", None
+            ) is not None:
+                raise ValueError(
+                    "The rolling horizon optimization does not support minimum up and down times (given for "
+                    + comp.name
+                    + ")."
+                )
+
+    numberOfTimeSteps = esM.numberOfTimeSteps
+    windows = _getWindows(numberOfTimeSteps, windowLength, overlapLength)
+    utils.output(
+        "Optimizing %d time steps in %d windows ..." % (numberOfTimeSteps, len(windows)),
+        esM.verbose,
+        0,
+    )
+
+    # Store the full temporal resolution of the energy system model and the full time series of the components
+    temporalAttributes = ["totalTimeSteps", "numberOfTimeSteps", "numberOfYears"]
+    fullTemporal = {attr: getattr(esM, attr) for attr in temporalAttributes}
+    fullBalanceLimit = esM.processedBalanceLimit
+    fullPathwayBalanceLimit = esM.processedPathwayBalanceLimit
+    fullTimeSeries = {
+        comp: {
+            attr: value
+            for attr, value in comp.__dict__.items()
+            if attr.startswith("full")
+        }
+        for mdl in esM.componentModelingDict.values()
+        for comp in mdl.componentsDict.values()
+    }
+
+    stitched = {key: {} for key in esM.componentModelingDict.keys()}
+    summary, states = [], None
+    try:
+        for i, (start, end, commitEnd) in enumerate(windows):
+            timeStart = time.time()
+            esM.totalTimeSteps = list(range(end - start))
+            esM.numberOfTimeSteps = end - start
+            esM.numberOfYears = (end - start) * esM.hoursPerTimeStep / 8760.0
+            share = (commitEnd - start) / numberOfTimeSteps
+            if fullBalanceLimit is not None:
+                esM.processedBalanceLimit = {
+                    ip: _scaleBalanceLimit(balanceLimit, share)
+                    for ip, balanceLimit in fullBalanceLimit.items()
+                }
+            esM.processedPathwayBalanceLimit = _scaleBalanceLimit(
+                fullPathwayBalanceLimit, share
+            )
+            for comp, timeSeries in fullTimeSeries.items():
+                for attr, value in timeSeries.items():
+                    setattr(
+                        comp, attr, _sliceTimeSeries(value, start, end, numberOfTimeSteps)
+                    )
+
+            esM.declareOptimizationProblem(
+                timeSeriesAggregation=False, relevanceThreshold=relevanceThreshold
+            )
+            if commitEnd < end:
+                _declareCommittedBalanceLimits(esM, esM.pyM, commitEnd - start)
+            if states is not None:
+                _fixStates(esM, esM.pyM, states)
+            esM.optimize(
+                declaresOptimizationProblem=False,
+                timeSeriesAggregation=False,
+                logFileName=logFileName + "_" + str(i) if logFileName else "",
+                threads=threads,
+                solver=solver,
+                timeLimit=timeLimit,
+                optimizationSpecs=optimizationSpecs,
+            )
+            states = _getStates(esM, esM.pyM, commitEnd - start)
+
+            # Keep the time dependent optimal values of the committed time steps
+            for key, mdl in esM.componentModelingDict.items():
+                for ipName in esM.investmentPeriodNames:
+                    for name, d in mdl.getOptimalValues(ip=ipName).items():
+                        if d["timeDependent"] and d["values"] is not None:
+                            values = d["values"].iloc[:, : commitEnd - start]
+                            values.columns = range(start, commitEnd)
+                            stitched[key].setdefault((name, ipName), []).append(values)
+            summary.append(
+                {
+                    "start": start,
+                    "end": end,
+                    "commitEnd": commitEnd,
+                    "objectiveValue": esM.objectiveValue,
+                    "terminationCondition": esM.solverSpecs["terminationCondition"],
+                    "runtime": time.time() - timeStart,
+                }
+            )
+            utils.output(
+                "\tWindow %d (time steps %d-%d): %.4f sec"
+                % (i, start, end - 1, summary[-1]["runtime"]),
+                esM.verbose,
+                0,
+            )
+    finally:
+        for attr, value in fullTemporal.items():
+            setattr(esM, attr, value)
+        esM.processedBalanceLimit = fullBalanceLimit
+        esM.processedPathwayBalanceLimit = fullPathwayBalanceLimit
+        for comp, timeSeries in fullTimeSeries.items():
+            for attr, value in timeSeries.items():
+                setattr(comp, attr, value)
+        esM.timeStepsPerPeriod = esM.totalTimeSteps
+
+    # Stitch the optimal values of the windows together
+    for key, mdl in esM.componentModelingDict.items():
+        for (name, ipName), frames in stitched[key].items():
+            values = pd.concat(frames, axis=1)
+            getattr(mdl, "_" + name)[ipName] = values
+            esM.resultsStore.add(key, name, ipName, values, True, mdl.dimension)
+            if esM.numberOfInvestmentPeriods == 1:
+                setattr(mdl, name, values)
+            else:
+                setattr(mdl, name, getattr(mdl, "_" + name))
+    esM._fullTimeSeriesIndex = {}
+
+    esM.rollingHorizonSummary = pd.DataFrame(summary)
+    esM.rollingHorizonSummary.index.name = "window"
@@ -0,0 +1,292 @@
+from fine import utils
+import copy
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+import traceback
+import numpy as np
+import pandas as pd
+
+
+def _collectSharedData(value, memo):
+    """
+    Add the pandas and numpy objects in value (or in its dict values and list items) to the memo of deepcopy so
+    that they are shared by the copies instead of being copied.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index, np.ndarray)):
+        memo[id(value)] = value
+    elif isinstance(value, dict):
+        for v in value.values():
+            _collectSharedData(v, memo)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _collectSharedData(v, memo)
+
+
+def _copyESM(esM):
+    """
+    Copy an energy system model for a variant. The time series and other pandas and numpy data of the energy
+    system model and its components are shared with the base energy system model (i.e. with the fork start
+    method, they stay shared copy-on-write between the worker processes), all other attributes are copied.
+    """
+    memo = {}
+    _collectSharedData(list(esM.__dict__.values()), memo)
+    for mdl in esM.componentModelingDict.values():
+        for comp in mdl.componentsDict.values():
+            _collectSharedData(list(comp.__dict__.values()), memo)
+    return copy.deepcopy(esM, memo)
+
+
+def _applyVariant(esM, variant):
+    """
+    Apply the updates of a variant to an energy system model.
+    """
+    for componentName, updateAttrs in variant.get("components", {}).items():
+        esM.updateComponent(componentName, updateAttrs)
+    if "balanceLimit" in variant:
+        esM.balanceLimit = variant["balanceLimit"]
+        esM.processedBalanceLimit = utils.checkAndSetBalanceLimit(
+            esM, variant["balanceLimit"], esM.locations
+        )
+    if "pathwayBalanceLimit" in variant:
+        esM.pathwayBalanceLimit = variant["pathwayBalanceLimit"]
+        esM.processedPathwayBalanceLimit = utils.checkAndSetPathwayBalanceLimit(
+            esM, variant["pathwayBalanceLimit"], esM.locations
+        )
+    for componentName, attrs in variant.get("attributes", {}).items():
+        component = esM.getComponent(componentName)
+        for attr, value in attrs.items():
+            setattr(component, attr, value)
+    if "function" in variant:
+        variant["function"](esM)
+
+
+def _runVariant(context, index, connection):
+    """
+    Optimize one variant of the base energy system model in a worker process and send the results to the parent
+    process.
+    """
+    baseESM, variants, optimizeArgs, resultSlices = context
+    results = {}
+    timeStart = time.time()
+    try:
+        esM = _copyESM(baseESM)
+        _applyVariant(esM, variants[index])
+        esM.optimize(**optimizeArgs)
+        results[("status", "")] = "ok"
+        results[("terminationCondition", "")] = str(
+            esM.solverSpecs["terminationCondition"]
+        )
+        results[("objectiveValue", "")] = esM.objectiveValue
+        results[("solvetime", "")] = esM.solverSpecs["solvetime"]
+        for sliceName, resultSlice in resultSlices.items():
+            value = resultSlice(esM)
+            if isinstance(value, pd.DataFrame):
+                value = value.stack()
+            if isinstance(value, pd.Series):
+                for key, v in value.items():
+                    results[(sliceName, key)] = v
+            else:
+                results[(sliceName, "")] = value
+        results[("error", "")] = None
+    except Exception as exception:
+        results[("status", "")] = "failed"
+        results[("error", "")] = "".join(
+            traceback.format_exception_only(type(exception), exception)
+        ).strip()
+    results[("runtime", "")] = time.time() - timeStart
+    connection.send(results)
+    connection.close()
+
+
+def optimizeScenarioSweep(
+    esM,
+    variants,
+    workers=None,
+    threadsPerWorker=1,
+    timeSeriesAggregation=False,
+    solver="None",
+    timeLimit=None,
+    optimizationSpecs="",
+    resultSlices=None,
+    startMethod=None,
+):
+    """
+    Optimize variants of an energy system model (e.g. with different costs, balance limits or capacity bounds)
+    in parallel worker processes and return the objective values and chosen results of all variants as table.
+
+    Each variant is optimized in its own worker process (at most workers processes run at the same time) in a
+    copy of the base energy system model. The base energy system model itself is not changed. The time series and
+    other pandas and numpy data of the energy system model and its components are not copied but shared with the
+    base energy system model. If the fork start method is available, the worker processes inherit the base energy
+    system model from the parent process, i.e. this data is shared copy-on-write and not pickled. If a worker
+    process terminates abnormally (e.g. because it runs out of memory), only its variant fails.
+
+    **Required arguments:**
+
+    :param esM: base energy system model of the variants. If the variants should be optimized with time series
+        aggregation, aggregateTemporally has to be called before. Note that updates of time series attributes
+        are then not reflected in the aggregated time series data.
+    :type esM: EnergySystemModel instance from the FINE package
+
+    :param variants: update specifications of the variants. Each variant is a dictionary with the optional keys
+
+        * 'name': name of the variant in the results table (default: position in the list),
+        * 'components': dictionary with component names as keys and dictionaries with the attributes which are
+          updated with EnergySystemModel.updateComponent as values,
+        * 'attributes': dictionary with component names as keys and dictionaries with attributes which are set
+          directly (e.g. processed attributes) as values,
+        * 'balanceLimit' and 'pathwayBalanceLimit': new balance limits of the energy system model (e.g. CO2 caps),
+        * 'function': a function which is called with the copied energy system model after the other updates.
+
+    :type variants: list of dicts
+
+    **Default arguments:**
+
+    :param workers: number of worker processes. If None, the number of available cores divided by
+        threadsPerWorker is used.
+        |br| * the default value is None
+    :type workers: strictly positive integer or None
+
+    :param threadsPerWorker: number of computational threads used by the solver in each worker process
+        (cf. threads in EnergySystemModel.optimize).
+        |br| * the default value is 1
+    :type threadsPerWorker: positive integer
+
+    :param timeSeriesAggregation: states if the variants should be optimized with the aggregated time series
+        data of the base energy system model (True) or with the full time series (False).
+        |br| * the default value is False
+    :type timeSeriesAggregation: boolean
+
+    :param solver: specifies which solver should solve the optimization problems (cf. EnergySystemModel.optimize).
+        If 'None', the first installed solver is used.
+        |br| * the default value is 'None'
+    :type solver: string
+
+    :param timeLimit: maximum solve time of each variant in seconds (solver dependent input).
+        |br| * the default value is None
+    :type timeLimit: strictly positive integer or None
+
+    :param optimizationSpecs: specifies parameters for the optimization solver (cf. EnergySystemModel.optimize).
+        |br| * the default value is an empty string ('')
+    :type optimizationSpecs: string
+
+    :param resultSlices: results which are added to the table. The keys are the names of the results and the
+        values are functions which are called with the optimized energy system model and return a scalar, a
+        pandas Series or a pandas DataFrame (e.g. lambda esM: esM.getOptimizationSummary('ConversionModel').loc[
+        ('Electrolyzers', 'capacity', '[kW$_{H_{2},LHV}$]')]). Series and DataFrames are added with one column per
+        entry.
+        |br| * the default value is None
+    :type resultSlices: dict or None
+
+    :param startMethod: start method of the worker processes ('fork', 'spawn' or 'forkserver'). If None, 'fork'
+        is used if it is available. With other start methods, the base energy system model, the variants and
+        the result slices are pickled once for each variant.
+        |br| * the default value is None
+    :type startMethod: string or None
+
+    :returns: table with the variant names as index and the columns status ('ok' or 'failed'),
+        terminationCondition, objectiveValue, solvetime, runtime, error (message of the exception if the
+        variant failed) and the result slices. The columns are a MultiIndex with the name of the result and the
+        entry of the result slice ('' for scalar results).
+    :rtype: pandas DataFrame
+    """
+    if len(variants) == 0:
+        raise ValueError("At least one variant has to be specified.")
+    resultSlices = {} if resultSlices is None else resultSlices
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // max(1, threadsPerWorker))
+    workers = max(1, min(workers, len(variants)))
+    names = [variant.get("name", i) for i, variant in enumerate(variants)]
+    if len(set(names)) != len(names):
+        raise ValueError("The names of the variants have to be unique.")
+
+    # The optimization problem and the solver interfaces of the base energy system model are not copied to the
+    # workers
+    baseESM = copy.copy(esM)
+    baseESM.pyM = None
+    baseESM.persistentSolver = None
+    optimizeArgs = dict(
+        declaresOptimizationProblem=True,
+        timeSeriesAggregation=timeSeriesAggregation,
+        threads=threadsPerWorker,
+        solver=solver,
+        timeLimit=timeLimit,
+        optimizationSpecs=optimizationSpecs,
+    )
+    context = (baseESM, variants, optimizeArgs, resultSlices)
+
+    if startMethod is None:
+        startMethod = (
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+    mpContext = multiprocessing.get_context(startMethod)
+
+    utils.output(
+        "Optimizing %d variants with %d workers (%d solver threads each) ..."
+        % (len(variants), workers, threadsPerWorker),
+        esM.verbose,
+        0,
+    )
+    # One process per variant: a process which terminates abnormally only affects its own variant
+    results, pending, running = {}, list(range(len(variants))), {}
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                index = pending.pop(0)
+                parentConnection, childConnection = mpContext.Pipe(duplex=False)
+                process = mpContext.Process(
+                    target=_runVariant, args=(context, index, childConnection)
+                )
+                process.start()
+                # Close the write end in the parent so that the pipe signals EOF if the process terminates
+                childConnection.close()
+                running[parentConnection] = (index, process)
+
+            for connection in multiprocessing.connection.wait(list(running.keys())):
+                index, process = running.pop(connection)
+                name = names[index]
+                try:
+                    results[name] = connection.recv()
+                except (EOFError, OSError):
+                    process.join()
+                    results[name] = {
+                        ("status", ""): "failed",
+                        ("error", ""): "The worker process terminated abnormally (exit code "
+                        + str(process.exitcode)
+                        + ").",
+                    }
+                connection.close()
+                process.join()
+                utils.output(
+                    "\tVariant " + str(name) + ": " + results[name][("status", "")],
+                    esM.verbose,
+                    0,
+                )
+    finally:
+        for connection, (_, process) in running.items():
+            process.terminate()
+            process.join()
+            connection.close()
+
+    table = pd.DataFrame.from_dict(
+        {name: results[name] for name in names}, orient="index"
+    )
+    table.index.name = "variant"
+    fixedColumns = [
+        (column, "")
+        for column in [
+            "status",
+            "terminationCondition",
+            "objectiveValue",
+            "solvetime",
+            "runtime",
+            "error",
+        ]
+    ]
+    for column in fixedColumns:
+        if column not in table.columns:
+            table[column] = None
+    otherColumns = [column for column in table.columns if column not in fixedColumns]
+    return table[fixedColumns + otherColumns]
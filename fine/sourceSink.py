@@ -472,14 +472,19 @@ class Source(Component):
             else self.fullCommodityRevenueTimeSeries
         )
 
-    def getDataForTimeSeriesAggregation(self, ip):
+    def getDataForTimeSeriesAggregation(self, ip, tsaInputMatrix=None):
         """Function for getting the required data if a time series aggregation is requested.
 
         :param ip: investment period of transformation path analysis.
         :type ip: int
+
+        :param tsaInputMatrix: column registry in which the time series data is registered instead of returning a
+            DataFrame (cf. EnergySystemModel.getTimeSeriesDataForAggregation)
+            |br| * the default value is None
+        :type tsaInputMatrix: utilsTSA.TSAInputMatrix or None
         """
 
-        weightDict, data = {}, []
+        weightDict, data = {}, ([] if tsaInputMatrix is None else tsaInputMatrix)
         if self.fullOperationRateFix:
             weightDict, data = self.prepareTSAInput(
                 self.fullOperationRateFix,
@@ -523,7 +528,7 @@ class Source(Component):
             data,
             ip,
         )
-        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
+        return self.getTSAInput(data, weightDict)
 
     def setAggregatedTimeSeriesData(self, data, ip):
         """
@@ -931,13 +936,22 @@ class SourceSinkModel(ComponentModel):
         :param commod: Name of the regarded commodity (commodities are defined in the EnergySystemModel instance)
         :param commod: string
         """
-        return any(
-            [
-                comp.commodity == commod
-                and comp.processedLocationalEligibility[loc] == 1
-                for comp in self.componentsDict.values()
-            ]
-        )
+        return commod in self.getLocationCommodityIncidence(esM).get(loc, ())
+
+    def buildLocationCommodityIncidence(self, esM):
+        """
+        Build a dictionary which maps each location to the set of commodities for which operation variables exist
+        in the modeling class (see ComponentModel.getLocationCommodityIncidence).
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+        """
+        incidence = {loc: set() for loc in esM.locations}
+        for comp in self.componentsDict.values():
+            for loc in comp.processedLocationalEligibility.index:
+                if comp.processedLocationalEligibility[loc] == 1:
+                    incidence.setdefault(loc, set()).add(comp.commodity)
+        return incidence
 
     def getBalanceLimitContribution(
         self, esM, pyM, ID, ip, timeSeriesAggregation, loc, componentNames
@@ -976,6 +990,7 @@ class SourceSinkModel(ComponentModel):
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
         opVar = getattr(pyM, "op_" + abbrvName)
+        opVarSet = getattr(pyM, "operationVarSet_" + abbrvName)
 
         if timeSeriesAggregation:
             periods = esM.typicalPeriods
@@ -997,6 +1012,7 @@ class SourceSinkModel(ComponentModel):
                 for p in periods
                 for t in timeSteps
                 for _loc in esM.locations
+                if (_loc, compName, ip) in opVarSet
             )
         # Otherwise get the contribution for specific region
         else:
@@ -1006,6 +1022,7 @@ class SourceSinkModel(ComponentModel):
                 * esM.periodOccurrences[ip][p]
                 for compName in compDict.keys()
                 if compName in componentNames
+                and (loc, compName, ip) in opVarSet
                 for p in periods
                 for t in timeSteps
             )
@@ -1032,6 +1049,26 @@ class SourceSinkModel(ComponentModel):
             if compDict[compName].commodity == commod
         )
 
+    def getCommodityBalanceContributionIndex(self, esM, pyM):
+        """
+        Get the contributions to the commodity balances as a precomputed index
+        (see ComponentModel.getCommodityBalanceContributionIndex).
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar, opVarDict = (
+            getattr(pyM, "op_" + abbrvName),
+            getattr(pyM, "operationVarDict_" + abbrvName),
+        )
+        balanceIndex = {}
+        for ip, locDict in opVarDict.items():
+            for loc, compNames in locDict.items():
+                for compName in compNames:
+                    comp = compDict[compName]
+                    balanceIndex.setdefault((loc, comp.commodity, ip), []).append(
+                        (opVar, (loc, compName, ip), comp.sign)
+                    )
+        return balanceIndex
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
@@ -1200,19 +1237,20 @@ class SourceSinkModel(ComponentModel):
             getOptValueCostType="NPV",
         )
 
-        for ip in esM.investmentPeriods:
-            compDict, abbrvName = self.componentsDict, self.abbrvName
-            opVar = getattr(pyM, "op_" + abbrvName)
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar = getattr(pyM, "op_" + abbrvName)
+        opOptVals = utils.formatOptimizationOutputPerPeriod(
+            utils.getOptimalVariableValues(opVar),
+            "operationVariables",
+            "1dim",
+            esM.investmentPeriods,
+            esM.periodsOrder,
+            esM=esM,
+        )
 
+        for ip in esM.investmentPeriods:
             # Set optimal operation variables and append optimization summary
-            optVal = utils.formatOptimizationOutput(
-                opVar.get_values(),
-                "operationVariables",
-                "1dim",
-                ip,
-                esM.periodsOrder[ip],
-                esM=esM,
-            )
+            optVal = opOptVals[ip]
 
             self._operationVariablesOptimum[esM.investmentPeriodNames[ip]] = optVal
 
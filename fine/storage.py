@@ -469,14 +469,19 @@ class Storage(Component):
             self.aggregatedStateOfChargeMin if hasTSA else self.fullStateOfChargeMin
         )
 
-    def getDataForTimeSeriesAggregation(self, ip):
+    def getDataForTimeSeriesAggregation(self, ip, tsaInputMatrix=None):
         """Function for getting the required data if a time series aggregation is requested.
 
         :param ip: investment period of transformation path analysis.
         :type ip: int
 
+        :param tsaInputMatrix: column registry in which the time series data is registered instead of returning a
+            DataFrame (cf. EnergySystemModel.getTimeSeriesDataForAggregation)
+            |br| * the default value is None
+        :type tsaInputMatrix: utilsTSA.TSAInputMatrix or None
+
         """
-        weightDict, data = {}, []
+        weightDict, data = {}, ([] if tsaInputMatrix is None else tsaInputMatrix)
         tsa_input = [
             (
                 self.fullChargeOpRateFix,
@@ -513,7 +518,7 @@ class Storage(Component):
             weightDict, data = self.prepareTSAInput(
                 self.fullStateOfChargeMax, "stateOfChargeMax_", combinedTsaWeight, weightDict, data, ip
             )
-        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
+        return self.getTSAInput(data, weightDict)
 
     def setAggregatedTimeSeriesData(self, data, ip):
         """
@@ -615,7 +620,14 @@ class StorageModel(ComponentModel):
         self.declareLocationComponentSet(pyM)
 
         # Declare operation variable set
-        self.declareOpVarSet(esM, pyM)
+        self.declareOpVarSet(
+            esM,
+            pyM,
+            (
+                ("processedChargeOpRateFix", "processedChargeOpRateMax"),
+                ("processedDischargeOpRateFix", "processedDischargeOpRateMax"),
+            ),
+        )
 
         if pyM.hasTSA:
             varSet = getattr(pyM, "operationVarSet_" + self.abbrvName)
@@ -904,7 +916,7 @@ class StorageModel(ComponentModel):
                     SOC[loc, compName, ip, p, t + 1]
                     - SOC[loc, compName, ip, p, t]
                     * (1 - compDict[compName].selfDischarge)
-                    ** esM.hoursPerSegment[ip].to_dict()[p, t]
+                    ** pyM.hoursPerSegment[ip][p, t]
                     == chargeOp[loc, compName, ip, p, t]
                     * compDict[compName].chargeEfficiency
                     - dischargeOp[loc, compName, ip, p, t]
@@ -1401,7 +1413,7 @@ class StorageModel(ComponentModel):
                         * (
                             (1 - compDict[compName].selfDischarge)
                             ** (
-                                esM.segmentStartTime[ip].to_dict()[
+                                pyM.segmentStartTime[ip][
                                     esM.periodsOrder[ip][pInter], t
                                 ]
                                 * esM.hoursPerTimeStep
@@ -1466,7 +1478,7 @@ class StorageModel(ComponentModel):
                         * (
                             (1 - compDict[compName].selfDischarge)
                             ** (
-                                esM.segmentStartTime[ip].to_dict()[
+                                pyM.segmentStartTime[ip][
                                     esM.periodsOrder[ip][pInter], t
                                 ]
                                 * esM.hoursPerTimeStep
@@ -1492,7 +1504,7 @@ class StorageModel(ComponentModel):
                     * (
                         (1 - compDict[compName].selfDischarge)
                         ** (
-                            esM.segmentStartTime[ip].to_dict()[
+                            pyM.segmentStartTime[ip][
                                 esM.periodsOrder[ip][pInter], t
                             ]
                             * esM.hoursPerTimeStep
@@ -1697,13 +1709,22 @@ class StorageModel(ComponentModel):
         :param commod: Name of the regarded commodity (commodities are defined in the EnergySystemModel instance)
         :param commod: string
         """
-        return any(
-            [
-                comp.commodity == commod
-                and comp.processedLocationalEligibility[loc] == 1
-                for comp in self.componentsDict.values()
-            ]
-        )
+        return commod in self.getLocationCommodityIncidence(esM).get(loc, ())
+
+    def buildLocationCommodityIncidence(self, esM):
+        """
+        Build a dictionary which maps each location to the set of commodities for which operation variables exist
+        in the modeling class (see ComponentModel.getLocationCommodityIncidence).
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+        """
+        incidence = {loc: set() for loc in esM.locations}
+        for comp in self.componentsDict.values():
+            for loc in comp.processedLocationalEligibility.index:
+                if comp.processedLocationalEligibility[loc] == 1:
+                    incidence.setdefault(loc, set()).add(comp.commodity)
+        return incidence
 
     def getCommodityBalanceContribution(self, pyM, commod, loc, ip, p, t):
         """Get contribution to a commodity balance.
@@ -1725,6 +1746,30 @@ class StorageModel(ComponentModel):
             if commod == self.componentsDict[compName].commodity
         )
 
+    def getCommodityBalanceContributionIndex(self, esM, pyM):
+        """
+        Get the contributions to the commodity balances as a precomputed index
+        (see ComponentModel.getCommodityBalanceContributionIndex).
+        """
+        abbrvName = self.abbrvName
+        chargeOp, dischargeOp = (
+            getattr(pyM, "chargeOp_" + abbrvName),
+            getattr(pyM, "dischargeOp_" + abbrvName),
+        )
+        opVarDict = getattr(pyM, "operationVarDict_" + abbrvName)
+        balanceIndex = {}
+        for ip, locDict in opVarDict.items():
+            for loc, compNames in locDict.items():
+                for compName in compNames:
+                    commod = self.componentsDict[compName].commodity
+                    balanceIndex.setdefault((loc, commod, ip), []).extend(
+                        [
+                            (dischargeOp, (loc, compName, ip), 1),
+                            (chargeOp, (loc, compName, ip), -1),
+                        ]
+                    )
+        return balanceIndex
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
@@ -1875,6 +1920,28 @@ class StorageModel(ComponentModel):
             getOptValueCostType="NPV",
         )
 
+        # Read the optimal values of the operation variables once and format them for all investment periods
+        chargeOptVals, dischargeOptVals = [
+            utils.formatOptimizationOutputPerPeriod(
+                utils.getOptimalVariableValues(var),
+                "operationVariables",
+                "1dim",
+                esM.investmentPeriods,
+                esM.periodsOrder,
+                esM=esM,
+            )
+            for var in (chargeOp, dischargeOp)
+        ]
+        if not pyM.hasTSA:
+            SOCOptVals = utils.formatOptimizationOutputPerPeriod(
+                utils.getOptimalVariableValues(SOC),
+                "operationVariables",
+                "1dim",
+                esM.investmentPeriods,
+                esM.periodsOrder,
+                esM=esM,
+            )
+
         for ip in esM.investmentPeriods:
             # Set optimal operation variables and append optimization summary
             props = [
@@ -1938,14 +2005,7 @@ class StorageModel(ComponentModel):
             ).sort_index()
 
             # * charge variables and contributions
-            optVal_charge = utils.formatOptimizationOutput(
-                chargeOp.get_values(),
-                "operationVariables",
-                "1dim",
-                ip,
-                esM.periodsOrder[ip],
-                esM=esM,
-            )
+            optVal_charge = chargeOptVals[ip]
             self._chargeOperationVariablesOptimum[esM.investmentPeriodNames[ip]] = (
                 optVal_charge
             )
@@ -2003,14 +2063,7 @@ class StorageModel(ComponentModel):
                 ] = npv_oxCharge.values
 
             # * discharge variables and contributions
-            optVal_discharge = utils.formatOptimizationOutput(
-                dischargeOp.get_values(),
-                "operationVariables",
-                "1dim",
-                ip,
-                esM.periodsOrder[ip],
-                esM=esM,
-            )
+            optVal_discharge = dischargeOptVals[ip]
             self._dischargeOperationVariablesOptimum[esM.investmentPeriodNames[ip]] = (
                 optVal_discharge
             )
@@ -2079,14 +2132,7 @@ class StorageModel(ComponentModel):
 
             # * set state of charge variables
             if not pyM.hasTSA:
-                optVal = utils.formatOptimizationOutput(
-                    SOC.get_values(),
-                    "operationVariables",
-                    "1dim",
-                    ip,
-                    esM.periodsOrder[ip],
-                    esM=esM,
-                )
+                optVal = SOCOptVals[ip]
                 # Remove the last column (by applying the cycle constraint, the first and the last columns are equal to each
                 # other)
                 optVal = optVal.loc[:, : len(optVal.columns) - 2]
@@ -447,7 +447,7 @@ class ConversionDynamicModel(ConversionModel):
                         opVar[loc, compName, ip, p, t]
                         - opVar[loc, compName, ip, p, numberOfTimeSteps - 1]
                         <= rampRateMax
-                        * esM.timeStepsPerSegment.to_dict()[ip, p, t]
+                        * pyM.timeStepsPerSegment[ip][p, t]
                         * capVar[loc, compName, ip]
                     )
 
@@ -503,7 +503,7 @@ class ConversionDynamicModel(ConversionModel):
                         opVar[loc, compName, ip, p, numberOfTimeSteps - 1]
                         - opVar[loc, compName, ip, p, t]
                         <= rampRateMax
-                        * esM.timeStepsPerSegment.to_dict()[ip, p, t]
+                        * pyM.timeStepsPerSegment[ip][p, t]
                         * capVar[loc, compName, ip]
                     )
 
@@ -647,28 +647,15 @@ class ConversionPartLoadModel(ConversionModel):
                         ]
                         for discretStep in range(compDict[compName].nSegments)
                     )
-                    == esM.hoursPerSegment.to_dict()[p, t] * capVar[loc, compName, ip]
+                    == pyM.hoursPerSegment[ip][p, t] * capVar[loc, compName, ip]
                 )
 
             setattr(
                 pyM,
                 "ConstrSegmentCapacity_" + abbrvName,
-                pyomo.Constraint(opVarSet, pyM.timeSet, rule=segmentCapacityConstraint),
-            )
-
-            def segmentCapacityConstraint(pyM, loc, compName, p, t):
-                return (
-                    sum(
-                        discretizationSegmentConVar[loc, compName, discretStep, p, t]
-                        for discretStep in range(compDict[compName].nSegments)
-                    )
-                    == esM.hoursPerSegment.to_dict()[p, t] * capVar[loc, compName, ip]
-                )
-
-            setattr(
-                pyM,
-                "ConstrSegmentCapacity_" + abbrvName,
-                pyomo.Constraint(opVarSet, pyM.timeSet, rule=segmentCapacityConstraint),
+                pyomo.Constraint(
+                    opVarSet, pyM.intraYearTimeSet, rule=segmentCapacityConstraint
+                ),
             )
 
     def pointCapacityConstraint(self, pyM, esM):
@@ -714,13 +701,15 @@ class ConversionPartLoadModel(ConversionModel):
                         discretizationPointConVar[loc, compName, discretStep, ip, p, t]
                         for discretStep in range(nPoints)
                     )
-                    == esM.hoursPerSegment.to_dict()[p, t] * capVar[loc, compName, ip]
+                    == pyM.hoursPerSegment[ip][p, t] * capVar[loc, compName, ip]
                 )
 
             setattr(
                 pyM,
                 "ConstrPointCapacity_" + abbrvName,
-                pyomo.Constraint(opVarSet, pyM.timeSet, rule=pointCapacityConstraint),
+                pyomo.Constraint(
+                    opVarSet, pyM.intraYearTimeSet, rule=pointCapacityConstraint
+                ),
             )
 
     def pointSOS2(self, pyM):
@@ -875,6 +864,13 @@ class ConversionPartLoadModel(ConversionModel):
             if commod in compDict[compName].discretizedPartLoad
         )
 
+    def getCommodityBalanceContributionIndex(self, esM, pyM):
+        """
+        The contributions of the ConversionPartLoad components are obtained per constraint index with
+        getCommodityBalanceContribution.
+        """
+        return None
+
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
         Get contribution to the objective function.
@@ -176,8 +176,8 @@ class LOPFModel(TransmissionModel):
         self.declarePathwaySets(pyM, esM)
         self.declareLocationComponentSet(pyM)
 
-        # Declare operation variable sets
-        self.declareOpVarSet(esM, pyM)
+        # Declare operation variable sets (the operation is not eliminated since it determines the phase angles)
+        self.declareOpVarSet(esM, pyM, rateNames=())
         self.initPhaseAngleVarSet(pyM)
 
         # Declare operation variable set
@@ -448,13 +448,18 @@ class Transmission(Component):
             self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix
         )
 
-    def getDataForTimeSeriesAggregation(self, ip):
+    def getDataForTimeSeriesAggregation(self, ip, tsaInputMatrix=None):
         """Function for getting the required data if a time series aggregation is requested.
 
         :param ip: investment period of transformation path analysis.
         :type ip: int
+
+        :param tsaInputMatrix: column registry in which the time series data is registered instead of returning a
+            DataFrame (cf. EnergySystemModel.getTimeSeriesDataForAggregation)
+            |br| * the default value is None
+        :type tsaInputMatrix: utilsTSA.TSAInputMatrix or None
         """
-        weightDict, data = {}, []
+        weightDict, data = {}, ([] if tsaInputMatrix is None else tsaInputMatrix)
         if self.fullOperationRateFix:
             weightDict, data = self.prepareTSAInput(
                 self.fullOperationRateFix,
@@ -473,7 +478,7 @@ class Transmission(Component):
                 data,
                 ip,
             )
-        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
+        return self.getTSAInput(data, weightDict)
 
     def setAggregatedTimeSeriesData(self, data, ip):
         """
@@ -667,7 +672,7 @@ class TransmissionModel(ComponentModel):
                     opVar[loc, compName, ip, p, t]
                     + opVar[compDict[compName]._mapI[loc], compName, ip, p, t]
                     <= capVar[loc, compName, ip]
-                    * esM.hoursPerSegment[ip].to_dict()[p, t]
+                    * pyM.hoursPerSegment[ip][p, t]
                 )
 
             setattr(
@@ -749,18 +754,23 @@ class TransmissionModel(ComponentModel):
         :param commod: Name of the regarded commodity (commodities are defined in the EnergySystemModel instance)
         :param commod: string
         """
+        return commod in self.getLocationCommodityIncidence(esM).get(loc, ())
 
-        return any(
-            [
-                comp.commodity == commod
-                and (
-                    loc + "_" + loc_ in comp.processedLocationalEligibility.index
-                    or loc_ + "_" + loc in comp.processedLocationalEligibility.index
-                )
-                for comp in self.componentsDict.values()
-                for loc_ in esM.locations
-            ]
-        )
+    def buildLocationCommodityIncidence(self, esM):
+        """
+        Build a dictionary which maps each location to the set of commodities which can be transferred from or to
+        the location (see ComponentModel.getLocationCommodityIncidence).
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+        """
+        incidence = {loc: set() for loc in esM.locations}
+        for comp in self.componentsDict.values():
+            # Both locations of each eligible connection can transfer the commodity
+            for connection in comp.processedLocationalEligibility.index:
+                for loc in comp._mapC[connection]:
+                    incidence[loc].add(comp.commodity)
+        return incidence
 
     def getCommodityBalanceContribution(self, pyM, commod, loc, ip, p, t):
         """ Get contribution to a commodity balance. 
@@ -797,6 +807,40 @@ class TransmissionModel(ComponentModel):
             if commod == compDict[compName].commodity
         )
 
+    def getCommodityBalanceContributionIndex(self, esM, pyM):
+        """
+        Get the contributions to the commodity balances as a precomputed index
+        (see ComponentModel.getCommodityBalanceContributionIndex).
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar, opVarDictIn = (
+            getattr(pyM, "op_" + abbrvName),
+            getattr(pyM, "operationVarDictIn_" + abbrvName),
+        )
+        opVarDictOut = getattr(pyM, "operationVarDictOut_" + abbrvName)
+        balanceIndex = {}
+        for ip in opVarDictIn.keys():
+            for loc in opVarDictIn[ip].keys():
+                for loc_, compNames in opVarDictIn[ip][loc].items():
+                    for compName in compNames:
+                        comp = compDict[compName]
+                        balanceIndex.setdefault((loc, comp.commodity, ip), []).append(
+                            (
+                                opVar,
+                                (loc_ + "_" + loc, compName, ip),
+                                1
+                                - comp.losses[loc_ + "_" + loc]
+                                * comp.distances[loc_ + "_" + loc],
+                            )
+                        )
+                for loc_, compNames in opVarDictOut[ip][loc].items():
+                    for compName in compNames:
+                        comp = compDict[compName]
+                        balanceIndex.setdefault((loc, comp.commodity, ip), []).append(
+                            (opVar, (loc + "_" + loc_, compName, ip), -1)
+                        )
+        return balanceIndex
+
     def getBalanceLimitContribution(
         self, esM, pyM, ID, ip, loc, timeSeriesAggregation, componentNames
     ):
@@ -967,6 +1011,25 @@ class TransmissionModel(ComponentModel):
             getOptValue=True,
             getOptValueCostType="NPV",
         )
+        opValues = utils.getOptimalVariableValues(opVar)
+        opOptVals = utils.formatOptimizationOutputPerPeriod(
+            opValues,
+            "operationVariables",
+            "1dim",
+            esM.investmentPeriods,
+            esM.periodsOrder,
+            esM=esM,
+        )
+        opOptVals_ = utils.formatOptimizationOutputPerPeriod(
+            opValues,
+            "operationVariables",
+            "2dim",
+            esM.investmentPeriods,
+            esM.periodsOrder,
+            compDict=compDict,
+            esM=esM,
+        )
+
         for ip in esM.investmentPeriods:
             for compName, comp in compDict.items():
                 for cost in [
@@ -985,23 +1048,8 @@ class TransmissionModel(ComponentModel):
                     ] = (data).values
 
             # Set optimal operation variables and append optimization summary
-            optVal = utils.formatOptimizationOutput(
-                opVar.get_values(),
-                "operationVariables",
-                "1dim",
-                ip,
-                esM.periodsOrder[ip],
-                esM=esM,
-            )
-            optVal_ = utils.formatOptimizationOutput(
-                opVar.get_values(),
-                "operationVariables",
-                "2dim",
-                ip,
-                esM.periodsOrder[ip],
-                compDict=compDict,
-                esM=esM,
-            )
+            optVal = opOptVals[ip]
+            optVal_ = opOptVals_[ip]
             self._operationVariablesOptimum[esM.investmentPeriodNames[ip]] = optVal_
 
             props = ["operation", "opexOp", "NPV_opexOp"]
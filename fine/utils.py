@@ -3,6 +3,7 @@ import warnings
 
 import numpy as np
 import pandas as pd
+import pyomo.environ as pyomo
 
 import fine as fn
 
@@ -1802,7 +1803,131 @@ def setFormattedTimeSeries(timeSeries):
         return data.set_index(["Period", "TimeStep"])
 
 
+def getFullTimeSeriesIndex(periodsOrder, ip, numberOfColumns, esM=None):
+    """
+    Get the index map which assigns each time step of the full time series to a typical period and to a column
+    (time step or segment) of the data of that typical period. The index map is cached in the
+    EnergySystemModel instance per investment period and periods order.
+
+    :param periodsOrder: order of the typical periods which represent the full time series
+    :type periodsOrder: list or numpy array
+
+    :param ip: investment period
+    :type ip: int
+
+    :param numberOfColumns: number of time steps (or segments) per typical period
+    :type numberOfColumns: int
+
+    :param esM: EnergySystemModel instance (required if segmentation is used).
+        |br| * the default value is None
+    :type esM: EnergySystemModel instance
+
+    :return: typical period and column of each full time step and, if segmentation is used, the number of time
+        steps represented by the corresponding segment (else None)
+    :rtype: tuple of numpy arrays
+    """
+    segmentation = esM is not None and esM.segmentation
+    cache = getattr(esM, "_fullTimeSeriesIndex", None)
+    key = (ip, segmentation, numberOfColumns, tuple(np.asarray(periodsOrder).tolist()))
+    if cache is not None and key in cache:
+        return cache[key]
+
+    periodsOrder = np.asarray(periodsOrder)
+    if segmentation:
+        # Repeat each segment in each period as often as time steps are represented by the corresponding segment
+        timeStepsPerSegment = esM.timeStepsPerSegment[ip]
+        segmentsOfPeriod, lengthsOfPeriod = {}, {}
+        for p in np.unique(periodsOrder):
+            repList = np.asarray(timeStepsPerSegment.loc[p].values, dtype=int)
+            segmentsOfPeriod[p] = np.repeat(np.arange(len(repList)), repList)
+            lengthsOfPeriod[p] = np.repeat(repList, repList)
+        periodOfStep = np.concatenate(
+            [np.full(len(segmentsOfPeriod[p]), p) for p in periodsOrder]
+        )
+        columnOfStep = np.concatenate([segmentsOfPeriod[p] for p in periodsOrder])
+        segmentLengthOfStep = np.concatenate(
+            [lengthsOfPeriod[p] for p in periodsOrder]
+        )
+    else:
+        periodOfStep = np.repeat(periodsOrder, numberOfColumns)
+        columnOfStep = np.tile(np.arange(numberOfColumns), len(periodsOrder))
+        segmentLengthOfStep = None
+
+    index = (periodOfStep, columnOfStep, segmentLengthOfStep)
+    if cache is not None:
+        cache[key] = index
+    return index
+
+
 def buildFullTimeSeries(df, periodsOrder, ip, axis=1, esM=None, divide=True):
+    """
+    Reconstruct the full time series from time series data per typical period. The data of all typical periods is
+    arranged side by side and the full time series is taken from it with one index map (cf.
+    getFullTimeSeriesIndex).
+
+    :param df: data with the typical periods as first index level and the time steps (or segments) per typical
+        period as columns
+    :type df: pandas DataFrame
+
+    :param periodsOrder: order of the typical periods which represent the full time series
+    :type periodsOrder: list or numpy array
+
+    :param ip: investment period
+    :type ip: int
+
+    **Default arguments:**
+
+    :param axis: axis along which the periods are concatenated.
+        |br| * the default value is 1
+    :type axis: int
+
+    :param esM: EnergySystemModel instance (required if segmentation is used).
+        |br| * the default value is None
+    :type esM: EnergySystemModel instance
+
+    :param divide: states if the values of a segment are divided by the number of time steps represented by the
+        segment (e.g. energy per segment to energy per time step) or not (e.g. time-independent costs).
+        |br| * the default value is True
+    :type divide: boolean
+
+    :return: full time series with the remaining index levels as index and the full time steps as columns
+    :rtype: pandas DataFrame
+    """
+    # The data of all typical periods has to share the same rows (in the same order)
+    if axis != 1 or df.index.nlevels < 2 or len(df) == 0:
+        return buildFullTimeSeriesByConcat(df, periodsOrder, ip, axis, esM, divide)
+    periods = df.index.get_level_values(0)
+    uniquePeriods = periods.unique()
+    numberOfRows = len(df) // len(uniquePeriods)
+    rows = df.index.droplevel(0)
+    rowCodes, _ = rows.factorize()
+    if len(df) != numberOfRows * len(uniquePeriods) or not (
+        np.array_equal(periods.values, np.repeat(uniquePeriods.values, numberOfRows))
+        and np.array_equal(rowCodes, np.tile(np.arange(numberOfRows), len(uniquePeriods)))
+    ):
+        return buildFullTimeSeriesByConcat(df, periodsOrder, ip, axis, esM, divide)
+
+    periodOfStep, columnOfStep, segmentLengthOfStep = getFullTimeSeriesIndex(
+        periodsOrder, ip, df.shape[1], esM
+    )
+    # Arrange the data of the typical periods side by side: rows x (typical period, column)
+    values = df.values.reshape(len(uniquePeriods), numberOfRows, df.shape[1])
+    values = values.transpose(1, 0, 2).reshape(numberOfRows, -1)
+    periodPosition = uniquePeriods.get_indexer(periodOfStep)
+    if (periodPosition < 0).any():
+        raise KeyError("The periods order contains periods which are not in the data.")
+    data = np.take(values, periodPosition * df.shape[1] + columnOfStep, axis=1)
+    if segmentLengthOfStep is not None and divide:
+        data = data / segmentLengthOfStep
+    return pd.DataFrame(data, index=rows[:numberOfRows], copy=False)
+
+
+def buildFullTimeSeriesByConcat(df, periodsOrder, ip, axis=1, esM=None, divide=True):
+    """
+    Reconstruct the full time series from time series data per typical period by concatenating the data of the
+    periods (cf. buildFullTimeSeries). This implementation is used if the data cannot be reconstructed with an
+    index map (e.g. if axis is 0 or the typical periods do not share the same rows).
+    """
     # If segmentation is chosen, the segments of each period need to be unravelled to the original number of
     # time steps first
     if esM is not None and esM.segmentation:
@@ -1840,17 +1965,192 @@ def buildFullTimeSeries(df, periodsOrder, ip, axis=1, esM=None, divide=True):
     return pd.concat(data, axis=axis, ignore_index=True)
 
 
+def getOptimalVariableValues(var):
+    """
+    Read the values of a pyomo variable once and return them together with their indices. The values can be
+    formatted for all investment periods at once with formatOptimizationOutputPerPeriod.
+
+    :param var: pyomo variable (e.g. pyM.op_srcSnk) or dictionary with its values (e.g. var.get_values())
+    :type var: pyomo Var or dict
+
+    :return: DataFrame with one column per index level of the variable and array of the corresponding values or
+        None if no variables were declared
+    :rtype: tuple (pandas DataFrame, numpy array) or None
+    """
+    if isinstance(var, dict):
+        keys, values = list(var.keys()), list(var.values())
+    else:
+        keys, values = list(var.keys()), [v.value for v in var.values()]
+    if not keys:
+        return None
+    return pd.DataFrame.from_records(keys), np.array(values, dtype=float)
+
+
+def getVariableValueArrays(pyM):
+    """
+    Read the values of all variables of a pyomo ConcreteModel into numpy arrays, e.g. to store the raw optimal
+    values of a solve without post-processing them.
+
+    :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+    :type pyM: pyomo ConcreteModel
+
+    :return: dictionary with the names of the variables as keys and arrays of their values (in the order of the
+        variable indices, NaN if a value is not set) as values
+    :rtype: dict
+    """
+    return {
+        var.name: np.array([v.value for v in var.values()], dtype=float)
+        for var in pyM.component_objects(pyomo.Var, descend_into=True)
+    }
+
+
+def setVariableValueArrays(pyM, values):
+    """
+    Write variable values which were read with getVariableValueArrays back into a pyomo ConcreteModel.
+
+    :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+    :type pyM: pyomo ConcreteModel
+
+    :param values: dictionary with the names of the variables as keys and arrays of their values as values
+    :type values: dict
+    """
+    for name, array in values.items():
+        var = pyM.find_component(name)
+        if var is None:
+            continue
+        for v, value in zip(var.values(), array.tolist()):
+            v.set_value(None if math.isnan(value) else value, skip_validation=True)
+
+
+def formatOptimizationOutputPerPeriod(
+    data,
+    varType,
+    dimension,
+    investmentPeriods,
+    periodsOrder=None,
+    compDict=None,
+    esM=None,
+):
+    """
+    Format the optimization output of a variable for several investment periods in one pass. The values are
+    scattered with integer index arrays into one array which is then sliced per investment period.
+
+    **Required arguments:**
+
+    :param data: Optimized values and their indices (cf. getOptimalVariableValues) or None.
+    :type data: tuple (pandas DataFrame, numpy array) or None
+
+    :param varType: Define which type of variables are formatted. Options:
+        * 'designVariables',
+        * 'operationVariables'.
+    :type varType: string
+
+    :param dimension: Define the dimension of the data. Options:
+        * '1dim',
+        * '2dim'.
+    :type dimension: string
+
+    :param investmentPeriods: investment periods for which the output is formatted.
+    :type investmentPeriods: list of int
+
+    **Default arguments:**
+
+    :param periodsOrder: order of the periods of the time series data per investment period (e.g.
+        esM.periodsOrder). The periodsOrder must be given if the varType is operationVariables.
+        |br| * the default value is None.
+    :type periodsOrder: dict
+
+    :param compDict: Dictionary of the component instances of interest.
+        compDict is required if dimension is set to 2.
+        |br| * the default value is None.
+    :type compDict: dict
+
+    :param esM: EnergySystemModel instance representing the energy system in which the components are modeled.
+        |br| * the default value is None
+    :type esM: EnergySystemModel instance
+
+    :return: formatted data per investment period (cf. formatOptimizationOutput). If no variables were declared,
+        the values are None.
+    :rtype: dict
+    """
+    if data is None:
+        return {ip: None for ip in investmentPeriods}
+    if varType not in ["designVariables", "operationVariables"] or dimension not in [
+        "1dim",
+        "2dim",
+    ]:
+        raise ValueError(
+            "The varType parameter has to be either 'designVariables' or 'operationVariables'\n"
+            + "and the dimension parameter has to be either '1dim' or '2dim'."
+        )
+    index, values = data
+
+    # The variables are indexed by (loc, comp, ip) or (loc, comp, ip, p, t)
+    loc, comp, ipLevel = index[0].values, index[1].values, index[2].values
+    if dimension == "2dim":
+        # Map the connections to the connected locations
+        pairCodes, pairs = pd.MultiIndex.from_arrays([comp, loc]).factorize()
+        loc1 = np.array([compDict[c]._mapC[l][0] for c, l in pairs], dtype=object)
+        loc2 = np.array([compDict[c]._mapC[l][1] for c, l in pairs], dtype=object)
+        locLevels = [loc1[pairCodes]]
+        columns = loc2[pairCodes]
+    else:
+        locLevels = []
+        columns = loc
+
+    if varType == "designVariables":
+        # Rows: components (and start locations), columns: (end) locations
+        rowLevels = [ipLevel, comp] + locLevels
+    else:
+        # Rows: periods, components and locations, columns: time steps
+        rowLevels = [ipLevel, index[3].values, comp] + locLevels
+        if dimension == "2dim":
+            rowLevels.append(columns)
+        else:
+            rowLevels.append(loc)
+        columns = index[4].values
+
+    rowCodes, rowLabels = pd.MultiIndex.from_arrays(rowLevels).factorize(sort=True)
+    colCodes, colLabels = pd.factorize(columns, sort=True)
+    array = np.full((len(rowLabels), len(colLabels)), np.nan)
+    array[rowCodes, colCodes] = values
+
+    # Rows are sorted by the investment period first, i.e. each investment period is a contiguous block
+    ipOfRow = rowLabels.get_level_values(0)
+    ipOfValue = ipOfRow.values[rowCodes]
+    results = {}
+    for ip in investmentPeriods:
+        rows = np.flatnonzero(ipOfRow == ip)
+        if len(rows) == 0:
+            results[ip] = None
+            continue
+        usedCols = np.zeros(len(colLabels), dtype=bool)
+        usedCols[colCodes[ipOfValue == ip]] = True
+        df = pd.DataFrame(
+            array[rows[0] : rows[-1] + 1][:, usedCols],
+            index=rowLabels[rows[0] : rows[-1] + 1].droplevel(0),
+            columns=colLabels[usedCols],
+        )
+        df.index.names = [None] * df.index.nlevels
+        if varType == "operationVariables":
+            df = buildFullTimeSeries(df, periodsOrder[ip], ip, esM=esM)
+        results[ip] = df
+    return results
+
+
 def formatOptimizationOutput(
     data, varType, dimension, ip, periodsOrder=None, compDict=None, esM=None
 ):
     """
     Functionality for formatting the optimization output. The function is used in the
-    setOptimalValues()-method of the ComponentModel class.
+    setOptimalValues()-method of the ComponentModel class. If the output is required for several investment
+    periods, use formatOptimizationOutputPerPeriod instead.
 
     **Required arguments:**
 
-    :param data: Optimized values that should be formatted given as dictionary with the keys (component, location).
-    :type data: dict
+    :param data: Optimized values that should be formatted given as dictionary with the keys (component, location)
+        or as tuple of indices and values (cf. getOptimalVariableValues).
+    :type data: dict or tuple
 
     :param varType: Define which type of variables are formatted. Options:
         * 'designVariables',
@@ -1889,97 +2189,17 @@ def formatOptimizationOutput(
     :return: formatted version of data. If data is an empty dictionary, it returns None.
     :rtype: pandas DataFrame
     """
-    # If data is an empty dictionary (because no variables of that type were declared) return None
-    if not data:
-        return None
-    # If the dictionary is not empty, format it into a DataFrame
-    if varType == "designVariables" and dimension == "1dim":
-        # Convert dictionary to DataFrame, transpose, put the components name first and sort the index
-        # Results in a one dimensional DataFrame
-        df = pd.DataFrame(data, index=[0]).T.swaplevel(i=0, j=1, axis=0).sort_index()
-        df = df[df.index.get_level_values(2) == ip]
-        df = df.reset_index(level=2, drop=True)
-        # Unstack the regions (convert to a two dimensional DataFrame with the region indices being the columns)
-        # and fill NaN values (i.e. when a component variable was not initiated for that region)
-
-        df = df.unstack(level=-1)
-        # Get rid of the unnecessary 0 level
-        df.columns = df.columns.droplevel()
-        return df
-    elif varType == "designVariables" and dimension == "2dim":
-        # Convert dictionary to DataFrame, transpose, put the components name first while keeping the order of the
-        # regions and sort the index
-        # Results in a one dimensional DataFrame
-        df = pd.DataFrame(data, index=[0]).T
-        df = df[df.index.get_level_values(2) == ip]
-        df = df.reset_index(level=2, drop=True)
-        indexNew = []
-        for tup in df.index.tolist():
-            loc1, loc2 = compDict[tup[1]]._mapC[tup[0]]
-            indexNew.append((loc1, loc2, tup[1]))
-        df.index = pd.MultiIndex.from_tuples(indexNew)
-        df = df.swaplevel(i=0, j=2, axis=0).swaplevel(i=1, j=2, axis=0).sort_index()
-        # Unstack the regions (convert to a two dimensional DataFrame with the region indices being the columns)
-        # and fill NaN values (i.e. when a component variable was not initiated for that region)
-        df = df.unstack(level=-1)
-        # Get rid of the unnecessary 0 level
-        df.columns = df.columns.droplevel()
-        return df
-    elif varType == "operationVariables" and dimension == "1dim":
-        # Convert dictionary to DataFrame, transpose, put the period column first and sort the index
-
-        # Results in a one dimensional DataFrame
-        df = (
-            pd.DataFrame(data, index=[0]).T.swaplevel(i=0, j=-2).sort_index()
-        )  # swap location with periods --> periods is first column
-        # Unstack the time steps (convert to a two dimensional DataFrame with the time indices being the columns)
-        df = df.unstack(level=-1)
-        # Get rid of the unnecessary 0 level
-        df.columns = df.columns.droplevel()
-        # Re-engineer full time series by using Pandas' concat method (only one loop if time series aggregation was not
-        # used)
-        # filter results for ip
-        df = df[df.index.get_level_values(2) == ip]
-        # drop ip from index
-        df.reset_index(level=2, drop=True, inplace=True)
-        return buildFullTimeSeries(df, periodsOrder, ip, esM=esM)
-    elif varType == "operationVariables" and dimension == "2dim":
-        # Convert dictionary to DataFrame, transpose, put the period column first while keeping the order of the
-        # regions and sort the index
-        # Results in a one dimensional DataFrame
-        df = pd.DataFrame(data, index=[0]).T
-        indexNew = []
-        for tup in df.index.tolist():
-            loc1, loc2 = compDict[tup[1]]._mapC[tup[0]]
-            indexNew.append((loc1, loc2, tup[1], tup[2], tup[3], tup[4]))
-            # indexNew.append((loc1, loc2, tup[1], tup[2], tup[3]))
-        df.index = pd.MultiIndex.from_tuples(indexNew)
-
-        # Select rows where ip is equal to investigated ip
-        df = df.iloc[df.index.get_level_values(3) == ip]
-        # Delete ip from multiindex
-        df = df.droplevel(3, axis=0)
-
-        df = (
-            df.swaplevel(i=1, j=2, axis=0)
-            .swaplevel(i=0, j=3, axis=0)
-            .swaplevel(i=2, j=3, axis=0)
-            .sort_index()
-        )
-        # Unstack the time steps (convert to a two dimensional DataFrame with the time indices being the columns)
-        df = df.unstack(level=-1)
-
-        # Get rid of the unnecessary 0 level
-        df.columns = df.columns.droplevel()
-
-        # Re-engineer full time series by using Pandas' concat method (only one loop if time series aggregation was not
-        # used)
-        return buildFullTimeSeries(df, periodsOrder, ip, esM=esM)
-    else:
-        raise ValueError(
-            "The varType parameter has to be either 'designVariables' or 'operationVariables'\n"
-            + "and the dimension parameter has to be either '1dim' or '2dim'."
-        )
+    if isinstance(data, dict):
+        data = getOptimalVariableValues(data)
+    return formatOptimizationOutputPerPeriod(
+        data,
+        varType,
+        dimension,
+        [ip],
+        periodsOrder={ip: periodsOrder},
+        compDict=compDict,
+        esM=esM,
+    )[ip]
 
 
 def setOptimalComponentVariables(optVal, varType, compDict):
@@ -0,0 +1,105 @@
+"""
+Helper functions for the standard form of a declared optimization problem of the EnergySystemModel.
+
+The declared pyomo ConcreteModel is compiled into sparse coefficient matrices
+(min c^T x s.t. A_ub x <= b_ub, A_eq x == b_eq, lb <= x <= ub) which are used by the Benders decomposition
+(cf. fine.expansionModules.bendersDecomposition) to split the optimization problem into its blocks. The columns
+and rows refer to the pyomo variables and constraints, so that values can be written back to the model.
+"""
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from pyomo.repn.plugins.standard_form import LinearStandardFormCompiler
+
+from fine import utils
+
+
+class MatrixModel(object):
+    """
+    Sparse standard form representation of a declared pyomo ConcreteModel.
+    """
+
+    def __init__(self, pyM):
+        """
+        Assemble the sparse coefficient matrices of the (linear) model pyM.
+
+        :param pyM: pyomo ConcreteModel with exactly one active objective.
+        :type pyM: pyomo ConcreteModel
+        """
+        try:
+            repn = LinearStandardFormCompiler().write(pyM, mixed_form=True)
+        except ValueError as e:
+            raise ValueError(
+                "The standard form can only be compiled for linear models "
+                "(quadratic objective contributions are not supported): " + str(e)
+            )
+
+        self.columns = repn.columns
+        self.c = np.asarray(repn.c.todense()).ravel()
+        self.cOffset = float(repn.c_offset[0]) if len(repn.c_offset) else 0.0
+
+        # Split the mixed form rows into equality and less-or-equal rows. Rows with a lower bound (bound type -1)
+        # are multiplied with -1 so that all inequalities share the same sense.
+        A = sp.csr_array(repn.A)
+        boundTypes = np.array([row.bound_type for row in repn.rows], dtype=int)
+        rhs = np.asarray(repn.rhs, dtype=float)
+        self.constraints = [row.constraint for row in repn.rows]
+        self.eqRows = np.flatnonzero(boundTypes == 0)
+        self.ubRows = np.flatnonzero(boundTypes != 0)
+        self.ubSigns = np.where(boundTypes[self.ubRows] == -1, -1.0, 1.0)
+
+        self.A_eq, self.b_eq = A[self.eqRows], rhs[self.eqRows]
+        self.A_ub = sp.diags(self.ubSigns) @ A[self.ubRows]
+        self.b_ub = self.ubSigns * rhs[self.ubRows]
+
+        self.lb = np.array(
+            [-np.inf if v.lb is None else v.lb for v in self.columns], dtype=float
+        )
+        self.ub = np.array(
+            [np.inf if v.ub is None else v.ub for v in self.columns], dtype=float
+        )
+        self.integrality = np.array(
+            [1 if v.is_integer() or v.is_binary() else 0 for v in self.columns],
+            dtype=int,
+        )
+
+    @property
+    def isMIP(self):
+        return bool(self.integrality.any())
+
+    @property
+    def numberOfNonzeros(self):
+        return self.A_eq.nnz + self.A_ub.nnz
+
+    def setPrimalValues(self, x):
+        for var, val in zip(self.columns, x):
+            var.set_value(float(val), skip_validation=True)
+
+
+def buildMatrixModel(esM):
+    """
+    Assemble the sparse standard form of the declared optimization problem of an EnergySystemModel.
+
+    :param esM: EnergySystemModel instance with a declared pyomo ConcreteModel (esM.pyM).
+    :type esM: EnergySystemModel instance
+
+    :return: sparse matrix representation of the optimization problem
+    :rtype: MatrixModel
+    """
+    _t = time.time()
+    utils.output("Assembling sparse coefficient matrix...", esM.verbose, 0)
+    matrixModel = MatrixModel(esM.pyM)
+    utils.output(
+        "\t%d rows, %d columns, %d nonzeros"
+        % (
+            len(matrixModel.constraints),
+            len(matrixModel.columns),
+            matrixModel.numberOfNonzeros,
+        ),
+        esM.verbose,
+        0,
+    )
+    utils.output("\t\t(%.4f" % (time.time() - _t) + " sec)\n", esM.verbose, 0)
+    return matrixModel
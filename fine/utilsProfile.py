@@ -0,0 +1,124 @@
+"""
+Helper functions and classes for profiling the declaration of the optimization problem of the EnergySystemModel.
+
+If the declaration is profiled, the pyomo ConcreteModel is replaced by a ProfiledConcreteModel which records, for
+each pyomo component (set, parameter, variable, constraint, expression and objective) added to the model, the
+modeling class that declared it, the wall time needed to construct it, the number of its indices, the change of the
+resident set size (RSS) of the process and, for constraints and objectives, the number of nonzeros.
+"""
+
+import os
+import time
+
+import pandas as pd
+import psutil
+import pyomo.environ as pyomo
+from pyomo.core.expr.visitor import identify_variables
+
+
+class BuildProfiler(object):
+    """
+    Record statistics of the pyomo components which are added to a ProfiledConcreteModel.
+    """
+
+    def __init__(self, countNonzeros=True):
+        """
+        :param countNonzeros: states if the nonzeros of constraints and objectives are counted (this requires
+            traversing all constraint expressions).
+            |br| * the default value is True
+        :type countNonzeros: boolean
+        """
+        self.countNonzeros = countNonzeros
+        self.modelingClass = "TimeSets"
+        self.records = []
+        self._process = psutil.Process(os.getpid())
+
+    def addComponent(self, addComponent, name, val):
+        """
+        Add a component to a pyomo ConcreteModel (addComponent(name, val)) and record its statistics.
+        """
+        rssStart = self._process.memory_info().rss
+        timeStart = time.time()
+        addComponent(name, val)
+        buildTime = time.time() - timeStart
+        rssDelta = self._process.memory_info().rss - rssStart
+
+        if val.ctype in (pyomo.Constraint, pyomo.Objective) and self.countNonzeros:
+            nonzeros = sum(
+                sum(1 for _ in identify_variables(data.expr, include_fixed=False))
+                for data in val.values()
+            )
+        else:
+            nonzeros = None
+        self.records.append(
+            {
+                "modelingClass": self.modelingClass,
+                "component": name,
+                "type": val.ctype.__name__,
+                "buildTime": buildTime,
+                "indices": len(val) if val.is_indexed() else 1,
+                "rssDeltaMB": rssDelta / (1024 * 1024),
+                "nonzeros": nonzeros,
+            }
+        )
+
+    def removeRecords(self, names):
+        """
+        Remove the records of the pyomo components with the given names (e.g. if they are redeclared).
+        """
+        names = set(names)
+        self.records = [r for r in self.records if r["component"] not in names]
+
+    def toDataFrame(self, aggregate=False):
+        """
+        Return the recorded statistics.
+
+        :param aggregate: states if the statistics are aggregated per modeling class.
+            |br| * the default value is False
+        :type aggregate: boolean
+
+        :returns: build profile with (modelingClass, component) or, if aggregated, modelingClass as index and the
+            columns type, buildTime [s], indices, rssDeltaMB [MB] and nonzeros
+        :rtype: pandas DataFrame
+        """
+        columns = ["type", "buildTime", "indices", "rssDeltaMB", "nonzeros"]
+        if not self.records:
+            df = pd.DataFrame(columns=["modelingClass", "component"] + columns)
+        else:
+            df = pd.DataFrame(self.records)
+        df = df.set_index(["modelingClass", "component"])
+        if aggregate:
+            df = aggregateBuildProfile(df)
+        return df
+
+
+def aggregateBuildProfile(buildProfile):
+    """
+    Aggregate a build profile (cf. BuildProfiler.toDataFrame) per modeling class.
+
+    :param buildProfile: build profile with (modelingClass, component) as index
+    :type buildProfile: pandas DataFrame
+
+    :returns: sum of the build time, indices, RSS change and nonzeros per modeling class
+    :rtype: pandas DataFrame
+    """
+    return (
+        buildProfile[["buildTime", "indices", "rssDeltaMB", "nonzeros"]]
+        .groupby(level="modelingClass", sort=False)
+        .sum(min_count=1)
+    )
+
+
+class ProfiledConcreteModel(pyomo.ConcreteModel):
+    """
+    pyomo ConcreteModel which passes all added components to a BuildProfiler.
+    """
+
+    def __init__(self, profiler, *args, **kwds):
+        pyomo.ConcreteModel.__init__(self, *args, **kwds)
+        self.buildProfiler = profiler
+
+    def add_component(self, name, val):
+        self.buildProfiler.addComponent(
+            super(ProfiledConcreteModel, self).add_component, name, val
+        )
@@ -0,0 +1,156 @@
+"""
+Helper class for storing the optimal values of the EnergySystemModel in columnar form.
+
+The optimal values of each variable family (e.g. the operation variables of the SourceSinkModel in one investment
+period) are held as one two-dimensional NumPy array (rows x columns) together with the coordinate vectors of the
+rows (component, location and, for two-dimensional components, the second location) and of the columns (time steps
+or locations). The arrays are the ones which are scattered from the primal values of the solver in
+utils.formatOptimizationOutputPerPeriod, i.e. the DataFrames of the modeling classes (e.g.
+operationVariablesOptimum) and the xarray DataArrays written by convertOptimizationOutputToDatasets are views on
+the same memory.
+"""
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+class ResultsStore(object):
+    """
+    Columnar store of the optimal values of the variable families of an EnergySystemModel.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def clear(self):
+        """Remove all stored optimal values."""
+        self.entries = {}
+
+    def add(self, modelingClass, name, ip, df, timeDependent, dimension):
+        """
+        Add the optimal values of a variable family in one investment period.
+
+        :param modelingClass: name of the modeling class (e.g. 'SourceSinkModel')
+        :type modelingClass: string
+
+        :param name: name of the optimal values (e.g. 'operationVariablesOptimum')
+        :type name: string
+
+        :param ip: investment period name
+        :type ip: int
+
+        :param df: optimal values with components (and locations) as index. The values of the DataFrame are not
+            copied if they are stored in one block.
+        :type df: pandas DataFrame
+
+        :param timeDependent: states if the columns are time steps (True) or locations (False)
+        :type timeDependent: boolean
+
+        :param dimension: dimension of the modeling class ('1dim' or '2dim')
+        :type dimension: string
+        """
+        index = df.index
+        levels = [index.get_level_values(i) for i in range(index.nlevels)]
+        self.entries[(modelingClass, name, ip)] = {
+            "values": df.values,
+            "component": np.asarray(levels[0]),
+            "location": np.asarray(levels[1]) if len(levels) > 1 else None,
+            "location_2": np.asarray(levels[2]) if len(levels) > 2 else None,
+            "columns": df.columns,
+            "timeDependent": timeDependent,
+            "dimension": dimension,
+        }
+
+    def get(self, modelingClass, name, ip):
+        """
+        Return the stored optimal values of a variable family in one investment period (or None if they are not
+        stored).
+
+        :return: dictionary with the values ('values', numpy array), the coordinate vectors of the rows
+            ('component', 'location', 'location_2') and the columns ('columns') and the properties
+            'timeDependent' and 'dimension'
+        :rtype: dict or None
+        """
+        return self.entries.get((modelingClass, name, ip))
+
+    def getDataFrame(self, modelingClass, name, ip):
+        """
+        Return the stored optimal values of a variable family in one investment period as DataFrame which is
+        backed by the stored array.
+
+        :rtype: pandas DataFrame or None
+        """
+        entry = self.get(modelingClass, name, ip)
+        if entry is None:
+            return None
+        rows = [
+            entry[coordinate]
+            for coordinate in ["component", "location", "location_2"]
+            if entry[coordinate] is not None
+        ]
+        index = pd.MultiIndex.from_arrays(rows) if len(rows) > 1 else pd.Index(rows[0])
+        return pd.DataFrame(
+            entry["values"], index=index, columns=entry["columns"], copy=False
+        )
+
+    def getDataArrays(self, modelingClass, name, ip):
+        """
+        Return the stored time dependent optimal values of a variable family in one investment period as xarray
+        DataArrays per component with the dimensions ('time', 'space') or ('time', 'space', 'space_2'). Locations
+        and time steps without optimal values are omitted. The DataArrays of one-dimensional components are views
+        on the stored array if the rows of the component are contiguous.
+
+        :return: dictionary with the component names as keys and the DataArrays as values
+        :rtype: dict
+        """
+        entry = self.get(modelingClass, name, ip)
+        if entry is None:
+            return {}
+        codes, components = pd.factorize(entry["component"])
+        time = np.asarray(entry["columns"])
+        dataArrays = {}
+        for i, component in enumerate(components):
+            rows = np.flatnonzero(codes == i)
+            if rows[-1] - rows[0] + 1 == len(rows):
+                rows = slice(rows[0], rows[-1] + 1)
+            values = entry["values"][rows]
+            # Omit locations and time steps without optimal values
+            missing = np.isnan(values)
+            if missing.all():
+                continue
+            keepRows = ~missing.all(axis=1)
+            keepColumns = ~missing.all(axis=0)
+            if missing.any():
+                values = values[keepRows][:, keepColumns]
+            locations = entry["location"][rows][keepRows]
+
+            if entry["location_2"] is None:
+                dataArray = xr.DataArray(
+                    values.T,
+                    dims=("time", "space"),
+                    coords={"time": time[keepColumns], "space": locations},
+                    name=name,
+                )
+            else:
+                # Scatter the connections into a dense array over both locations
+                codesIn, locationsIn = pd.factorize(locations, sort=True)
+                codesOut, locationsOut = pd.factorize(
+                    entry["location_2"][rows][keepRows], sort=True
+                )
+                cube = np.full(
+                    (values.shape[1], len(locationsIn), len(locationsOut)), np.nan
+                )
+                cube[:, codesIn, codesOut] = values.T
+                dataArray = xr.DataArray(
+                    cube,
+                    dims=("time", "space", "space_2"),
+                    coords={
+                        "time": time[keepColumns],
+                        "space": locationsIn,
+                        "space_2": locationsOut,
+                    },
+                    name=name,
+                )
+            dataArrays[component] = dataArray
+        return dataArrays
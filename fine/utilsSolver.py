@@ -0,0 +1,187 @@
+"""
+Helper functions for solving the optimization problem of the EnergySystemModel with pyomo's automated persistent
+solver interfaces (APPSI).
+
+The HiGHS and Gurobi interfaces pass the pyomo ConcreteModel directly to the solver's API (no problem or solution
+files are written) and read the primal and dual values directly back into the model. The cbc and cplex interfaces
+still exchange the problem and the solution with the solver via files. Persistent solvers additionally keep the
+solver-side model alive between solves. If the pyomo ConcreteModel is solved again, only the modified variable
+bounds, fixed variables, coefficients, constraints and objective are pushed to the solver.
+"""
+
+from pyomo import opt
+from pyomo.contrib.appsi.base import (
+    SolverFactory as PersistentSolverFactory,
+    legacy_solver_status_map,
+    legacy_termination_condition_map,
+)
+
+from fine import utils
+
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
+# Name of the thread option of the solvers which provide a persistent interface
+threadOptions = {"highs": "threads", "gurobi": "Threads", "cplex": "threads", "cbc": "threads"}
+
+# Number of threads of the global thread pool of HiGHS (None if HiGHS was not used yet)
+_highsScheduler = {"threads": None}
+
+
+def isAvailable(solver):
+    """
+    Check if the automated persistent interface of a solver (e.g. 'highs') is available.
+
+    :param solver: name of the solver
+    :type solver: string
+
+    :returns: True if the solver interface is available, False otherwise
+    :rtype: boolean
+    """
+    if solver not in threadOptions:
+        return False
+    try:
+        return bool(PersistentSolverFactory(solver).available())
+    except Exception:
+        return False
+
+
+def getPersistentSolver(esM, solver):
+    """
+    Return a persistent solver for the optimization problem of the energy system model. The solver is stored in
+    the EnergySystemModel instance (esM.persistentSolver) and reused if it is requested again. If the specified
+    solver has no persistent interface, HiGHS is used.
+
+    :param esM: EnergySystemModel instance
+    :type esM: EnergySystemModel instance
+
+    :param solver: name of the solver (e.g. 'highs' or 'gurobi')
+    :type solver: string
+
+    :returns: name of the solver and the persistent solver or (None, None) if no persistent solver is available
+    :rtype: tuple
+    """
+    candidates = [solver, "highs"] if solver in threadOptions else ["highs"]
+    if esM.persistentSolver is not None and esM.persistentSolver[0] == candidates[0]:
+        return esM.persistentSolver
+
+    for name in candidates:
+        if isAvailable(name):
+            if name != solver:
+                utils.output(
+                    "No persistent interface available for "
+                    + str(solver)
+                    + ". highs is used as persistent solver.",
+                    esM.verbose,
+                    0,
+                )
+            esM.persistentSolver = (name, PersistentSolverFactory(name))
+            return esM.persistentSolver
+    return None, None
+
+
+def solveInMemory(
+    esM, solver, optimizer=None, threads=3, timeLimit=None, optimizationSpecs="", tee=True
+):
+    """
+    Solve the optimization problem of the energy system model (esM.pyM) in memory with an automated persistent
+    solver interface. If the solver already holds the model from a previous solve, only the changes since then are
+    passed to the solver. Primal values and, for linear programs, dual values are written to the pyomo
+    ConcreteModel.
+
+    :param esM: EnergySystemModel instance with a declared optimization problem
+    :type esM: EnergySystemModel instance
+
+    :param solver: name of the solver (key of threadOptions)
+    :type solver: string
+
+    :param optimizer: persistent solver (cf. getPersistentSolver). If None, a new solver instance is created.
+        |br| * the default value is None
+    :type optimizer: pyomo APPSI PersistentSolver or None
+
+    :param threads: number of threads used by the solver
+        |br| * the default value is 3
+    :type threads: positive integer
+
+    :param timeLimit: maximum solve time in seconds or None
+        |br| * the default value is None
+    :type timeLimit: strictly positive integer or None
+
+    :param optimizationSpecs: additional solver parameters, e.g. 'mip_rel_gap=0.01 presolve=off'
+        |br| * the default value is an empty string ('')
+    :type optimizationSpecs: string
+
+    :param tee: states if the solver output is printed
+        |br| * the default value is True
+    :type tee: boolean
+
+    :returns: solver results in the pyomo format (status, termination condition and problem information)
+    :rtype: pyomo SolverResults
+    """
+    pyM = esM.pyM
+    if optimizer is None:
+        optimizer = PersistentSolverFactory(solver)
+    optimizer.config.stream_solver = tee
+    optimizer.config.load_solution = False
+    optimizer.config.time_limit = timeLimit
+    options = {threadOptions[solver]: threads}
+    options.update(parseOptimizationSpecs(optimizationSpecs))
+    setattr(optimizer, solver + "_options", options)
+    if solver == "highs" and _highsScheduler["threads"] != threads:
+        # HiGHS uses a global thread pool whose size can only be changed after it has been reset
+        highspy.Highs.resetGlobalScheduler(True)
+        _highsScheduler["threads"] = threads
+
+    res = optimizer.solve(pyM)
+
+    results = opt.SolverResults()
+    results.solver.name = "appsi_" + solver
+    results.solver.status = legacy_solver_status_map[res.termination_condition]
+    results.solver.termination_condition = legacy_termination_condition_map[
+        res.termination_condition
+    ]
+    results.solver.termination_message = str(res.termination_condition)
+    results.problem.lower_bound = res.best_objective_bound
+    results.problem.upper_bound = res.best_feasible_objective
+
+    pyM.dual.clear()
+    if res.best_feasible_objective is not None:
+        res.solution_loader.load_vars()
+        # Dual values are only available for linear programs
+        try:
+            duals = res.solution_loader.get_duals()
+        except (RuntimeError, NotImplementedError):
+            duals = {}
+        for con, val in duals.items():
+            pyM.dual[con] = val
+    return results
+
+
+def parseOptimizationSpecs(optimizationSpecs):
+    """
+    Convert a string of solver parameters ('key1=value1 key2=value2') into a dictionary. Numeric values are
+    converted to int or float.
+
+    :param optimizationSpecs: solver parameters
+    :type optimizationSpecs: string
+
+    :returns: solver parameters
+    :rtype: dict
+    """
+    options = {}
+    for spec in optimizationSpecs.split():
+        if "=" not in spec:
+            raise ValueError(
+                "The optimizationSpecs have to be given as 'key=value' pairs, got '" + spec + "'."
+            )
+        key, val = spec.split("=", 1)
+        for conversion in (int, float):
+            try:
+                val = conversion(val)
+                break
+            except ValueError:
+                pass
+        options[key] = val
+    return options
@@ -0,0 +1,545 @@
+"""
+Helper functions for the temporal aggregation of the EnergySystemModel.
+
+The time series data of each investment period is clustered with the tsam package. The results of the clustering
+(clustered time series data, order of the typical periods and segment durations) can be stored in a
+content-addressed cache on disk: the cache key is a hash of the time series data and its time index, the weights,
+all clustering arguments and the versions of tsam, pandas and numpy. If aggregateTemporally is called again with identical inputs, the results are loaded from the cache
+instead of clustering the time series data again. The cache directory is limited in size; if the limit is
+exceeded, the least recently used entries are removed. The investment periods which are not in the cache can be
+clustered in parallel worker processes.
+
+The input of the tsam package is assembled in one preallocated float64 matrix: the components register their time
+series in a column registry (TSAInputMatrix) which writes them into their columns without intermediate copies. The
+clustered data is returned to the components as views on one matrix (TSAOutputMatrix).
+
+For the automatic choice of the number of typical periods, the hierarchical linkage of the periods is computed once
+and cut at successive numbers of clusters to estimate the reconstruction error of each number of typical periods
+until a target error is met.
+"""
+
+import concurrent.futures
+import hashlib
+import importlib.metadata
+import multiprocessing
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+from scipy.cluster import hierarchy
+from tsam.timeseriesaggregation import TimeSeriesAggregation
+
+# Default directory of the cache (can be overwritten by the environment variable FINE_TSA_CACHE_DIR)
+defaultCacheDirectory = os.path.join(os.path.expanduser("~"), ".cache", "fine", "tsa")
+
+
+class TSAInputMatrix(object):
+    """
+    Column registry of the time series data of all components for the time series aggregation. The components
+    register their time series (cf. Component.prepareTSAInput) and the registry writes them into one preallocated
+    float64 matrix with the columns sorted by their unique names.
+    """
+
+    def __init__(self):
+        self.blocks = []
+
+    def register(self, uniqueIdentifiers, data):
+        """
+        Register the time series of a component.
+
+        :param uniqueIdentifiers: unique names of the columns of data
+        :type uniqueIdentifiers: list of strings
+
+        :param data: time series data (time steps x columns). The data is not copied before assemble is called.
+        :type data: pandas DataFrame
+        """
+        self.blocks.append((uniqueIdentifiers, data))
+
+    def getContentKey(self, hashes=None):
+        """
+        Return a key of the registered time series which is equal for registries with identical columns and data,
+        without assembling the matrix.
+
+        :param hashes: content hashes of time series which were already hashed by their id. It is extended by the
+            registered time series, so that time series which are registered in several registries (e.g. in several
+            investment periods) are hashed only once.
+            |br| * the default value is None
+        :type hashes: dict or None
+
+        :return: names and content hashes of the registered time series
+        :rtype: tuple
+        """
+        hashes = {} if hashes is None else hashes
+        key = []
+        for uniqueIdentifiers, data in self.blocks:
+            if id(data) not in hashes:
+                values = np.ascontiguousarray(data.values, dtype=np.float64)
+                sha = hashlib.sha256()
+                sha.update(repr(values.shape).encode())
+                sha.update(values.tobytes())
+                # The time series is stored with its hash, so that its id is not reused by another object
+                hashes[id(data)] = (data, sha.hexdigest())
+            key.append((tuple(uniqueIdentifiers), hashes[id(data)][1]))
+        return tuple(key)
+
+    def assemble(self, index):
+        """
+        Write the registered time series into one float64 matrix and return it as DataFrame.
+
+        :param index: index of the time steps
+        :type index: pandas Index
+
+        :return: time series data of all components with the columns sorted by their names (the DataFrame is a
+            view on the matrix)
+        :rtype: pandas DataFrame
+        """
+        names = [name for uniqueIdentifiers, _ in self.blocks for name in uniqueIdentifiers]
+        order = np.argsort(names, kind="stable")
+        positions = np.empty(len(names), dtype=int)
+        positions[order] = np.arange(len(names))
+        # Fortran order, i.e. the columns of the matrix are contiguous
+        values = np.empty((len(index), len(names)), dtype=np.float64, order="F")
+        start = 0
+        for uniqueIdentifiers, data in self.blocks:
+            values[:, positions[start : start + len(uniqueIdentifiers)]] = data.values
+            start += len(uniqueIdentifiers)
+        self.blocks = []
+        return pd.DataFrame(
+            values, index=index, columns=[names[i] for i in order], copy=False
+        )
+
+
+class TSAOutputMatrix(object):
+    """
+    Clustered time series data of all components as one float64 matrix with a column registry. The time series of
+    the components are returned as views on the matrix (cf. Component.getTSAOutput).
+    """
+
+    def __init__(self, data):
+        """
+        :param data: clustered time series data (typical period and time step or segment x columns)
+        :type data: pandas DataFrame
+        """
+        self.index = data.index
+        self.values = np.asfortranarray(data.values, dtype=np.float64)
+        self.columns = {}
+        for i, name in enumerate(data.columns):
+            self.columns.setdefault(name, i)
+
+    def getDataFrame(self, uniqueIdentifiers, columns):
+        """
+        Return the clustered time series of a component.
+
+        :param uniqueIdentifiers: unique names of the time series
+        :type uniqueIdentifiers: list of strings
+
+        :param columns: columns of the returned DataFrame (e.g. locations)
+        :type columns: list
+
+        :return: clustered time series (a view on the matrix if the time series are stored in adjacent columns)
+        :rtype: pandas DataFrame
+        """
+        positions = [self.columns[name] for name in uniqueIdentifiers]
+        if positions and positions == list(
+            range(positions[0], positions[0] + len(positions))
+        ):
+            values = self.values[:, positions[0] : positions[0] + len(positions)]
+        else:
+            values = self.values[:, positions]
+        return pd.DataFrame(values, index=self.index, columns=columns, copy=False)
+
+
+def clusterTimeSeriesData(
+    timeSeriesData,
+    weightDict,
+    numberOfTypicalPeriods,
+    hoursPerPeriod,
+    segmentation,
+    numberOfSegmentsPerPeriod,
+    clusterMethod,
+    sortValues,
+    rescaleClusterPeriods,
+    representationMethod,
+    storeTSAinstance=False,
+    **kwargs,
+):
+    """
+    Cluster the time series data of one investment period with the tsam package (cf.
+    EnergySystemModel.aggregateTemporally for the description of the parameters).
+
+    :return: dictionary with the clustered time series data ('data', pandas DataFrame with the typical period and
+        the time step or segment as index), the order of the typical periods ('clusterOrder'), the indices of the
+        typical periods ('clusterPeriodIdx'), the number of time steps per segment ('timeStepsPerSegment', pandas
+        Series or None) and the TimeSeriesAggregation instance ('tsaInstance', only if storeTSAinstance is True)
+    :rtype: dict
+    """
+    if segmentation:
+        clusterClass = TimeSeriesAggregation(
+            timeSeries=timeSeriesData,
+            noTypicalPeriods=numberOfTypicalPeriods,
+            segmentation=segmentation,
+            noSegments=numberOfSegmentsPerPeriod,
+            hoursPerPeriod=hoursPerPeriod,
+            clusterMethod=clusterMethod,
+            sortValues=sortValues,
+            weightDict=weightDict,
+            rescaleClusterPeriods=rescaleClusterPeriods,
+            representationMethod=representationMethod,
+            **kwargs,
+        )
+        # Convert the clustered data to a pandas DataFrame with the first index as typical period number and the
+        # second index as segment number per typical period.
+        data = pd.DataFrame.from_dict(clusterClass.clusterPeriodDict).reset_index(
+            level=2, drop=True
+        )
+        # Get the length of each segment in each typical period with the first index as typical period number and
+        # the second index as segment number per typical period.
+        timeStepsPerSegment = pd.DataFrame.from_dict(
+            clusterClass.segmentDurationDict
+        )["Segment Duration"]
+    else:
+        clusterClass = TimeSeriesAggregation(
+            timeSeries=timeSeriesData,
+            noTypicalPeriods=numberOfTypicalPeriods,
+            hoursPerPeriod=hoursPerPeriod,
+            clusterMethod=clusterMethod,
+            sortValues=sortValues,
+            weightDict=weightDict,
+            rescaleClusterPeriods=rescaleClusterPeriods,
+            representationMethod=representationMethod,
+            **kwargs,
+        )
+        # Convert the clustered data to a pandas DataFrame with the first index as typical period number and the
+        # second index as time step number per typical period.
+        data = pd.DataFrame.from_dict(clusterClass.clusterPeriodDict)
+        timeStepsPerSegment = None
+
+    return {
+        "data": data,
+        "clusterOrder": np.asarray(clusterClass.clusterOrder),
+        "clusterPeriodIdx": list(clusterClass.clusterPeriodIdx),
+        "timeStepsPerSegment": timeStepsPerSegment,
+        "tsaInstance": clusterClass if storeTSAinstance else None,
+    }
+
+
+def clusterInvestmentPeriods(
+    timeSeriesDataDict,
+    weightDictDict,
+    clusterArgs,
+    storeTSAinstance=False,
+    workers=1,
+    useCache=True,
+    cacheDirectory=None,
+    cacheMaxSize=1e9,
+    numberOfTimeStepsPerPeriod=None,
+):
+    """
+    Cluster the time series data of all investment periods or load the results from the cache (cf.
+    EnergySystemModel.aggregateTemporally for the description of the parameters).
+
+    :param timeSeriesDataDict: time series data of each investment period
+    :type timeSeriesDataDict: dict of pandas DataFrames
+
+    :param weightDictDict: weights of the columns of each investment period
+    :type weightDictDict: dict of dicts
+
+    :param clusterArgs: further arguments of the clustering (cf. clusterTimeSeriesData)
+    :type clusterArgs: dict
+
+    :param numberOfTimeStepsPerPeriod: number of time steps per period (part of the cache key)
+    :type numberOfTimeStepsPerPeriod: strictly positive integer or None
+
+    :return: results of the clustering of each investment period (cf. clusterTimeSeriesData, investment periods
+        with identical inputs share the same results) and the list of investment periods which were loaded from
+        the cache
+    :rtype: tuple (dict, list)
+    """
+    # Investment periods with identical time series data, weights and clustering arguments (e.g. if the same time
+    # series are used in all investment periods) are clustered only once and share the results of the first of them.
+    # Inputs which are shared by reference (cf. EnergySystemModel.getTimeSeriesDataForAggregation) are hashed once.
+    cacheKeys, representatives, objectKeys = {}, {}, {}
+    for ip, timeSeriesData in timeSeriesDataDict.items():
+        objectKey = (id(timeSeriesData), id(weightDictDict[ip]))
+        if objectKey not in objectKeys:
+            objectKeys[objectKey] = getCacheKey(
+                timeSeriesData,
+                weightDictDict[ip],
+                clusterArgs,
+                numberOfTimeStepsPerPeriod=numberOfTimeStepsPerPeriod,
+            )
+        cacheKeys[ip] = objectKeys[objectKey]
+        representatives.setdefault(cacheKeys[ip], ip)
+    uniqueIps = list(representatives.values())
+
+    results, cachedIps = {}, []
+    if useCache:
+        cacheDirectory = getCacheDirectory(cacheDirectory)
+        # The TimeSeriesAggregation instance is not stored in the cache
+        if not storeTSAinstance:
+            for ip in uniqueIps:
+                result = loadFromCache(cacheDirectory, cacheKeys[ip])
+                if result is not None:
+                    results[ip] = result
+                    cachedIps.append(ip)
+
+    missingIps = [ip for ip in uniqueIps if ip not in results]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(missingIps)))
+    if workers == 1:
+        for ip in missingIps:
+            results[ip] = clusterTimeSeriesData(
+                timeSeriesDataDict[ip],
+                weightDictDict[ip],
+                storeTSAinstance=storeTSAinstance,
+                **clusterArgs,
+            )
+    else:
+        startMethod = (
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context(startMethod)
+        ) as executor:
+            futures = {
+                ip: executor.submit(
+                    clusterTimeSeriesData,
+                    timeSeriesDataDict[ip],
+                    weightDictDict[ip],
+                    storeTSAinstance=storeTSAinstance,
+                    **clusterArgs,
+                )
+                for ip in missingIps
+            }
+            # The results are collected in the order of the investment periods
+            for ip in missingIps:
+                results[ip] = futures[ip].result()
+
+    if useCache:
+        for ip in missingIps:
+            storeInCache(cacheDirectory, cacheKeys[ip], results[ip], cacheMaxSize)
+    for ip in timeSeriesDataDict.keys():
+        results[ip] = results[representatives[cacheKeys[ip]]]
+    return results, cachedIps
+
+
+def iterateTypicalPeriodErrors(
+    timeSeriesData, weightDict, numberOfTimeStepsPerPeriod, maxPeriods
+):
+    """
+    Estimate the reconstruction error of the time series data for 1, 2, ... maxPeriods typical periods. For this,
+    the time series are normalized to [0, 1] and multiplied with their weights, the periods are clustered
+    hierarchically (Ward linkage, computed once) and each period is represented by the centroid of its cluster.
+    The errors are computed lazily, so the iteration can be stopped as soon as a target error is met.
+
+    :param timeSeriesData: time series data (time steps x columns)
+    :type timeSeriesData: pandas DataFrame
+
+    :param weightDict: weights of the columns (columns without weight have the weight 1)
+    :type weightDict: dict
+
+    :param numberOfTimeStepsPerPeriod: number of time steps per period
+    :type numberOfTimeStepsPerPeriod: strictly positive integer
+
+    :param maxPeriods: maximum number of typical periods (at most the number of periods is evaluated)
+    :type maxPeriods: strictly positive integer
+
+    :return: generator of tuples of the number of typical periods and a dictionary with the maximum root mean
+        squared error ('rmse') and the maximum root mean squared error of the duration curves
+        ('durationCurveError') over all weighted columns
+    :rtype: generator
+    """
+    values = timeSeriesData.values.astype(float)
+    minValues, maxValues = values.min(axis=0), values.max(axis=0)
+    ranges = np.where(maxValues > minValues, maxValues - minValues, 1)
+    weights = np.array([weightDict.get(column, 1) for column in timeSeriesData.columns])
+    values = (values - minValues) / ranges * weights
+
+    numberOfPeriods = len(values) // numberOfTimeStepsPerPeriod
+    values = values[: numberOfPeriods * numberOfTimeStepsPerPeriod]
+    candidates = values.reshape(numberOfPeriods, -1)
+    maxPeriods = min(maxPeriods, numberOfPeriods)
+    if numberOfPeriods > 1:
+        # Each column of cuts contains the cluster of each period for one number of typical periods
+        cuts = hierarchy.cut_tree(
+            hierarchy.linkage(candidates, method="ward"),
+            n_clusters=range(1, maxPeriods + 1),
+        )
+    else:
+        cuts = np.zeros((1, 1), dtype=int)
+
+    sortedValues = -np.sort(-values, axis=0)
+    for i in range(maxPeriods):
+        labels = cuts[:, i]
+        centroids = np.zeros((labels.max() + 1, candidates.shape[1]))
+        np.add.at(centroids, labels, candidates)
+        centroids /= np.bincount(labels)[:, np.newaxis]
+        reconstructed = centroids[labels].reshape(values.shape)
+        rmse = np.sqrt(np.mean((reconstructed - values) ** 2, axis=0))
+        durationCurveError = np.sqrt(
+            np.mean((-np.sort(-reconstructed, axis=0) - sortedValues) ** 2, axis=0)
+        )
+        yield i + 1, {
+            "rmse": rmse.max(),
+            "durationCurveError": durationCurveError.max(),
+        }
+
+
+def evaluateTypicalPeriods(
+    timeSeriesData, weightDict, numberOfTimeStepsPerPeriod, maxPeriods, targetError=None
+):
+    """
+    Estimate the reconstruction error of the time series data for 1, 2, ... maxPeriods typical periods (cf.
+    iterateTypicalPeriodErrors).
+
+    :param targetError: if not None, the evaluation stops at the first number of typical periods whose errors
+        do not exceed targetError
+        |br| * the default value is None
+    :type targetError: strictly positive number or None
+
+    :return: maximum root mean squared error ('rmse') and maximum root mean squared error of the duration curves
+        ('durationCurveError') over all weighted columns with the number of typical periods as index
+    :rtype: pandas DataFrame
+    """
+    errors = {}
+    for numberOfTypicalPeriods, error in iterateTypicalPeriodErrors(
+        timeSeriesData, weightDict, numberOfTimeStepsPerPeriod, maxPeriods
+    ):
+        errors[numberOfTypicalPeriods] = error
+        if targetError is not None and max(error.values()) <= targetError:
+            break
+    errors = pd.DataFrame.from_dict(errors, orient="index")
+    errors.index.name = "numberOfTypicalPeriods"
+    return errors
+
+
+def _getVersion(package):
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def getCacheKey(timeSeriesData, weightDict, clusterArgs, numberOfTimeStepsPerPeriod=None):
+    """
+    Return the content hash of the inputs of a clustering.
+
+    :param timeSeriesData: time series data (time steps x columns) with its time index
+    :type timeSeriesData: pandas DataFrame
+
+    :param weightDict: weights of the columns
+    :type weightDict: dict
+
+    :param clusterArgs: all further arguments of the clustering (cf. clusterTimeSeriesData)
+    :type clusterArgs: dict
+
+    :param numberOfTimeStepsPerPeriod: number of time steps per period
+        |br| * the default value is None
+    :type numberOfTimeStepsPerPeriod: strictly positive integer or None
+
+    :return: hexadecimal hash
+    :rtype: string
+    """
+    sha = hashlib.sha256()
+    sha.update(repr(timeSeriesData.shape).encode())
+    sha.update(repr(list(timeSeriesData.columns)).encode())
+    sha.update(repr(list(timeSeriesData.dtypes.astype(str))).encode())
+    sha.update(np.ascontiguousarray(timeSeriesData.values).tobytes())
+    # The time index determines the length of the time steps (hoursPerTimeStep)
+    sha.update(repr(timeSeriesData.index.dtype).encode())
+    sha.update(pd.util.hash_pandas_object(timeSeriesData.index).values.tobytes())
+    sha.update(repr(sorted(weightDict.items())).encode())
+    sha.update(repr(sorted(clusterArgs.items(), key=lambda item: item[0])).encode())
+    sha.update(repr(numberOfTimeStepsPerPeriod).encode())
+    # Results of other versions of the packages which are used for the clustering are not reused
+    sha.update(
+        repr([_getVersion(package) for package in ["tsam", "pandas", "numpy"]]).encode()
+    )
+    return sha.hexdigest()
+
+
+def getCacheDirectory(cacheDirectory=None):
+    """
+    Return the cache directory (the specified directory, the environment variable FINE_TSA_CACHE_DIR or the default
+    directory).
+    """
+    if cacheDirectory is None:
+        cacheDirectory = os.environ.get("FINE_TSA_CACHE_DIR", defaultCacheDirectory)
+    return cacheDirectory
+
+
+def loadFromCache(cacheDirectory, key):
+    """
+    Load the results of a clustering from the cache.
+
+    :return: results of the clustering (cf. clusterTimeSeriesData) or None if the key is not in the cache or the
+        entry cannot be loaded (e.g. a corrupted entry or an entry pickled with incompatible package versions)
+    :rtype: dict or None
+    """
+    path = os.path.join(cacheDirectory, key + ".pkl")
+    try:
+        with open(path, "rb") as file:
+            result = pickle.load(file)
+    except Exception:
+        return None
+    # Mark the entry as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return result
+
+
+def storeInCache(cacheDirectory, key, result, maxSize):
+    """
+    Store the results of a clustering in the cache and remove the least recently used entries if the size of the
+    cache directory exceeds maxSize (in bytes). Errors while writing the cache are ignored.
+    """
+    result = {name: value for name, value in result.items() if name != "tsaInstance"}
+    try:
+        os.makedirs(cacheDirectory, exist_ok=True)
+        # Write to a temporary file first so that no incomplete entries are read by concurrent processes
+        fd, tmpPath = tempfile.mkstemp(dir=cacheDirectory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpPath, os.path.join(cacheDirectory, key + ".pkl"))
+        evictCache(cacheDirectory, maxSize)
+    except OSError:
+        pass
+
+
+def evictCache(cacheDirectory, maxSize):
+    """
+    Remove the least recently used entries of the cache until its size is below maxSize (in bytes).
+    """
+    entries = []
+    for name in os.listdir(cacheDirectory):
+        if name.endswith(".pkl"):
+            stat = os.stat(os.path.join(cacheDirectory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+    size = sum(entry[1] for entry in entries)
+    for _, entrySize, name in sorted(entries):
+        if size <= maxSize:
+            break
+        try:
+            os.remove(os.path.join(cacheDirectory, name))
+            size -= entrySize
+        except OSError:
+            pass
+
+
+def clearCache(cacheDirectory=None):
+    """
+    Remove all entries of the cache.
+
+    :param cacheDirectory: cache directory. If None, the directory given by the environment variable
+        FINE_TSA_CACHE_DIR or the default directory (~/.cache/fine/tsa) is used.
+        |br| * the default value is None
+    :type cacheDirectory: string or None
+    """
+    cacheDirectory = getCacheDirectory(cacheDirectory)
+    if os.path.isdir(cacheDirectory):
+        evictCache(cacheDirectory, -1)
@@ -277,4 +277,47 @@ def test_saving_clustered_timeseries_to_xarray(perfectForesight_test_esM):
 
     compare_esm_inputs(esm_original_pf, esm_pf_from_netcdf)
 
-    Path("test_esM_pf.nc").unlink()
\ No newline at end of file
+    Path("test_esM_pf.nc").unlink()
+
+
+def test_results_store(minimal_test_esM):
+    esM = minimal_test_esM
+    esM.optimize()
+    ip = esM.investmentPeriodNames[0]
+    xr_dss = xrIO.convertOptimizationOutputToDatasets(esM)
+
+    # One-dimensional components: the DataArrays of the store and of the datasets hold the operation
+    # (component, location) x time of the modeling class as time x space
+    operation = esM.componentModelingDict["SourceSinkModel"].operationVariablesOptimum
+    dataArrays = esM.resultsStore.getDataArrays(
+        "SourceSinkModel", "operationVariablesOptimum", ip
+    )
+    assert set(dataArrays.keys()) == set(operation.index.get_level_values(0))
+    for component, xr_da in dataArrays.items():
+        expected = operation.loc[component].T
+        assert set(xr_da.space.values) == set(expected.columns)
+        for xr_da_ in [
+            xr_da,
+            xr_dss[ip]["SourceSinkModel"][component]["operationVariablesOptimum"],
+        ]:
+            assert_frame_equal(
+                xr_da_.to_pandas().loc[expected.index, expected.columns],
+                expected,
+                check_names=False,
+            )
+
+    # Two-dimensional components: the DataArrays hold the operation (component, location, location) x time as
+    # time x space x space_2
+    operation = esM.componentModelingDict["TransmissionModel"].operationVariablesOptimum
+    dataArrays = esM.resultsStore.getDataArrays(
+        "TransmissionModel", "operationVariablesOptimum", ip
+    )
+    assert list(dataArrays.keys()) == ["Pipelines"]
+    for xr_da in [
+        dataArrays["Pipelines"],
+        xr_dss[ip]["TransmissionModel"]["Pipelines"]["operationVariablesOptimum"],
+    ]:
+        for (loc, loc_2), values in operation.loc["Pipelines"].iterrows():
+            assert list(
+                xr_da.sel(space=loc, space_2=loc_2).sel(time=values.index).values
+            ) == list(values.values)
@@ -18,6 +18,14 @@ sys.path.append(
 from getData import getData
 
 
+@pytest.fixture(autouse=True)
+def tsaCacheDirectory(tmp_path, monkeypatch):
+    """Stores the clustering cache of the temporal aggregation in a temporary directory"""
+    cacheDirectory = tmp_path / "tsaCache"
+    monkeypatch.setenv("FINE_TSA_CACHE_DIR", str(cacheDirectory))
+    return cacheDirectory
+
+
 @pytest.fixture
 def minimal_test_esM(scope="session"):
     """Returns minimal instance of esM"""
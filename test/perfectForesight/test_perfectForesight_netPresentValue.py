@@ -1,4 +1,5 @@
 import numpy as np
+import pandas as pd
 
 
 def test_perfectForesight_netPresentValue(perfectForesight_test_esM):
@@ -17,3 +18,50 @@ def test_perfectForesight_netPresentValue(perfectForesight_test_esM):
     np.testing.assert_almost_equal(
         perfectForesight_test_esM.pyM.Obj(), npv_sum_optSummary
     )
+
+
+def test_perfectForesight_optimalDesignCosts(perfectForesight_test_esM):
+    """
+    Check that the design dependent costs which are evaluated in one pass match the costs which are evaluated per
+    cost factor with getEconomicsDesign.
+    """
+    esM = perfectForesight_test_esM
+    esM.optimize(timeSeriesAggregation=False, solver="glpk")
+    for mdl in esM.componentModelingDict.values():
+        designCosts = mdl.getOptimalDesignCosts(esM.pyM, esM)
+        for costName, kwargs in [
+            (
+                "cx",
+                dict(
+                    factorNames=["processedInvestPerCapacity", "QPcostDev"],
+                    QPfactorNames=["processedQPcostScale", "processedInvestPerCapacity"],
+                    lifetimeAttr="ipEconomicLifetime",
+                    varName="commis",
+                    divisorName="CCF",
+                    QPdivisorNames=["QPbound", "CCF"],
+                ),
+            ),
+            (
+                "ox_bin",
+                dict(
+                    factorNames=["processedOpexIfBuilt"],
+                    lifetimeAttr="ipTechnicalLifetime",
+                    varName="commisBin",
+                ),
+            ),
+        ]:
+            expected = mdl.getEconomicsDesign(
+                esM.pyM,
+                esM,
+                getOptValue=True,
+                getOptValueCostType=["NPV", "TAC"],
+                **kwargs,
+            )
+            for costType in ["NPV", "TAC"]:
+                for ip in esM.investmentPeriods:
+                    pd.testing.assert_frame_equal(
+                        designCosts[costName][costType][ip]
+                        .sort_index()
+                        .sort_index(axis=1),
+                        expected[costType][ip].sort_index().sort_index(axis=1),
+                    )
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+
+def test_perfectForesight_parallelTSA(perfectForesight_test_esM):
+    """
+    Cluster the investment periods of the perfect foresight test system sequentially and in parallel and check
+    that both lead to the same aggregated time series data.
+    """
+    esM = perfectForesight_test_esM
+    tsaArgs = dict(
+        numberOfTypicalPeriods=2,
+        numberOfTimeStepsPerPeriod=1,
+        segmentation=False,
+        useCache=False,
+    )
+
+    esM.aggregateTemporally(workers=1, **tsaArgs)
+    periodsOrder = {ip: order.copy() for ip, order in esM.periodsOrder.items()}
+    periodOccurrences = dict(esM.periodOccurrences)
+    pv = esM.getComponent("PV")
+    aggregatedRates = {
+        ip: pv.aggregatedOperationRateMax[ip].copy() for ip in esM.investmentPeriods
+    }
+
+    esM.aggregateTemporally(workers=2, **tsaArgs)
+    for ip in esM.investmentPeriods:
+        np.testing.assert_array_equal(esM.periodsOrder[ip], periodsOrder[ip])
+        assert esM.periodOccurrences[ip] == periodOccurrences[ip]
+        pd.testing.assert_frame_equal(
+            pv.aggregatedOperationRateMax[ip], aggregatedRates[ip]
+        )
@@ -0,0 +1,31 @@
+import fine as fn
+import numpy as np
+
+
+def test_benders(minimal_test_esM):
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+    objective = esM.objectiveValue
+
+    fn.optimizeBenders(esM, tolerance=1e-6, solver="glpk")
+    assert esM.gap <= 1e-6
+    assert (esM.bendersSummary["lowerBound"].diff().dropna() >= -1e-6).all()
+    np.testing.assert_almost_equal(esM.upperBound / objective, 1, decimal=5)
+    np.testing.assert_almost_equal(esM.objectiveValue / objective, 1, decimal=5)
+
+
+def test_benders_typicalPeriods(multi_node_test_esM_init):
+    esM = multi_node_test_esM_init
+    esM.aggregateTemporally(numberOfTypicalPeriods=2)
+    esM.optimize(timeSeriesAggregation=True, solver="glpk")
+    objective = esM.objectiveValue
+
+    fn.optimizeBenders(
+        esM,
+        timeSeriesAggregation=True,
+        workers=2,
+        tolerance=1e-5,
+        setOptimalValues=False,
+    )
+    np.testing.assert_almost_equal(esM.upperBound / objective, 1, decimal=4)
+    assert esM.lowerBound <= esM.upperBound
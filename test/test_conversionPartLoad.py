@@ -605,5 +605,72 @@ def test_conversionPartLoad():
     np.testing.assert_allclose(opVarOptPartLoad, opVarOptConstLoad, rtol=0.01)
 
 
+def test_conversionPartLoad_segmentation():
+    esM = fn.EnergySystemModel(
+        locations={"Region1"},
+        commodities={"electricity", "hydrogen"},
+        numberOfTimeSteps=48,
+        commodityUnitsDict={"electricity": r"kW$_{el}$", "hydrogen": r"kW$_{H2}$"},
+        hoursPerTimeStep=1,
+        costUnit="1 Euro",
+        lengthUnit="km",
+        verboseLogLevel=2,
+    )
+    esM.add(
+        fn.Source(
+            esM=esM,
+            name="ElectricityGrid",
+            commodity="electricity",
+            hasCapacityVariable=False,
+            commodityCost=0.070,
+        )
+    )
+    partLoadData = pd.DataFrame(
+        {
+            "x": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95],
+            "y": [0.1, 0.15, 0.5, 0.7, 0.7, 0.65, 0.63, 0.62, 0.61, 0.60],
+        }
+    )
+    esM.add(
+        fn.ConversionPartLoad(
+            esM=esM,
+            name="PEMEC",
+            physicalUnit=r"kW$_{el}$",
+            commodityConversionFactors={"electricity": -1, "hydrogen": 1},
+            commodityConversionFactorsPartLoad={
+                "electricity": -1,
+                "hydrogen": partLoadData,
+            },
+            nSegments=3,
+            hasCapacityVariable=True,
+            bigM=99999,
+            investPerCapacity=900,
+            interestRate=0.08,
+            economicLifetime=10,
+        )
+    )
+    esM.add(
+        fn.Sink(
+            esM=esM,
+            name="HydrogenDemand",
+            commodity="hydrogen",
+            hasCapacityVariable=False,
+            operationRateFix=pd.DataFrame(
+                {"Region1": 1 + 0.5 * np.sin(np.arange(48) * np.pi / 12)}
+            ),
+        )
+    )
+
+    # The segment and point capacity constraints use the durations of the segments
+    esM.aggregateTemporally(
+        numberOfTypicalPeriods=2,
+        numberOfTimeStepsPerPeriod=24,
+        segmentation=True,
+        numberOfSegmentsPerPeriod=4,
+    )
+    esM.optimize(timeSeriesAggregation=True, solver="glpk")
+    assert esM.solverSpecs["terminationCondition"] == "optimal"
+
+
 if __name__ == "__main__":
     test_conversionPartLoad()
@@ -216,3 +216,23 @@ def test_leanModel_with_matching_locationalEligibility(esM_init):
     )
 
     esM.optimize(timeSeriesAggregation=True, solver="glpk")
+
+
+def test_eliminateZeroOperationVariables(minimal_test_esM):
+    """
+    Check that the operation variables and constraints of components which are not operated at a location are
+    not declared and that this does not change the optimal solution.
+    """
+    esM = minimal_test_esM
+
+    esM.optimize(solver="glpk")
+    objective = esM.objectiveValue
+    numberOfVariables = len(esM.pyM.op_srcSnk)
+
+    esM.optimize(solver="glpk", eliminateZeroOperationVariables=True)
+    zeroIndices = esM.pyM.zeroOperationIndices["srcSnk"]
+    # The electricity market has no purchase potential at the industry location
+    assert ("IndustryLocation", "Electricity market", 0) in zeroIndices
+    assert all(index not in esM.pyM.operationVarSet_srcSnk for index in zeroIndices)
+    assert len(esM.pyM.op_srcSnk) < numberOfVariables
+    assert esM.objectiveValue == pytest.approx(objective, rel=1e-6)
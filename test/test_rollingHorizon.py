@@ -0,0 +1,206 @@
+import fine as fn
+import numpy as np
+import pandas as pd
+import pytest
+
+from fine import utils
+
+
+def fixCapacities(esM):
+    """
+    Set the optimized capacities of all components as capacityFix.
+    """
+    for mdl in esM.componentModelingDict.values():
+        capacities = mdl.capacityVariablesOptimum
+        for compName in capacities.index.get_level_values(0).unique():
+            mdl.componentsDict[compName].processedCapacityFix[0] = (
+                utils.preprocess2dimData(capacities.loc[compName].fillna(0), discard=False)
+            )
+
+
+def test_rollingHorizon(minimal_test_esM):
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+    fixCapacities(esM)
+
+    # One window covering all time steps yields the results of the monolithic model
+    esM.optimize(solver="glpk")
+    objective = esM.objectiveValue
+    operation = esM.componentModelingDict["SourceSinkModel"].operationVariablesOptimum
+    fn.optimizeRollingHorizon(esM, windowLength=esM.numberOfTimeSteps, solver="glpk")
+    assert len(esM.rollingHorizonSummary) == 1
+    np.testing.assert_almost_equal(esM.objectiveValue / objective, 1, decimal=6)
+
+    # Overlapping windows are stitched to the full time series
+    fn.optimizeRollingHorizon(esM, windowLength=2, overlapLength=1, solver="glpk")
+    summary = esM.rollingHorizonSummary
+    assert list(summary["start"]) == [0, 1, 2]
+    assert list(summary["commitEnd"]) == [1, 2, 4]
+    assert (summary["terminationCondition"] == "optimal").all()
+    for key in ["SourceSinkModel", "StorageModel", "TransmissionModel"]:
+        mdl = esM.componentModelingDict[key]
+        for name, d in mdl.getOptimalValues(ip=esM.investmentPeriodNames[0]).items():
+            if d["timeDependent"] and d["values"] is not None:
+                assert list(d["values"].columns) == esM.totalTimeSteps
+    stitched = esM.componentModelingDict["SourceSinkModel"].operationVariablesOptimum
+    assert stitched.index.equals(operation.index)
+    assert esM.totalTimeSteps == list(range(4))
+
+    # The states of charge are carried over to the next window (efficiencies of 1 and no self discharge)
+    storage = esM.componentModelingDict["StorageModel"]
+    SOC = storage.stateOfChargeOperationVariablesOptimum
+    charge = storage.chargeOperationVariablesOptimum.loc[SOC.index]
+    discharge = storage.dischargeOperationVariablesOptimum.loc[SOC.index]
+    np.testing.assert_allclose(
+        SOC.diff(axis=1).iloc[:, 1:].values,
+        (charge - discharge).iloc[:, :-1].values,
+        rtol=1e-6,
+        atol=1e-3,
+    )
+
+
+def test_rollingHorizon_balanceLimit(minimal_test_esM):
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+    fixCapacities(esM)
+
+    # Free electricity which is limited by a binding balance limit over the whole year
+    esM.add(
+        fn.Source(
+            esM=esM,
+            name="Free electricity",
+            commodity="electricity",
+            hasCapacityVariable=False,
+            balanceLimitID="free electricity",
+        )
+    )
+    limit = 1e7
+    balanceLimit = pd.DataFrame(columns=["Total"], index=["free electricity"])
+    balanceLimit.loc["free electricity", "Total"] = limit
+    esM.processedBalanceLimit = utils.checkAndSetBalanceLimit(
+        esM, balanceLimit, esM.locations
+    )
+
+    fn.optimizeRollingHorizon(esM, windowLength=2, solver="glpk")
+    operation = esM.componentModelingDict["SourceSinkModel"].operationVariablesOptimum
+    np.testing.assert_almost_equal(
+        operation.loc["Free electricity"].sum().sum() / limit, 1, decimal=6
+    )
+    assert esM.processedBalanceLimit[0].loc["free electricity", "Total"] == limit
+
+
+def test_rollingHorizon_balanceLimit_lowerBound(minimal_test_esM):
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+    fixCapacities(esM)
+
+    # Expensive electricity which is only purchased because of a lower balance limit
+    esM.add(
+        fn.Source(
+            esM=esM,
+            name="Expensive electricity",
+            commodity="electricity",
+            hasCapacityVariable=False,
+            commodityCost=10,
+            balanceLimitID="expensive electricity",
+        )
+    )
+    limit = 1e3
+    balanceLimit = pd.DataFrame(
+        columns=["Total", "lowerBound"], index=["expensive electricity"]
+    )
+    balanceLimit.loc["expensive electricity", "Total"] = limit
+    balanceLimit["lowerBound"] = True
+    esM.processedBalanceLimit = utils.checkAndSetBalanceLimit(
+        esM, balanceLimit, esM.locations
+    )
+
+    # The limit is only enforced on the committed time steps, so the overlap does not
+    # absorb the purchases of a window
+    fn.optimizeRollingHorizon(esM, windowLength=2, overlapLength=1, solver="glpk")
+    operation = esM.componentModelingDict["SourceSinkModel"].operationVariablesOptimum
+    assert operation.loc["Expensive electricity"].sum().sum() >= limit * (1 - 1e-6)
+
+
+def test_rollingHorizon_ramping():
+    esM = fn.EnergySystemModel(
+        locations={"Region1"},
+        commodities={"electricity", "methane"},
+        numberOfTimeSteps=8,
+        commodityUnitsDict={"electricity": r"GW$_{el}$", "methane": r"GW$_{CH_{4},LHV}$"},
+        hoursPerTimeStep=1,
+        costUnit="1e9 Euro",
+        lengthUnit="km",
+        verboseLogLevel=2,
+    )
+    esM.add(
+        fn.Source(
+            esM=esM,
+            name="Natural gas purchase",
+            commodity="methane",
+            hasCapacityVariable=False,
+            commodityCost=10,
+        )
+    )
+    for name, opexPerOperation, rampUpMax in [
+        ("restricted", 1, 0.2),
+        ("unrestricted", 10, None),
+    ]:
+        esM.add(
+            fn.ConversionDynamic(
+                esM=esM,
+                name=name,
+                physicalUnit=r"GW$_{el}$",
+                commodityConversionFactors={"electricity": 1, "methane": -1 / 0.625},
+                capacityFix=pd.Series([10], index=["Region1"]),
+                rampUpMax=rampUpMax,
+                opexPerOperation=opexPerOperation,
+            )
+        )
+    esM.add(
+        fn.Sink(
+            esM=esM,
+            name="Electricity demand",
+            commodity="electricity",
+            hasCapacityVariable=False,
+            operationRateFix=pd.DataFrame({"Region1": [2, 2, 2, 2, 10, 10, 10, 10]}),
+        )
+    )
+
+    # The operation of the last time step of the first window limits the ramp up in the second window
+    fn.optimizeRollingHorizon(esM, windowLength=4, solver="glpk")
+    operation = esM.componentModelingDict[
+        "ConversionDynamicModel"
+    ].operationVariablesOptimum.loc[("restricted", "Region1")]
+    assert (operation.diff().iloc[1:] <= 0.2 * 10 + 1e-6).all()
+    np.testing.assert_almost_equal(operation[4], 4, decimal=4)
+
+
+def test_rollingHorizon_requiresCapacityFix(minimal_test_esM):
+    with pytest.raises(ValueError, match="capacityFix"):
+        fn.optimizeRollingHorizon(minimal_test_esM, windowLength=2, solver="glpk")
+
+
+def test_rollingHorizon_minUpTime():
+    esM = fn.EnergySystemModel(
+        locations={"Region1"},
+        commodities={"electricity", "methane"},
+        numberOfTimeSteps=4,
+        commodityUnitsDict={"electricity": r"GW$_{el}$", "methane": r"GW$_{CH_{4},LHV}$"},
+        hoursPerTimeStep=1,
+        costUnit="1e9 Euro",
+        lengthUnit="km",
+        verboseLogLevel=2,
+    )
+    esM.add(
+        fn.ConversionDynamic(
+            esM=esM,
+            name="restricted",
+            physicalUnit=r"GW$_{el}$",
+            commodityConversionFactors={"electricity": 1, "methane": -1 / 0.625},
+            capacityFix=pd.Series([10], index=["Region1"]),
+            upTimeMin=2,
+        )
+    )
+    with pytest.raises(ValueError, match="minimum up and down times"):
+        fn.optimizeRollingHorizon(esM, windowLength=2, solver="glpk")
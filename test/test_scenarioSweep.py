@@ -0,0 +1,79 @@
+import os
+
+import fine as fn
+import numpy as np
+from fine.expansionModules import scenarioSweep
+
+
+def test_scenarioSweep(minimal_test_esM):
+    """
+    Optimize variants of the minimal test system in a process pool and compare
+    the objective values with sequentially optimized variants.
+    """
+    esM = minimal_test_esM
+    variants = [
+        {"name": "base"},
+        {
+            "name": "expensiveElectrolyzers",
+            "components": {"Electrolyzers": {"investPerCapacity": 1000}},
+        },
+        {"name": "invalid", "components": {"Unknown": {"investPerCapacity": 1}}},
+        # the worker process of this variant terminates abnormally
+        {"name": "crashed", "function": lambda esM: os._exit(1)},
+        {"name": "afterCrash", "components": {"Electrolyzers": {"investPerCapacity": 600}}},
+    ]
+    results = fn.optimizeScenarioSweep(
+        esM,
+        variants,
+        workers=2,
+        solver="glpk",
+        resultSlices={
+            "electrolyzerCapacity": lambda esM: esM.componentModelingDict[
+                "ConversionModel"
+            ].capacityVariablesOptimum.loc["Electrolyzers"]
+        },
+    )
+
+    assert list(results.index) == [
+        "base",
+        "expensiveElectrolyzers",
+        "invalid",
+        "crashed",
+        "afterCrash",
+    ]
+    assert list(results[("status", "")]) == ["ok", "ok", "failed", "failed", "ok"]
+    assert "Unknown" in results.loc["invalid", ("error", "")]
+    assert "terminated abnormally" in results.loc["crashed", ("error", "")]
+    assert (
+        results.loc["expensiveElectrolyzers", ("objectiveValue", "")]
+        > results.loc["base", ("objectiveValue", "")]
+    )
+
+    # the base energy system model is not changed by the sweep
+    assert esM.getComponent("Electrolyzers").investPerCapacity == 500
+    esM.optimize(solver="glpk")
+    np.testing.assert_almost_equal(
+        results.loc["base", ("objectiveValue", "")] / esM.objectiveValue, 1, decimal=6
+    )
+    capacities = esM.componentModelingDict[
+        "ConversionModel"
+    ].capacityVariablesOptimum.loc["Electrolyzers"]
+    for location, capacity in capacities.items():
+        np.testing.assert_almost_equal(
+            results.loc["base", ("electrolyzerCapacity", location)], capacity
+        )
+
+
+def test_scenarioSweepSharedData(minimal_test_esM):
+    """
+    Check that the copies of the variants share the time series data with the base energy system model.
+    """
+    esM = minimal_test_esM
+    esMCopy = scenarioSweep._copyESM(esM)
+    sink, sinkCopy = esM.getComponent("Industry site"), esMCopy.getComponent(
+        "Industry site"
+    )
+    assert sinkCopy is not sink
+    for ip, operationRateFix in sink.fullOperationRateFix.items():
+        assert sinkCopy.fullOperationRateFix[ip] is operationRateFix
+    assert esMCopy.componentModelingDict is not esM.componentModelingDict
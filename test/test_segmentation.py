@@ -67,3 +67,53 @@ def test_segmentation(minimal_test_esM):
     # and thus size-determining constraints of the model are coincidentally not affected by the aggregation and the
     # optimal solutions of the third and fourth model are identical.
     assert esM3.pyM.Obj() == esM4.pyM.Obj()
+
+
+def test_operationVariableBounds(minimal_test_esM):
+    """
+    Check the bounds of the operation variables of components without capacity variables for the full temporal
+    resolution, a relevance threshold and segmented time series data.
+    """
+    esM = minimal_test_esM
+    demand, purchase = 6e3 * 2190, 1e6 * 2190
+
+    esM.declareOptimizationProblem()
+    opVar = esM.pyM.op_srcSnk
+    assert opVar["IndustryLocation", "Industry site", 0, 0, 1].bounds == (
+        demand,
+        demand,
+    )
+    assert opVar["ElectrolyzerLocation", "Electricity market", 0, 0, 1].bounds == (
+        0,
+        purchase,
+    )
+
+    esM.declareOptimizationProblem(relevanceThreshold=1e8)
+    opVar = esM.pyM.op_srcSnk
+    assert opVar["IndustryLocation", "Industry site", 0, 0, 1].bounds == (0, 0)
+    assert opVar["ElectrolyzerLocation", "Electricity market", 0, 0, 1].bounds == (
+        0,
+        purchase,
+    )
+
+    # two typical periods with one segment each, i.e. each segment represents two time steps
+    esM.aggregateTemporally(
+        numberOfTypicalPeriods=2,
+        numberOfTimeStepsPerPeriod=2,
+        storeTSAinstance=False,
+        segmentation=True,
+        numberOfSegmentsPerPeriod=1,
+        clusterMethod="hierarchical",
+        sortValues=False,
+        rescaleClusterPeriods=False,
+        representationMethod=None,
+    )
+    esM.declareOptimizationProblem(timeSeriesAggregation=True)
+    opVar = esM.pyM.op_srcSnk
+    for p in esM.typicalPeriods:
+        assert esM.pyM.timeStepsPerSegment[0][p, 0] == 2
+        assert esM.pyM.hoursPerSegment[0][p, 0] == 2 * 2190
+        assert opVar["IndustryLocation", "Industry site", 0, p, 0].bounds == (
+            2 * demand,
+            2 * demand,
+        )
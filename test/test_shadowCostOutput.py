@@ -43,3 +43,36 @@ def test_shadowCostOutPut(minimal_test_esM):
 
     assert np.round(SP.loc["hydrogen", "IndustryLocation"].sum(), 4) == 0.3296
     assert len(SP.loc["hydrogen", "IndustryLocation"]) == 4
+
+
+def test_shadowPriceCube(minimal_test_esM):
+    """
+    Test that the dual values of a constraint are cached after the first query
+    and equal the dual values obtained from all dual values of the model.
+    """
+    esM = minimal_test_esM
+
+    esM.optimize(solver="glpk")
+
+    kwargs = dict(
+        hasTimeSeries=True,
+        periodOccurrences=esM.periodOccurrences,
+        periodsOrder=esM.periodsOrder,
+    )
+    SP = fn.getShadowPrices(esM, esM.pyM.commodityBalanceConstraint, **kwargs)
+    cube = esM._shadowPriceCubes[("commodityBalanceConstraint", True)]
+    assert cube["values"].shape[:2] == (len(cube["rows"]), 1)
+    assert (
+        fn.getShadowPriceCube(esM, esM.pyM.commodityBalanceConstraint, True) is cube
+    )
+
+    SPFromDualValues = fn.getShadowPrices(
+        esM,
+        esM.pyM.commodityBalanceConstraint,
+        dualValues=fn.getDualValues(esM.pyM),
+        **kwargs,
+    )
+    assert SP.equals(SPFromDualValues)
+
+    esM.optimize(solver="glpk")
+    assert esM._shadowPriceCubes == {}
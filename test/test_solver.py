@@ -1,3 +1,10 @@
+import numpy as np
+import pytest
+from scipy import optimize as scipyOpt
+
+from fine import utilsMatrix
+
+
 def test_solver_not_specified(minimal_test_esM):
     """
     Test solver not specified. The first available solver
@@ -7,3 +14,167 @@ def test_solver_not_specified(minimal_test_esM):
     esM = minimal_test_esM
     esM.optimize()
     assert esM.solverSpecs["terminationCondition"] == "optimal"
+
+
+def test_matrixModel(minimal_test_esM):
+    """
+    Test that the standard form of the declared optimization problem yields the same objective value as the
+    optimization with the pyomo solver interface.
+    """
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+    objective = esM.objectiveValue
+
+    matrixModel = utilsMatrix.buildMatrixModel(esM)
+    assert not matrixModel.isMIP
+    res = scipyOpt.linprog(
+        matrixModel.c,
+        A_ub=matrixModel.A_ub,
+        b_ub=matrixModel.b_ub,
+        A_eq=matrixModel.A_eq,
+        b_eq=matrixModel.b_eq,
+        bounds=list(zip(matrixModel.lb, matrixModel.ub)),
+        method="highs",
+    )
+    assert res.status == 0
+    np.testing.assert_allclose(res.fun + matrixModel.cOffset, objective, rtol=1e-5)
+
+
+def test_persistent_solver(minimal_test_esM):
+    """
+    Test that the persistent solver yields the same objective value as the
+    file based solver interface and that it is reused for repeated solves.
+    """
+    pytest.importorskip("highspy")
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+    objectiveFileBased = esM.objectiveValue
+
+    esM.optimize(persistent=True)
+    assert esM.solverSpecs["terminationCondition"] == "optimal"
+    assert esM.persistentSolver[0] == "highs"
+    np.testing.assert_almost_equal(
+        esM.objectiveValue / objectiveFileBased, 1, decimal=6
+    )
+    assert len(esM.pyM.dual) > 0
+
+    # fix a capacity variable and solve again without redeclaring the problem
+    optimizer = esM.persistentSolver[1]
+    for var in esM.pyM.cap_conv.values():
+        var.fix(2 * var.value)
+    esM.optimize(declaresOptimizationProblem=False, persistent=True)
+    assert esM.persistentSolver[1] is optimizer
+    assert esM.objectiveValue > objectiveFileBased
+    objectivePersistent = esM.objectiveValue
+
+    esM.optimize(declaresOptimizationProblem=False, solver="glpk")
+    np.testing.assert_almost_equal(
+        esM.objectiveValue / objectivePersistent, 1, decimal=6
+    )
+
+
+def test_highs_in_memory(minimal_test_esM):
+    """
+    Test that the in-memory HiGHS interface yields the same objective value
+    and dual values as the file based solver interface.
+    """
+    pytest.importorskip("highspy")
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+    objectiveFileBased = esM.objectiveValue
+    dualsFileBased = {con.name: val for con, val in esM.pyM.dual.items()}
+
+    esM.optimize(solver="highs", threads=1, timeLimit=60)
+    assert esM.solverSpecs["terminationCondition"] == "optimal"
+    np.testing.assert_almost_equal(
+        esM.objectiveValue / objectiveFileBased, 1, decimal=6
+    )
+    duals = {con.name: val for con, val in esM.pyM.dual.items()}
+    assert duals.keys() == dualsFileBased.keys()
+    for name, val in duals.items():
+        np.testing.assert_almost_equal(val, dualsFileBased[name], decimal=4)
+
+
+def test_build_profile(minimal_test_esM):
+    """
+    Test that the build profile records the pyomo components declared by each
+    modeling class and that it is added to the performance summary if requested.
+    """
+    esM = minimal_test_esM
+    esM.declareOptimizationProblem()
+    assert esM.buildProfile is None
+
+    esM.declareOptimizationProblem(profileBuild=True)
+    profile = esM.buildProfile
+    assert set(profile.index.get_level_values("modelingClass")) >= {
+        "SourceSinkModel",
+        "ConversionModel",
+        "StorageModel",
+        "TransmissionModel",
+        "CrossComponential",
+        "Objective",
+    }
+    assert profile.loc[("SourceSinkModel", "op_srcSnk"), "indices"] == len(
+        esM.pyM.op_srcSnk
+    )
+    assert profile.loc[("CrossComponential", "commodityBalanceConstraint"), "nonzeros"] > 0
+    assert profile.loc[("Objective", "Obj"), "type"] == "Objective"
+
+    # The performance summary only contains the build profile if the declaration is profiled
+    esM.optimize(solver="glpk", includePerformanceSummary=True)
+    assert esM.buildProfile is None
+    assert "BuildProfile" not in esM.performanceSummary.index.get_level_values(0)
+
+    esM.optimize(solver="glpk", includePerformanceSummary=True, profileBuild=True)
+    assert (
+        esM.performanceSummary.loc[("BuildProfile", "ConversionModel buildTime"), "Value"]
+        >= 0
+    )
+
+
+def test_lazy_results(minimal_test_esM):
+    """
+    Test that optimization summaries and optimal values which are stored lazily
+    are set on first access and equal the eagerly set results.
+    """
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+    summaryEager = esM.getOptimizationSummary("StorageModel", outputLevel=2)
+    capacitiesEager = esM.componentModelingDict[
+        "ConversionModel"
+    ].capacityVariablesOptimum
+
+    esM.optimize(solver="glpk", lazyResults=True)
+    assert esM._lazyOptimalValues is not None
+    storageModel = esM.componentModelingDict["StorageModel"]
+    assert "_optSummary" not in storageModel.__dict__
+
+    summaryLazy = esM.getOptimizationSummary("StorageModel", outputLevel=2)
+    assert "_optSummary" in storageModel.__dict__
+    assert "_optSummary" not in esM.componentModelingDict["SourceSinkModel"].__dict__
+    assert summaryLazy.equals(summaryEager)
+    assert (
+        esM.componentModelingDict["ConversionModel"]
+        .capacityVariablesOptimum.equals(capacitiesEager)
+    )
+
+    esM.materializeOptimalValues()
+    assert esM._lazyOptimalValues is None
+
+
+def test_lazy_results_stateOfCharge(minimal_test_esM):
+    """
+    Test that the states of charge which are stored lazily are set when they
+    are accessed first, also if no optimal values were set before.
+    """
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk", lazyResults=True)
+    storageModel = esM.componentModelingDict["StorageModel"]
+    assert "_stateOfChargeOperationVariablesOptimum" not in storageModel.__dict__
+
+    SOCLazy = storageModel.stateOfChargeOperationVariablesOptimum
+    assert SOCLazy is not None
+    assert "_stateOfChargeOperationVariablesOptimum" in storageModel.__dict__
+
+    esM.optimize(solver="glpk")
+    assert SOCLazy.equals(storageModel.stateOfChargeOperationVariablesOptimum)
@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from fine import utilsTSA
+
+
+def test_tsaCache(minimal_test_esM, tmp_path):
+    """
+    Cluster the minimal test system twice with the same arguments and check that the second clustering is loaded
+    from the cache and leads to the same aggregated time series data.
+    """
+    esM = minimal_test_esM
+    tsaArgs = dict(
+        numberOfTypicalPeriods=2,
+        numberOfTimeStepsPerPeriod=2,
+        segmentation=True,
+        numberOfSegmentsPerPeriod=2,
+        representationMethod=None,
+        cacheDirectory=str(tmp_path),
+    )
+
+    esM.aggregateTemporally(**tsaArgs)
+    entries = sorted(os.listdir(tmp_path))
+    assert len(entries) == len(esM.investmentPeriods)
+    periodsOrder = {ip: order.copy() for ip, order in esM.periodsOrder.items()}
+    demand = esM.getComponent("Industry site")
+    aggregatedRate = demand.aggregatedOperationRateFix[0].copy()
+
+    esM.aggregateTemporally(**tsaArgs)
+    assert sorted(os.listdir(tmp_path)) == entries
+    for ip, order in periodsOrder.items():
+        np.testing.assert_array_equal(esM.periodsOrder[ip], order)
+    pd.testing.assert_frame_equal(demand.aggregatedOperationRateFix[0], aggregatedRate)
+
+    # A different clustering argument leads to a new cache entry
+    esM.aggregateTemporally(**dict(tsaArgs, numberOfSegmentsPerPeriod=1))
+    assert len(os.listdir(tmp_path)) == 2 * len(esM.investmentPeriods)
+
+    # The least recently used entries are removed if the cache exceeds its maximum size
+    utilsTSA.evictCache(str(tmp_path), 0)
+    assert len(os.listdir(tmp_path)) == 0
+
+
+def test_tsaCacheKey(tmp_path):
+    """
+    Check that the cache key depends on the time index and the number of time steps per period and that
+    entries which cannot be loaded are treated as cache misses.
+    """
+    data = pd.DataFrame(
+        {"a": np.arange(48) % 24},
+        index=pd.date_range("2050-01-01 00:30:00", periods=48, freq="1h"),
+        dtype=float,
+    )
+    weights, clusterArgs = {"a": 1}, {"hoursPerPeriod": 24}
+    key = utilsTSA.getCacheKey(data, weights, clusterArgs, numberOfTimeStepsPerPeriod=24)
+    assert key == utilsTSA.getCacheKey(
+        data.copy(), weights, clusterArgs, numberOfTimeStepsPerPeriod=24
+    )
+    halfHourly = data.set_axis(
+        pd.date_range("2050-01-01 00:30:00", periods=48, freq="30min")
+    )
+    assert key != utilsTSA.getCacheKey(
+        halfHourly, weights, clusterArgs, numberOfTimeStepsPerPeriod=24
+    )
+    assert key != utilsTSA.getCacheKey(
+        data, weights, clusterArgs, numberOfTimeStepsPerPeriod=12
+    )
+
+    (tmp_path / (key + ".pkl")).write_bytes(b"corrupted")
+    assert utilsTSA.loadFromCache(str(tmp_path), key) is None
+
+
+def test_tsaDeduplication():
+    """
+    Check that investment periods with identical time series data are clustered only once and share the results.
+    """
+    index = pd.date_range("2050-01-01 00:30:00", periods=48, freq="1h")
+    data = pd.DataFrame(
+        {"a": np.arange(48) % 24, "b": np.arange(48) % 12}, index=index, dtype=float
+    )
+    weights = {"a": 1, "b": 1}
+    clusterArgs = dict(
+        numberOfTypicalPeriods=2,
+        hoursPerPeriod=24,
+        segmentation=False,
+        numberOfSegmentsPerPeriod=24,
+        clusterMethod="hierarchical",
+        sortValues=False,
+        rescaleClusterPeriods=False,
+        representationMethod=None,
+    )
+    results, cachedIps = utilsTSA.clusterInvestmentPeriods(
+        {0: data, 1: data.copy(), 2: 2 * data},
+        {0: weights, 1: weights, 2: weights},
+        clusterArgs,
+        useCache=False,
+    )
+    assert cachedIps == []
+    assert results[0] is results[1]
+    assert results[0] is not results[2]
+
+
+def test_aggregateTemporallyAuto(minimal_test_esM):
+    """
+    Check that the smallest number of typical periods which meets the target error is chosen.
+    """
+    esM = minimal_test_esM
+    numberOfTypicalPeriods = esM.aggregateTemporallyAuto(
+        targetError=1e-6,
+        numberOfTimeStepsPerPeriod=1,
+        segmentation=False,
+        useCache=False,
+    )
+    maxErrors = esM.typicalPeriodErrors.max(axis=1)
+    assert maxErrors[numberOfTypicalPeriods] <= 1e-6
+    assert (maxErrors[maxErrors.index < numberOfTypicalPeriods] > 1e-6).all()
+    assert len(esM.typicalPeriods) == numberOfTypicalPeriods
+    # The evaluation stops at the chosen number of typical periods
+    assert maxErrors.index.max() == numberOfTypicalPeriods
+
+    # Without aggregation, the time series data is reconstructed exactly
+    timeSeriesDataDict, weightDictDict = esM.getTimeSeriesDataForAggregation()
+    errors = utilsTSA.evaluateTypicalPeriods(
+        timeSeriesDataDict[0], weightDictDict[0], 1, len(esM.totalTimeSteps)
+    )
+    assert list(errors.index) == list(range(1, len(esM.totalTimeSteps) + 1))
+    assert errors.loc[len(esM.totalTimeSteps)].max() < 1e-9
+
+
+def test_tsaInputOutputMatrix():
+    """
+    Check that the registered time series are written to one matrix with sorted columns and that the clustered
+    time series are returned as views on one matrix.
+    """
+    index = pd.RangeIndex(3)
+    matrix = utilsTSA.TSAInputMatrix()
+    matrix.register(["b_1", "b_2"], pd.DataFrame({"1": [1, 2, 3], "2": [4, 5, 6]}))
+    matrix.register(["a_1"], pd.DataFrame({"1": [7.0, 8.0, 9.0]}))
+    data = matrix.assemble(index)
+    assert list(data.columns) == ["a_1", "b_1", "b_2"]
+    np.testing.assert_array_equal(data["b_2"].values, [4, 5, 6])
+    assert data.values.dtype == np.float64
+
+    output = utilsTSA.TSAOutputMatrix(data)
+    block = output.getDataFrame(["b_1", "b_2"], ["1", "2"])
+    assert list(block.columns) == ["1", "2"]
+    np.testing.assert_array_equal(block["1"].values, [1, 2, 3])
+    assert np.shares_memory(block.values, output.values)
+
+
+def test_tsaInputContentKey(perfectForesight_test_esM):
+    """
+    Check that registries of identical time series have the same content key and that investment periods with
+    identical time series share one assembled matrix.
+    """
+    data = pd.DataFrame({"1": [1.0, 2.0, 3.0], "2": [4.0, 5.0, 6.0]})
+    hashes = {}
+    keys = []
+    for registered in [data, data.copy(), 2 * data]:
+        matrix = utilsTSA.TSAInputMatrix()
+        matrix.register(["b_1", "b_2"], registered)
+        keys.append(matrix.getContentKey(hashes))
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
+    assert len(hashes) == 3
+
+    # The same time series are used in all investment periods
+    esM = perfectForesight_test_esM
+    timeSeriesDataDict, weightDictDict = esM.getTimeSeriesDataForAggregation()
+    for ip in esM.investmentPeriods:
+        assert timeSeriesDataDict[ip] is timeSeriesDataDict[0]
+        assert weightDictDict[ip] is weightDictDict[0]
@@ -1,3 +1,9 @@
+import pytest
+import pandas as pd
+
+import fine as fn
+
+
 def test_updateComponent(minimal_test_esM):
     _invest_before = minimal_test_esM.getComponentAttribute(
         componentName="Electrolyzers", attributeName="investPerCapacity"
@@ -57,3 +63,88 @@ def test_updateComponent(minimal_test_esM):
         )
         == _new_name
     )
+
+
+def test_locationCommodityIncidence(minimal_test_esM):
+    esM = minimal_test_esM
+    mdl = esM.componentModelingDict["SourceSinkModel"]
+
+    incidence = mdl.getLocationCommodityIncidence(esM)
+    assert incidence["ElectrolyzerLocation"] == {"electricity"}
+    assert incidence["IndustryLocation"] == {"hydrogen"}
+    assert mdl.hasOpVariablesForLocationCommodity(
+        esM, "ElectrolyzerLocation", "electricity"
+    )
+
+    # the cached incidence has to be reset when components are removed or added
+    esM.removeComponent("Electricity market")
+    assert mdl.getLocationCommodityIncidence(esM)["ElectrolyzerLocation"] == set()
+    assert not mdl.hasOpVariablesForLocationCommodity(
+        esM, "ElectrolyzerLocation", "electricity"
+    )
+
+    esM.add(
+        fn.Source(
+            esM=esM,
+            name="Electricity market",
+            commodity="electricity",
+            hasCapacityVariable=False,
+            locationalEligibility=pd.Series(
+                [0, 1], index=["ElectrolyzerLocation", "IndustryLocation"]
+            ),
+        )
+    )
+    incidence = mdl.getLocationCommodityIncidence(esM)
+    assert incidence["ElectrolyzerLocation"] == set()
+    assert incidence["IndustryLocation"] == {"electricity", "hydrogen"}
+
+    # both locations of a transmission connection are incident to its commodity
+    incidence = esM.componentModelingDict[
+        "TransmissionModel"
+    ].getLocationCommodityIncidence(esM)
+    assert incidence["ElectrolyzerLocation"] == {"hydrogen"}
+    assert incidence["IndustryLocation"] == {"hydrogen"}
+
+
+def test_incrementalRedeclaration(minimal_test_esM):
+    esM = minimal_test_esM
+    esM.optimize(solver="glpk")
+
+    # a cost-only update only redeclares the objective function
+    capVar = esM.pyM.cap_conv
+    esM.updateComponent(
+        componentName="Electrolyzers",
+        updateAttrs={
+            "investPerCapacity": esM.getComponentAttribute(
+                "Electrolyzers", "investPerCapacity"
+            )
+            * 2
+        },
+    )
+    esM.optimize(solver="glpk", incremental=True)
+    assert esM.pyM.cap_conv is capVar
+    incrementalObjective = esM.pyM.Obj()
+    esM.optimize(solver="glpk")
+    assert esM.pyM.Obj() == pytest.approx(incrementalObjective)
+
+    # structural updates redeclare the affected modeling class and the cross-componential constraints
+    esM.optimize(solver="glpk")
+    capVar = esM.pyM.cap_stor
+    capacity = max(var.value for var in esM.pyM.cap_conv.values())
+    esM.updateComponent(
+        componentName="Electrolyzers",
+        updateAttrs={"capacityMin": 1.5 * capacity, "capacityMax": 2 * capacity},
+    )
+    esM.optimize(solver="glpk", incremental=True)
+    assert esM.pyM.cap_stor is capVar
+    incrementalObjective = esM.pyM.Obj()
+    esM.optimize(solver="glpk")
+    assert esM.pyM.Obj() == pytest.approx(incrementalObjective)
+
+    # removing all components of a modeling class removes its pyomo components
+    esM.removeComponent("Pressure tank")
+    esM.optimize(solver="glpk", incremental=True)
+    assert esM.pyM.component("cap_stor") is None
+    incrementalObjective = esM.pyM.Obj()
+    esM.optimize(solver="glpk")
+    assert esM.pyM.Obj() == pytest.approx(incrementalObjective)
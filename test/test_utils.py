@@ -217,4 +217,90 @@ def test_check_and_set_cost_parameter():
     with pytest.raises(AssertionError):
         invalid_series_with_nan = pd.Series([10, np.nan], index=["loc1", "loc2"])
         assert utils.checkAndSetCostParameter(esM, "testParam", invalid_series_with_nan, "2dim", None).equals(
-            invalid_series_with_nan, index=esM.locations)
\ No newline at end of file
+            invalid_series_with_nan, index=esM.locations)
+
+
+def test_formatOptimizationOutputPerPeriod():
+    """
+    Test that the operation variable values of several investment periods are formatted in one pass and match
+    the formatting per investment period.
+    """
+    data = {
+        (loc, comp, ip, 0, t): float(ip * 100 + t) + (loc == "Region2")
+        for loc in ["Region2", "Region1"]
+        for comp in ["Wind", "PV"]
+        for ip in [0, 1]
+        for t in range(3)
+    }
+    # PV is not installed in Region1 in the second investment period
+    data = {k: v for k, v in data.items() if not (k[0:3] == ("Region1", "PV", 1))}
+    optVals = utils.formatOptimizationOutputPerPeriod(
+        utils.getOptimalVariableValues(data),
+        "operationVariables",
+        "1dim",
+        [0, 1],
+        periodsOrder={0: [0], 1: [0]},
+    )
+
+    assert list(optVals[0].index) == [
+        ("PV", "Region1"),
+        ("PV", "Region2"),
+        ("Wind", "Region1"),
+        ("Wind", "Region2"),
+    ]
+    assert list(optVals[1].index) == [
+        ("PV", "Region2"),
+        ("Wind", "Region1"),
+        ("Wind", "Region2"),
+    ]
+    expected = {
+        0: [[0, 1, 2], [1, 2, 3], [0, 1, 2], [1, 2, 3]],
+        1: [[101, 102, 103], [100, 101, 102], [101, 102, 103]],
+    }
+    for ip in [0, 1]:
+        assert list(optVals[ip].columns) == [0, 1, 2]
+        np.testing.assert_array_equal(optVals[ip].to_numpy(), expected[ip])
+        # The formatting of a single investment period yields the same frame
+        np.testing.assert_array_equal(
+            utils.formatOptimizationOutput(
+                data, "operationVariables", "1dim", ip, [0]
+            ).to_numpy(),
+            expected[ip],
+        )
+
+
+def test_buildFullTimeSeries():
+    """
+    Test that the full time series reconstructed with the index map matches the
+    reconstruction by concatenation, with and without segmentation.
+    """
+    from types import SimpleNamespace
+
+    index = pd.MultiIndex.from_product([[0, 1, 2], ["PV", "Wind"], ["Region1", "Region2"]])
+    df = pd.DataFrame(np.arange(len(index) * 3, dtype=float).reshape(len(index), 3), index=index)
+    periodsOrder = np.array([2, 0, 0, 1, 2])
+
+    pd.testing.assert_frame_equal(
+        utils.buildFullTimeSeries(df, periodsOrder, 0),
+        utils.buildFullTimeSeriesByConcat(df, periodsOrder, 0),
+    )
+
+    # Three segments per typical period representing four time steps
+    timeStepsPerSegment = pd.Series(
+        [1, 2, 1, 2, 1, 1, 1, 1, 2],
+        index=pd.MultiIndex.from_product([[0, 1, 2], [0, 1, 2]]),
+    )
+    esM = SimpleNamespace(
+        segmentation=True,
+        typicalPeriods=[0, 1, 2],
+        timeStepsPerSegment={0: timeStepsPerSegment},
+        _fullTimeSeriesIndex={},
+    )
+    for divide in [True, False]:
+        fullTimeSeries = utils.buildFullTimeSeries(df, periodsOrder, 0, esM=esM, divide=divide)
+        assert fullTimeSeries.shape == (4, 4 * len(periodsOrder))
+        pd.testing.assert_frame_equal(
+            fullTimeSeries,
+            utils.buildFullTimeSeriesByConcat(df, periodsOrder, 0, esM=esM, divide=divide),
+        )
+    assert len(esM._fullTimeSeriesIndex) == 1